@@ -1,6 +1,8 @@
-import requests
+from src.utils import http
+from src.api.odds_quota import get_quota, odds_get
 import pandas as pd
 import logging
+from src.db.odds_history import props_to_long, record_safe
 
 logger = logging.getLogger("[odds_players]")
 
@@ -10,49 +12,91 @@ ODDS_API_KEY = "2bffbe055e722a54e9cb3c27454c4665"
 # ✅ Endpoint atualizado 2025
 BASE_URL = "https://api.the-odds-api.com/v4/sports/basketball_nba/odds"
 
-def get_bet365_player_props(markets=None):
-    """Obtém as linhas de player props da Bet365 (via TheOddsAPI)"""
+class _Unauthorized(Exception):
+    pass
+
+
+def _fetch_bet365_market(market: str) -> list:
+    """Baixa um único mercado de props da Bet365 e devolve as linhas normalizadas."""
+    params = {
+        "regions": "us,br",
+        "oddsFormat": "decimal",
+        "markets": market,
+        "bookmakers": "bet365",
+        "apiKey": ODDS_API_KEY,
+    }
+
+    r = odds_get(BASE_URL, ODDS_API_KEY, params=params, timeout=20)
+    if r is None:
+        logger.warning(f"[{market}] pulado: cota da TheOddsAPI esgotada")
+        return []
+    if r.status_code == 401:
+        raise _Unauthorized()
+    r.raise_for_status()
+
+    rows = []
+    for g in r.json():
+        bookmaker = next((b for b in g.get("bookmakers", []) if b["key"] == "bet365"), None)
+        if not bookmaker:
+            continue
+
+        for market_data in bookmaker.get("markets", []):
+            for outcome in market_data.get("outcomes", []):
+                rows.append({
+                    "home_team": g["home_team"],
+                    "away_team": g["away_team"],
+                    "market": market_data["key"],
+                    "player": outcome["name"],
+                    "price": outcome.get("price"),
+                    "point_line": outcome.get("point", None),
+                    "description": outcome.get("description"),
+                    "commence_time": g.get("commence_time"),
+                })
+    return rows
+
+
+def get_bet365_player_props(markets=None, concurrent=True, max_workers=4, deadline=30.0):
+    """
+    Obtém as linhas de player props da Bet365 (via TheOddsAPI).
+    Com `concurrent=True` os mercados são pedidos em paralelo (limite de
+    `max_workers`, prazo global de `deadline` s).
+    """
     if markets is None:
         markets = ["player_points", "player_rebounds", "player_assists"]
+    if get_quota().is_low(ODDS_API_KEY) and len(markets) > 1:
+        # cota baixa: um único request com todos os mercados
+        logger.warning("Cota baixa na TheOddsAPI — agrupando mercados num único request.")
+        markets = [",".join(markets)]
 
-    all_data = []
+    if concurrent:
+        results = http.gather(
+            ((m, (lambda m=m: _fetch_bet365_market(m))) for m in markets),
+            max_workers=max_workers,
+            deadline=deadline,
+        )
+    else:
+        results = {}
+        for m in markets:
+            try:
+                results[m] = _fetch_bet365_market(m)
+            except _Unauthorized as e:
+                results[m] = e
+                break
+            except Exception as e:
+                results[m] = e
 
-    for market in markets:
-        params = {
-            "regions": "us,br",
-            "oddsFormat": "decimal",
-            "markets": market,
-            "bookmakers": "bet365",
-            "apiKey": ODDS_API_KEY,
-        }
-
-        try:
-            r = requests.get(BASE_URL, params=params, timeout=20)
-            if r.status_code == 401:
-                logger.error("401 Unauthorized — verifique sua API key da TheOddsAPI.")
-                return pd.DataFrame()
-            r.raise_for_status()
-
-            games = r.json()
-
-            for g in games:
-                bookmaker = next((b for b in g.get("bookmakers", []) if b["key"] == "bet365"), None)
-                if not bookmaker:
-                    continue
-
-                for market_data in bookmaker.get("markets", []):
-                    for outcome in market_data.get("outcomes", []):
-                        all_data.append({
-                            "home_team": g["home_team"],
-                            "away_team": g["away_team"],
-                            "market": market_data["key"],
-                            "player": outcome["name"],
-                            "price": outcome.get("price"),
-                            "point_line": outcome.get("point", None)
-                        })
-        except Exception as e:
-            logger.error(f"[{market}] erro: {e}")
+    all_data = []
+    for market, res in results.items():
+        if isinstance(res, _Unauthorized):
+            logger.error("401 Unauthorized — verifique sua API key da TheOddsAPI.")
+            return pd.DataFrame()
+        if isinstance(res, BaseException):
+            logger.error(f"[{market}] erro: {res}")
+            continue
+        all_data.extend(res)
 
     df = pd.DataFrame(all_data)
+    record_safe(props_to_long(df, "nba", price_col="price", point_col="point_line",
+                              player_col="description", side_col="player", book="bet365"), "bet365_props")
     logger.info(f"Retornadas {len(df)} linhas de player props")
     return df
@@ -0,0 +1,33 @@
+# scorebet/src/api/espn_api.py
+import pandas as pd
+from datetime import datetime, timedelta, timezone
+from src.utils import http
+
+SCOREBOARD_URLS = {
+    "nba": "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard",
+    "nfl": "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard",
+}
+
+def get_espn_games(league: str = "nba", days_ahead: int = 3) -> pd.DataFrame:
+    """Busca jogos reais da ESPN (com status real e placares) para `league` ('nba' ou 'nfl')."""
+    base = SCOREBOARD_URLS[league]
+    all_games = []
+    today = datetime.now(timezone(timedelta(hours=-3)))
+    for i in range(days_ahead):
+        date = (today + timedelta(days=i)).strftime("%Y%m%d")
+        resp = http.get(f"{base}?dates={date}", cache=True)
+        if resp.status_code != 200:
+            continue
+        for ev in resp.json().get("events", []):
+            comp = ev.get("competitions", [])[0]
+            home = next(c for c in comp["competitors"] if c["homeAway"] == "home")
+            away = next(c for c in comp["competitors"] if c["homeAway"] == "away")
+            all_games.append({
+                "date": comp.get("date"),
+                "home_team": home["team"]["displayName"],
+                "away_team": away["team"]["displayName"],
+                "status": comp["status"]["type"]["name"],
+                "home_score": home.get("score"),
+                "away_score": away.get("score"),
+            })
+    return pd.DataFrame(all_games)
@@ -1,9 +1,10 @@
 # scorebet/src/api/nba_data.py
 from __future__ import annotations
-import requests
+from src.utils import http
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
-from typing import Iterable, List
+from typing import Iterable, Iterator, List
 from src.utils.logger import get_logger
 from src.utils.config import settings
 
@@ -21,49 +22,84 @@ def _headers() -> dict:
         }
     return {}
 
+GAMES_URL = "https://api.balldontlie.io/v1/games"
+
+# um limitador por processo: todas as threads dividem a mesma cota do plano.
+# A cota é por minuto, então o burst deixa sair a janela inteira de uma vez.
+_bdl_limiter = http.RateLimiter(per_minute=settings.BDL_RATE_LIMIT, burst=settings.BDL_RATE_BURST)
+
+def _game_row(g: dict) -> dict:
+    return {
+        "game_id": g["id"],
+        "date": g["date"][:10],
+        "home_team": g["home_team"]["full_name"],
+        "visitor_team": g["visitor_team"]["full_name"],
+        "home_score": g["home_team_score"],
+        "visitor_score": g["visitor_team_score"],
+        "season": g["season"],
+    }
+
+def _get_games_page(dates: List[str], page: int) -> dict:
+    """Baixa uma página de /games para as datas informadas (dates[] repetido)."""
+    # Atenção: precisa ser lista de tuplas para repetir 'dates[]'
+    params = [("per_page", 100), ("page", page)]
+    for d in dates:
+        params.append(("dates[]", d))
+
+    logger.info(f"GET {GAMES_URL} page={page} dates={dates}")
+    with _bdl_limiter:
+        resp = http.get(GAMES_URL, params=params, headers=_headers(), timeout=20)
+
+    if resp.status_code != 200:
+        logger.error(f"HTTP {resp.status_code} em {resp.url}")
+        logger.error(f"Body: {resp.text[:400]}")
+        resp.raise_for_status()
+    return resp.json()
+
+def iter_game_pages(dates: List[str], max_workers: int | None = None) -> Iterator[List[dict]]:
+    """
+    Gera as linhas de cada página, EM ORDEM de página.
+    A 1ª página revela meta.total_pages; as demais são pedidas em paralelo
+    (até `max_workers` simultâneas, respeitando BDL_RATE_LIMIT) e entregues
+    assim que a página anterior já foi entregue — o consumidor (ex.: upsert)
+    começa a trabalhar antes de todas chegarem.
+    """
+    first = _get_games_page(dates, 1)
+    data = first.get("data", [])
+    if not data:
+        return
+    yield [_game_row(g) for g in data]
+
+    total_pages = int(first.get("meta", {}).get("total_pages", 1) or 1)
+    if total_pages <= 1:
+        return
+
+    workers = max_workers or settings.BDL_MAX_WORKERS
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="bdl") as pool:
+        futures = [pool.submit(_get_games_page, dates, p) for p in range(2, total_pages + 1)]
+        try:
+            for fut in futures:
+                data = fut.result().get("data", [])
+                if not data:
+                    break
+                yield [_game_row(g) for g in data]
+        finally:
+            for fut in futures:
+                fut.cancel()
+
+def iter_games_frames(dates: Iterable[str], max_workers: int | None = None) -> Iterator[pd.DataFrame]:
+    """Mesmo que iter_game_pages, mas um DataFrame por página (entrada do upsert em streaming)."""
+    for rows in iter_game_pages(list(dates), max_workers=max_workers):
+        yield pd.DataFrame(rows)
+
 def _fetch_games_for_dates(dates: List[str]) -> pd.DataFrame:
     """
-    Busca jogos usando dates[] (enviado N vezes) com paginação.
+    Busca jogos usando dates[] (enviado N vezes) com paginação paralela.
     Retorna colunas padronizadas para o resto do pipeline.
     """
-    all_rows, page = [], 1
-    while True:
-        # Atenção: precisa ser lista de tuplas para repetir 'dates[]'
-        params = [("per_page", 100), ("page", page)]
-        for d in dates:
-            params.append(("dates[]", d))
-
-        url = "https://api.balldontlie.io/v1/games"
-        logger.info(f"GET {url} page={page} dates={dates}")
-        resp = requests.get(url, params=params, headers=_headers(), timeout=20)
-
-        if resp.status_code != 200:
-            logger.error(f"HTTP {resp.status_code} em {resp.url}")
-            logger.error(f"Body: {resp.text[:400]}")
-            resp.raise_for_status()
-
-        payload = resp.json()
-        data = payload.get("data", [])
-        if not data:
-            break
-
-        for g in data:
-            all_rows.append({
-                "game_id": g["id"],
-                "date": g["date"][:10],
-                "home_team": g["home_team"]["full_name"],
-                "visitor_team": g["visitor_team"]["full_name"],
-                "home_score": g["home_team_score"],
-                "visitor_score": g["visitor_team_score"],
-                "season": g["season"],
-            })
-
-        meta = payload.get("meta", {})
-        if page < meta.get("total_pages", 1):
-            page += 1
-        else:
-            break
-
+    all_rows = []
+    for rows in iter_game_pages(dates):
+        all_rows.extend(rows)
     return pd.DataFrame(all_rows)
 
 def get_games(last_n_days: int = 3) -> pd.DataFrame:
@@ -114,35 +150,12 @@ def get_upcoming_games(days_ahead: int = 3) -> pd.DataFrame:
     dates = [(start + timedelta(i)).isoformat() for i in range((end - start).days + 1)]
 
     all_rows = []
-    page = 1
-    while True:
-        params = [("per_page", 100), ("page", page)]
-        for d in dates:
-            params.append(("dates[]", d))
-        url = "https://api.balldontlie.io/v1/games"
-        headers = {}
-        if settings.BDL_API_KEY:
-            headers = {"Authorization": f"Bearer {settings.BDL_API_KEY}", "X-API-KEY": settings.BDL_API_KEY}
-        resp = requests.get(url, params=params, headers=headers, timeout=20)
-        resp.raise_for_status()
-        payload = resp.json()
-        data = payload.get("data", [])
-        if not data:
-            break
-        for g in data:
-            # jogos futuros chegam com scores 0, status 'Scheduled'
-            all_rows.append({
-                "game_id": g["id"],
-                "date": g["date"][:10],
-                "season": g["season"],
-                "home_team": g["home_team"]["full_name"],
-                "visitor_team": g["visitor_team"]["full_name"],
-            })
-        meta = payload.get("meta", {})
-        if page < meta.get("total_pages", 1):
-            page += 1
-        else:
-            break
+    for rows in iter_game_pages(dates):
+        # jogos futuros chegam com scores 0, status 'Scheduled'
+        all_rows.extend(
+            {k: r[k] for k in ("game_id", "date", "season", "home_team", "visitor_team")}
+            for r in rows
+        )
 
     df = pd.DataFrame(all_rows).drop_duplicates(subset=["game_id"]).sort_values("date")
     if not df.empty:
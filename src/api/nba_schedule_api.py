@@ -0,0 +1,130 @@
+# scorebet/src/api/nba_schedule_api.py
+"""
+Agenda/placar da NBA para a página "Jogos" (ESPN + TheOddsAPI).
+
+`nba_schedule` é um snapshot único por processo: o ESPN e a TheOddsAPI são
+consultados no máximo uma vez a cada SCHEDULE_REFRESH_SECONDS, não importa
+quantos viewers estejam com a página aberta.
+"""
+import pandas as pd
+from datetime import datetime, timedelta, timezone
+from dateutil import parser
+
+from src.utils import http
+from src.utils.config import settings
+from src.utils.snapshot import SharedSnapshot
+from src.api.odds_quota import odds_get
+from src.db.odds_history import record_safe, theodds_events_to_long
+
+SCHEDULE_REFRESH_SECONDS = 30
+
+def to_brazil_time(utc_str):
+    try:
+        if not utc_str:
+            return None
+        dt_utc = parser.isoparse(utc_str)
+        return dt_utc.astimezone(timezone(timedelta(hours=-3)))
+    except Exception:
+        return None
+
+# ===============================================
+# ESPN + TheOddsAPI
+# ===============================================
+def fetch_from_espn():
+    """Busca jogos da ESPN (ao vivo, horários e canais)"""
+    url = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard"
+    try:
+        r = http.get(url, timeout=15, cache=True)
+        r.raise_for_status()
+        data = r.json()
+        games = []
+        for ev in data.get("events", []):
+            comp = ev.get("competitions", [{}])[0]
+            status_type = comp.get("status", {}).get("type", {})
+            state = status_type.get("state", "").lower()  # in, post, pre
+            status_detail = status_type.get("description", "")
+            comps = comp.get("competitors", [])
+
+            home = next((c for c in comps if c.get("homeAway") == "home"), {})
+            away = next((c for c in comps if c.get("homeAway") == "away"), {})
+
+            home_team = home.get("team", {}).get("displayName", "—")
+            away_team = away.get("team", {}).get("displayName", "—")
+            home_score = home.get("score")
+            away_score = away.get("score")
+
+            br_dt = to_brazil_time(comp.get("date"))
+            canais = ", ".join([b.get("names", [])[0] for b in comp.get("broadcasts", [])]) or "NBA League Pass"
+
+            games.append({
+                "home_team": home_team,
+                "away_team": away_team,
+                "home_score": home_score,
+                "away_score": away_score,
+                "hora_br": br_dt.strftime("%H:%M") if br_dt else "—",
+                "broadcast": canais,
+                "ao_vivo": state == "in",
+                "encerrado": state == "post",
+                "status_detail": status_detail,
+                "date_only": br_dt.date() if br_dt else datetime.now().date(),
+                "start_time": br_dt
+            })
+        return pd.DataFrame(games)
+    except Exception:
+        return pd.DataFrame()
+
+def fetch_oddsapi_events() -> list:
+    """
+    JSON cru de /odds (h2h, books dos EUA + Europa, inclusive a Pinnacle).
+    É a única chamada de /odds da NBA: a página Jogos e o agregador usam a
+    mesma resposta (mesma url+params -> mesmo cache) e separam os books
+    depois; também alimenta odds_history.
+    """
+    api_key = settings.ODDS_API_KEY
+    url = "https://api.the-odds-api.com/v4/sports/basketball_nba/odds/"
+    params = {"apiKey": api_key, "regions": "us,eu", "markets": "h2h"}
+    r = odds_get(url, api_key, params=params, timeout=15, cache=True)
+    # erro da API (401/429) vem como {"message": ...}: não é lista de eventos
+    data = r.json() if r is not None and r.ok else []
+    if not isinstance(data, list):
+        return []
+    record_safe(theodds_events_to_long(data, "nba"), "theodds_schedule")
+    return data
+
+def fetch_from_oddsapi():
+    """Busca jogos futuros via TheOddsAPI"""
+    try:
+        data = fetch_oddsapi_events()
+        games = []
+        for g in data:
+            if not g.get("commence_time"):
+                continue
+            br_dt = to_brazil_time(g["commence_time"])
+            games.append({
+                "home_team": g.get("home_team"),
+                "away_team": g.get("away_team"),
+                "home_score": None,
+                "away_score": None,
+                "hora_br": br_dt.strftime("%H:%M") if br_dt else "—",
+                "broadcast": "NBA League Pass",
+                "ao_vivo": False,
+                "encerrado": False,
+                "status_detail": "Agendado",
+                "date_only": br_dt.date() if br_dt else datetime.now().date(),
+                "start_time": br_dt
+            })
+        return pd.DataFrame(games)
+    except Exception:
+        return pd.DataFrame()
+
+def get_nba_schedule() -> pd.DataFrame:
+    """ESPN (ao vivo/encerrados) + TheOddsAPI (agendados), sem jogos repetidos."""
+    espn_df = fetch_from_espn()
+    odds_df = fetch_from_oddsapi()
+
+    df = pd.concat([espn_df, odds_df], ignore_index=True)
+    if df.empty:
+        return df
+    return df.drop_duplicates(subset=["home_team", "away_team"], keep="first")
+
+nba_schedule = SharedSnapshot(get_nba_schedule, ttl=SCHEDULE_REFRESH_SECONDS, name="nba_schedule")
@@ -1,4 +1,4 @@
-import requests
+from src.utils import http
 import pandas as pd
 from src.utils.config import settings
 from src.utils.logger import get_logger
@@ -15,7 +15,7 @@ def get_nfl_games_data() -> pd.DataFrame:
     params = {"league": "1", "season": "2025"}
 
     try:
-        response = requests.get(base_url, headers=headers, params=params, timeout=20)
+        response = http.get(base_url, headers=headers, params=params, timeout=20)
         response.raise_for_status()
         data = response.json().get("response", [])
         if not data:
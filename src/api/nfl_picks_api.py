@@ -1,7 +1,8 @@
-import requests
+from src.utils import http
 import pandas as pd
 from src.utils.config import settings
 from src.utils.logger import get_logger
+from src.db.odds_history import nfl_picks_to_long, record_safe
 
 logger = get_logger("nfl_picks_api")
 
@@ -17,7 +18,7 @@ def get_nfl_picks_data() -> pd.DataFrame:
     }
 
     try:
-        r = requests.get(base_url, headers=headers, params=params, timeout=15)
+        r = http.get(base_url, headers=headers, params=params, timeout=15)
         r.raise_for_status()
         data = r.json().get("response", [])
         rows = []
@@ -31,9 +32,11 @@ def get_nfl_picks_data() -> pd.DataFrame:
                                 "game": f"{game['home']['name']} x {game['away']['name']}",
                                 "pick": o["value"],
                                 "odd": o["odd"],
-                                "book": b["name"]
+                                "book": b["name"],
+                                "date": g["fixture"].get("date"),
                             })
         df = pd.DataFrame(rows)
+        record_safe(nfl_picks_to_long(df), "nfl_picks")
         logger.info(f"{len(df)} odds NFL carregadas com sucesso.")
         return df
     except Exception as e:
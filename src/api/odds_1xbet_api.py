@@ -1,7 +1,8 @@
-import requests
+from src.utils import http
 import pandas as pd
 from datetime import datetime
 import logging
+from src.db.odds_history import h2h_to_long, record_safe
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +26,7 @@ def get_h2h_odds_1xbet() -> pd.DataFrame:
     }
 
     try:
-        r = requests.get(url, headers=headers, timeout=15)
+        r = http.get(url, headers=headers, timeout=15)
         r.raise_for_status()
         data = r.json()
 
@@ -69,6 +70,7 @@ def get_h2h_odds_1xbet() -> pd.DataFrame:
 
         df = pd.DataFrame(rows)
         df = df.sort_values("date", ascending=True).reset_index(drop=True)
+        record_safe(h2h_to_long(df, "nba", book="1xbet"), "1xbet")
 
         logger.info(f"Odds NBA carregadas da 1xBet: {len(df)} jogos.")
         return df
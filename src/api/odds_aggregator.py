@@ -0,0 +1,149 @@
+# scorebet/src/api/odds_aggregator.py
+"""
+Agregador de odds H2H de todas as fontes.
+
+Cada fonte (The Odds API, 1xBet, API-Sports NFL) devolve um schema
+diferente; aqui todas rodam em paralelo (threads: é só espera de rede) e
+são convertidas para o formato longo de src/db/odds_history.py. Os fetchers já gravam o próprio histórico, então o
+agregador não grava nada.
+
+aggregate() calcula por evento, só com groupby/transform:
+- melhor preço disponível por seleção (e de qual book);
+- probabilidade sem vig de consenso: cada book é normalizado pela própria
+  margem (1/odd dividido pela soma do book) e a média entre books é
+  renormalizada para somar 1;
+- overround do mercado (margem média dos books) e o da melhor linha
+  (< 1 = arbitragem entre books).
+
+best_odds() devolve uma linha por jogo no mesmo formato de
+get_h2h_odds_theodds (date, home_team, away_team, home_odds, away_odds, book),
+com as colunas de consenso a mais.
+"""
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.api.nba_schedule_api import fetch_oddsapi_events
+from src.api.nfl_picks_api import get_nfl_picks_data
+from src.api.odds_1xbet_api import get_h2h_odds_1xbet
+from src.db.odds_history import LONG_COLUMNS, event_keys, h2h_to_long, nfl_picks_to_long, theodds_events_to_long
+from src.utils.logger import get_logger
+from src.utils.teams import canonical_names
+
+logger = get_logger("odds_aggregator")
+
+# nome -> (liga, função que devolve o formato longo)
+SOURCES: Dict[str, Tuple[str, Callable[[], pd.DataFrame]]] = {
+    # uma chamada só (regions=us,eu, Pinnacle inclusa), a mesma da página Jogos; o formato longo já separa por book
+    "theodds": ("nba", lambda: theodds_events_to_long(fetch_oddsapi_events(), "nba")),
+    "1xbet": ("nba", lambda: h2h_to_long(get_h2h_odds_1xbet(), "nba", book="1xbet")),
+    "apisports_nfl": ("nfl", lambda: nfl_picks_to_long(get_nfl_picks_data())),
+}
+
+def fetch_all(league: str | None = None, sources: Dict | None = None, max_workers: int = 8) -> pd.DataFrame:
+    """Roda as fontes em paralelo e concatena no formato longo; fonte com erro é só pulada."""
+    sources = {k: v for k, v in (sources or SOURCES).items() if league is None or v[0] == league}
+    if not sources:
+        return pd.DataFrame(columns=LONG_COLUMNS)
+
+    def run(item):
+        name, (_, fn) = item
+        t0 = time.perf_counter()
+        try:
+            df = fn()
+        except Exception as e:
+            logger.error(f"[odds_aggregator] {name} falhou: {e}")
+            return None
+        logger.info(f"[odds_aggregator] {name}: {0 if df is None else len(df)} cotações em {time.perf_counter() - t0:.1f}s")
+        if df is not None and not df.empty:
+            # cada fonte tem seu formato de data; converte antes de misturar
+            df = df.assign(commence_time=pd.to_datetime(df["commence_time"], utc=True, errors="coerce"))
+        return df
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(sources))) as pool:
+        frames = [df for df in pool.map(run, sources.items()) if df is not None and not df.empty]
+    if not frames:
+        return pd.DataFrame(columns=LONG_COLUMNS)
+    return pd.concat(frames, ignore_index=True)[LONG_COLUMNS]
+
+def aggregate(long: pd.DataFrame) -> pd.DataFrame:
+    """
+    Uma linha por (evento, seleção) do mercado h2h: best_price, best_book,
+    books, consensus_prob, fair_price, best_edge (= best_price * consensus - 1),
+    overround e best_overround do evento.
+    """
+    df = long[long["market"] == "h2h"].copy()
+    df["price"] = pd.to_numeric(df["price"], errors="coerce")
+    df = df[df["price"] > 1].dropna(subset=["home_team", "away_team", "selection", "book"])
+    if df.empty:
+        return pd.DataFrame()
+
+    for league, idx in df.groupby("league").groups.items():
+        for col in ("home_team", "away_team", "selection"):
+            df.loc[idx, col] = canonical_names(df.loc[idx, col], league)
+    df["event_key"] = event_keys(df)
+    df["book"] = df["book"].astype(str).str.lower()
+    # chaves inteiras: os groupby abaixo não comparam strings
+    df["ev"] = pd.factorize(df["event_key"])[0]
+    df["bk"] = pd.factorize(df["book"])[0]
+    df["sl"] = pd.factorize(df["selection"])[0]
+    # a mesma cotação pode vir de duas fontes (ex.: 1xbet pela The Odds API e pela API da 1xBet)
+    df = df.drop_duplicates(["ev", "bk", "sl"], keep="first")
+
+    df["implied"] = 1.0 / df["price"]
+    by_book = df.groupby(["ev", "bk"], sort=False)
+    df["book_sum"] = by_book["implied"].transform("sum")
+    df["book_n"] = by_book["sl"].transform("size")
+    df["event_n"] = df.groupby("ev", sort=False)["sl"].transform("nunique")
+    # book sem todas as seleções não tem margem definida: entra só no melhor preço
+    full = df["book_n"] == df["event_n"]
+    df["novig"] = np.where(full, df["implied"] / df["book_sum"], np.nan)
+
+    g = df.groupby(["ev", "sl"], sort=False)
+    best_idx = g["price"].idxmax()
+    out = df.loc[best_idx, ["ev", "sl", "league", "event_key", "commence_time", "home_team", "away_team",
+                            "selection", "price", "book"]]
+    out = out.rename(columns={"price": "best_price", "book": "best_book"}).set_index(["ev", "sl"])
+    out["books"] = g.size()
+    out["consensus_prob"] = g["novig"].mean()
+    out = out.reset_index()
+
+    ev = out.groupby("ev", sort=False)
+    out["consensus_prob"] = out["consensus_prob"] / ev["consensus_prob"].transform("sum")
+    out["fair_price"] = 1.0 / out["consensus_prob"]
+    out["best_edge"] = out["best_price"] * out["consensus_prob"] - 1
+    book_margin = df[full].drop_duplicates(["ev", "bk"]).groupby("ev")["book_sum"].mean()
+    out["overround"] = out["ev"].map(book_margin)
+    out["best_overround"] = (1.0 / out["best_price"]).groupby(out["ev"]).transform("sum")
+    return out.drop(columns=["ev", "sl"])
+
+def event_table(agg: pd.DataFrame) -> pd.DataFrame:
+    """aggregate() em uma linha por jogo (colunas home_*/away_*), no formato das odds da página de picks."""
+    if agg.empty:
+        return pd.DataFrame()
+    cols = ["best_price", "best_book", "consensus_prob", "fair_price", "books"]
+    base = agg.drop_duplicates("event_key")[["event_key", "league", "commence_time", "home_team", "away_team",
+                                             "overround", "best_overround"]].set_index("event_key")
+    home = agg[agg["selection"] == agg["home_team"]].set_index("event_key")[cols]
+    away = agg[agg["selection"] == agg["away_team"]].set_index("event_key")[cols]
+    out = base.join(home.add_prefix("home_")).join(away.add_prefix("away_")).reset_index()
+    out = out.rename(columns={
+        "commence_time": "date", "home_best_price": "home_odds", "away_best_price": "away_odds",
+        "home_best_book": "home_book", "away_best_book": "away_book",
+    })
+    out["book"] = np.where(out["home_book"] == out["away_book"], out["home_book"], "best")
+    out["date"] = pd.to_datetime(out["date"], utc=True, errors="coerce")
+    return out.sort_values("date", na_position="last").reset_index(drop=True)
+
+def best_odds(league: str = "nba") -> pd.DataFrame:
+    """Busca tudo, agrega e devolve uma linha por jogo (é o que o scheduler grava)."""
+    return event_table(aggregate(fetch_all(league)))
+
+if __name__ == "__main__":
+    with pd.option_context("display.width", 200, "display.max_columns", 30):
+        print(best_odds("nba"))
@@ -15,34 +15,30 @@ from src.utils.logger import get_logger
 
 # -----------------------------------------------------------------------
 
-import re
 from datetime import datetime
-import requests
+from src.utils import http
 import pandas as pd
 from src.utils.config import settings
 from src.utils.logger import get_logger
+from src.api.odds_quota import get_quota, odds_get
+from src.db.odds_history import h2h_to_long, props_to_long, record_safe
+from src.utils.teams import normalize, team_id
 
 logger = get_logger("odds_api")
 
-# ============================================================
-# 🔧 Normalização de nomes
-# ============================================================
-def _norm_name(s: str) -> str:
-    s = (s or "").lower().strip()
-    s = re.sub(r"[^a-z0-9 ]+", "", s)
-    s = re.sub(r"\s+", " ", s)
-    ALIAS = {
-        "la clippers": "los angeles clippers",
-        "la lakers": "los angeles lakers",
-        "ny knicks": "new york knicks",
-        "gs warriors": "golden state warriors",
-        "okc thunder": "oklahoma city thunder",
-        "gsw": "golden state warriors",
-        "nyk": "new york knicks",
-        "lal": "los angeles lakers",
-        "lac": "los angeles clippers",
-    }
-    return ALIAS.get(s, s)
+_unmapped: set = set()
+
+def _same_team(a: str, b: str, league: str = "nba") -> bool:
+    """Mesmo time pelo registro canônico; nome fora do registro cai na comparação por nome normalizado."""
+    ia, ib = team_id(a, league), team_id(b, league)
+    if ia is not None and ib is not None:
+        return ia == ib
+    for name, tid in ((a, ia), (b, ib)):
+        if tid is None and name and name not in _unmapped:
+            _unmapped.add(name)
+            logger.warning(f"[theodds] time sem alias em src/utils/teams.py: {name!r} (comparando por nome)")
+    na, nb = normalize(a), normalize(b)
+    return bool(na and nb) and (na == nb or na in nb or nb in na)
 
 # ============================================================
 # 🏀 TheOddsAPI — odds H2H
@@ -66,7 +62,10 @@ def get_h2h_odds_theodds(book: str = "1xbet", days_to: int = 7) -> pd.DataFrame:
     }
 
     try:
-        r = requests.get(base_url, params=params, timeout=25)
+        r = odds_get(base_url, settings.ODDS_API_KEY, params=params, timeout=25, cache=True)
+        if r is None:
+            logger.warning("[theodds] cota da API esgotada e sem resposta em cache.")
+            return pd.DataFrame()
         r.raise_for_status()
         data = r.json()
     except Exception as e:
@@ -101,15 +100,14 @@ def get_h2h_odds_theodds(book: str = "1xbet", days_to: int = 7) -> pd.DataFrame:
             if not outcomes:
                 continue
 
-            home_key, away_key = _norm_name(home), _norm_name(away)
             for out in outcomes:
-                nm = _norm_name(out.get("name", ""))
+                nm = out.get("name", "")
                 price = out.get("price")
                 if price is None:
                     continue
-                if (home_odd is None) and (nm == home_key or home_key in nm or nm in home_key):
+                if home_odd is None and _same_team(nm, home):
                     home_odd = price
-                elif (away_odd is None) and (nm == away_key or away_key in nm or nm in away_key):
+                elif away_odd is None and _same_team(nm, away):
                     away_odd = price
             break  # só precisa do bookmaker principal
 
@@ -125,6 +123,7 @@ def get_h2h_odds_theodds(book: str = "1xbet", days_to: int = 7) -> pd.DataFrame:
     df = pd.DataFrame(rows)
     if not df.empty:
         df = df.sort_values("date", na_position="last").reset_index(drop=True)
+        record_safe(h2h_to_long(df, "nba", book=book or "theodds"), "theodds")
     logger.info(f"[theodds] jogos retornados para {book}: {len(df)}")
     return df
 
@@ -132,66 +131,102 @@ def get_h2h_odds_theodds(book: str = "1xbet", days_to: int = 7) -> pd.DataFrame:
 # ============================================================
 # Alias compatível para Player Picks (corrigido)
 # ============================================================
-def get_player_props_nba():
-    """Obtém player props (pontos, assistências, rebotes) via TheOddsAPI com fallback público."""
-    import requests
-    import pandas as pd
-    from src.utils.config import settings
-    from src.utils.logger import get_logger
-
-    logger = get_logger("odds_api")
-    url = "https://api.the-odds-api.com/v4/sports/basketball_nba/odds"
-    markets = ["player_points", "player_assists", "player_rebounds"]
+PROPS_URL = "https://api.the-odds-api.com/v4/sports/basketball_nba/odds"
+PROPS_MARKETS = ["player_points", "player_assists", "player_rebounds"]
+
+
+def _fetch_props_market(market: str, region: str) -> list:
+    """
+    Baixa mercado(s) de props numa região. `market` pode ser uma lista separada
+    por vírgula (modo agrupado). Retorna as linhas já no schema final.
+    """
+    params = {
+        "regions": region,
+        "markets": market,
+        "oddsFormat": "decimal",
+        "apiKey": settings.ODDS_API_KEY,
+    }
+    r = odds_get(PROPS_URL, settings.ODDS_API_KEY, params=params, timeout=25)
+    if r is None:
+        logger.warning(f"[player_props] {market.upper()} pulado: cota da API esgotada")
+        return []
+    if r.status_code == 422:
+        logger.warning(f"[player_props] {market.upper()} não disponível na TheOddsAPI ({region})")
+        return []
+    r.raise_for_status()
+
+    rows = []
+    for game in r.json():
+        home = game.get("home_team")
+        away = game.get("away_team")
+        for bookmaker in game.get("bookmakers", []):
+            book = bookmaker.get("title")
+            for mkt in bookmaker.get("markets", []):
+                for outcome in mkt.get("outcomes", []):
+                    rows.append({
+                        "home_team": home,
+                        "away_team": away,
+                        "book": book,
+                        "market": mkt.get("key", market),
+                        "player": outcome.get("description"),
+                        "line": outcome.get("point"),
+                        "odd": outcome.get("price"),
+                        "side": outcome.get("name"),
+                        "commence_time": game.get("commence_time"),
+                    })
+    return rows
+
+
+def get_player_props_nba(concurrent: bool = True, max_workers: int = 4, deadline: float = 30.0):
+    """
+    Obtém player props (pontos, assistências, rebotes) via TheOddsAPI com fallback público.
+    Com `concurrent=True` todos os mercados/regiões são pedidos em paralelo
+    (no máximo `max_workers` de cada vez, prazo global de `deadline` s), então a
+    latência fica ~max(mercado) em vez da soma. O schema do DataFrame é o mesmo.
+    """
     regions = ["us"]
+    if get_quota().is_low(settings.ODDS_API_KEY):
+        # cota baixa: um request com todos os mercados em vez de um por mercado
+        logger.warning("[player_props] cota baixa — agrupando mercados num único request")
+        combos = [(",".join(PROPS_MARKETS), region) for region in regions]
+    else:
+        combos = [(market, region) for market in PROPS_MARKETS for region in regions]
 
     all_rows = []
 
     # === 1️⃣ tenta a TheOddsAPI ===
-    for market in markets:
-        for region in regions:
-            params = {
-                "regions": region,
-                "markets": market,
-                "oddsFormat": "decimal",
-                "apiKey": settings.ODDS_API_KEY,
-            }
+    if concurrent:
+        results = http.gather(
+            (((m, reg), (lambda m=m, reg=reg: _fetch_props_market(m, reg))) for m, reg in combos),
+            max_workers=max_workers,
+            deadline=deadline,
+        )
+    else:
+        results = {}
+        for market, region in combos:
             try:
-                r = requests.get(url, params=params, timeout=25)
-                if r.status_code == 422:
-                    logger.warning(f"[player_props] {market.upper()} não disponível na TheOddsAPI ({region})")
-                    continue
-                r.raise_for_status()
-                data = r.json()
+                results[(market, region)] = _fetch_props_market(market, region)
             except Exception as e:
-                logger.error(f"[player_props] erro {market.upper()} ({region}): {e}")
-                continue
+                results[(market, region)] = e
 
-            for game in data:
-                home = game.get("home_team")
-                away = game.get("away_team")
-                for bookmaker in game.get("bookmakers", []):
-                    book = bookmaker.get("title")
-                    for mkt in bookmaker.get("markets", []):
-                        for outcome in mkt.get("outcomes", []):
-                            all_rows.append({
-                                "home_team": home,
-                                "away_team": away,
-                                "book": book,
-                                "market": market,
-                                "player": outcome.get("description"),
-                                "line": outcome.get("point"),
-                                "odd": outcome.get("price"),
-                            })
+    # junta na ordem mercado/região, igual ao modo sequencial
+    for (market, region), res in results.items():
+        if isinstance(res, BaseException):
+            logger.error(f"[player_props] erro {market.upper()} ({region}): {res}")
+            continue
+        all_rows.extend(res)
 
     if len(all_rows) > 0:
         df = pd.DataFrame(all_rows)
+        record_safe(props_to_long(df, "nba", price_col="odd", point_col="line",
+                                  player_col="player", side_col="side"), "theodds_props")
         logger.info(f"[player_props] retornadas {len(df)} linhas de player props via TheOddsAPI.")
         return df
 
     # === 2️⃣ fallback público (BallDontLie API) ===
     try:
         logger.warning("[player_props] Fallback ativado — buscando dados no BallDontLie API...")
-        resp = requests.get("https://www.balldontlie.io/api/v1/players?per_page=50", timeout=15)
+        resp = http.get("https://www.balldontlie.io/api/v1/players?per_page=50", timeout=15)
         resp.raise_for_status()
         players = resp.json().get("data", [])
         df = pd.DataFrame([{
@@ -1,4 +1,5 @@
-import requests
+from src.utils import http
+from src.api.odds_quota import odds_get
 import pandas as pd
 from datetime import datetime, timezone
 import logging
@@ -35,8 +36,10 @@ def get_player_props_data(days_ahead=3):
             "oddsFormat": "decimal",
             "bookmakers": "bet365",
         }
-        resp = requests.get(THE_ODDS_URL, params=params, timeout=20)
-        if resp.status_code == 200:
+        resp = odds_get(THE_ODDS_URL, THE_ODDS_API_KEY, params=params, timeout=20)
+        if resp is None:
+            logger.warning("TheOddsAPI pulada: cota esgotada")
+        elif resp.status_code == 200:
             data = resp.json()
             for ev in data:
                 home, away = ev.get("home_team"), ev.get("away_team")
@@ -66,7 +69,7 @@ def get_player_props_data(days_ahead=3):
     if not all_rows:
         try:
             headers = {"Ocp-Apim-Subscription-Key": SPORTSDATA_IO_KEY}
-            resp = requests.get(SPORTSDATA_URL, headers=headers, timeout=20)
+            resp = http.get(SPORTSDATA_URL, headers=headers, timeout=20)
             if resp.status_code == 200:
                 players = resp.json()
                 for p in players[:100]:  # limitar
@@ -95,7 +98,7 @@ def get_player_props_data(days_ahead=3):
         try:
             headers = {"Authorization": BALLDONTLIE_KEY}
             params = {"per_page": 50}
-            resp = requests.get(BALLDONTLIE_URL, params=params, headers=headers, timeout=15)
+            resp = http.get(BALLDONTLIE_URL, params=params, headers=headers, timeout=15)
             if resp.status_code == 200:
                 stats = resp.json().get("data", [])
                 for s in stats:
@@ -2,7 +2,7 @@
 # ScoreBet - Odds e Métricas Simuladas (Temporada 2025/2026)
 # ============================================================
 
-import requests
+from src.utils import http
 import random
 import pandas as pd
 import logging
@@ -33,7 +33,7 @@ def get_team_players(team_name: str, team_id: str):
     try:
         url = f"{BASE_URL}/{API_KEY}/lookup_all_players.php"
         params = {"id": team_id}
-        r = requests.get(url, params=params, timeout=15)
+        r = http.get(url, params=params, timeout=15)
         r.raise_for_status()
         data = r.json().get("player", [])
 
@@ -0,0 +1,217 @@
+# scorebet/src/api/odds_quota.py
+"""
+Controle de cota da The Odds API.
+
+Toda resposta da API traz x-requests-remaining / x-requests-used /
+x-requests-last. Aqui guardamos esses números por chave (em memória e num
+JSON em settings.ODDS_QUOTA_FILE, compartilhado entre processos) e decidimos
+antes de cada chamada:
+
+- allow(): nega chamadas que deixariam menos de ODDS_QUOTA_RESERVE créditos;
+  nesse caso odds_get() devolve a última resposta em cache (se houver).
+- is_low(): abaixo de ODDS_QUOTA_LOW os fetchers de props agrupam os
+  mercados num único request em vez de um por mercado.
+- budget_view(): DataFrame com o saldo de cada chave (para diagnóstico).
+
+O JSON é relido e mesclado (por chave, vale o updated_at mais novo) sob um
+lock de arquivo antes de cada gravação, então scheduler e Streamlit não
+sobrescrevem a contagem um do outro. odds_get() passa ao cache HTTP um
+sender que também checa/registra a cota: a revalidação em segundo plano
+(stale-while-revalidate) gasta créditos e precisa ser contada.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import requests
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from src.utils import http
+from src.utils.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger("odds_quota")
+
+
+def _fingerprint(api_key: str | None) -> str:
+    """Identifica a chave sem gravá-la em texto puro."""
+    return hashlib.sha1((api_key or "").encode("utf-8")).hexdigest()[:10]
+
+
+def estimate_cost(params: dict | None) -> int:
+    """Custo da The Odds API = nº de mercados × nº de regiões."""
+    params = params or {}
+    markets = [m for m in str(params.get("markets", "h2h")).split(",") if m]
+    regions = [r for r in str(params.get("regions", "us")).split(",") if r]
+    return max(1, len(markets)) * max(1, len(regions))
+
+
+class QuotaExceeded(RuntimeError):
+    """Chamada recusada para preservar ODDS_QUOTA_RESERVE."""
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """Lock exclusivo entre processos (arquivo <path>.lock)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_suffix(path.suffix + ".lock"), "a+b") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        else:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+            else:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _merge(mine: dict, theirs: dict) -> dict:
+    """Por chave, fica o estado com updated_at mais novo."""
+    out = dict(theirs)
+    for fp, st in mine.items():
+        if st.get("updated_at", 0) >= out.get(fp, {}).get("updated_at", 0):
+            out[fp] = st
+    return out
+
+
+class QuotaManager:
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path or settings.ODDS_QUOTA_FILE)
+        self._lock = threading.Lock()
+        self._mtime: float | None = None
+        self._state: dict[str, dict[str, Any]] = self._load()
+
+    def _load(self) -> dict:
+        try:
+            self._mtime = self.path.stat().st_mtime
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _refresh(self) -> None:
+        """Mescla o que outro processo gravou desde a última leitura (chame com self._lock)."""
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self._state = _merge(self._state, self._load())
+
+    def _save(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(self._state), encoding="utf-8")
+            os.replace(tmp, self.path)
+            self._mtime = self.path.stat().st_mtime
+        except OSError as e:
+            logger.warning(f"[quota] falha ao gravar {self.path}: {e}")
+
+    def record(self, api_key: str | None, resp: requests.Response) -> None:
+        """Lê os headers de cota de uma resposta que veio da rede."""
+        if resp.headers.get("X-Cache") not in (None, "MISS"):
+            return  # resposta servida do cache: não consumiu nada
+        remaining = resp.headers.get("x-requests-remaining")
+        if remaining is None:
+            return
+        fp = _fingerprint(api_key)
+        try:
+            with self._lock, _file_lock(self.path):
+                # relê sob o lock: o arquivo pode ter sido gravado por outro processo
+                self._state = _merge(self._state, self._load())
+                st = self._state.setdefault(fp, {"calls": 0})
+                st["remaining"] = int(float(remaining))
+                st["used"] = int(float(resp.headers.get("x-requests-used", st.get("used", 0))))
+                st["last_cost"] = int(float(resp.headers.get("x-requests-last", 0)))
+                st["calls"] = st.get("calls", 0) + 1
+                st["updated_at"] = time.time()
+                self._save()
+        except OSError as e:
+            logger.warning(f"[quota] falha no lock de {self.path}: {e}")
+            return
+        if st["remaining"] < settings.ODDS_QUOTA_LOW:
+            logger.warning(f"[quota] chave {fp}: restam {st['remaining']} créditos")
+
+    def remaining(self, api_key: str | None) -> int | None:
+        with self._lock:
+            self._refresh()
+            return self._state.get(_fingerprint(api_key), {}).get("remaining")
+
+    def allow(self, api_key: str | None, cost: int = 1) -> bool:
+        rem = self.remaining(api_key)
+        return rem is None or rem - cost >= settings.ODDS_QUOTA_RESERVE
+
+    def is_low(self, api_key: str | None) -> bool:
+        rem = self.remaining(api_key)
+        return rem is not None and rem < settings.ODDS_QUOTA_LOW
+
+    def budget_view(self) -> pd.DataFrame:
+        with self._lock:
+            self._refresh()
+            rows = [{"key": fp, **st} for fp, st in self._state.items()]
+        df = pd.DataFrame(rows)
+        if not df.empty and "updated_at" in df.columns:
+            df["updated_at"] = pd.to_datetime(df["updated_at"], unit="s")
+        return df
+
+
+_quota: QuotaManager | None = None
+_quota_lock = threading.Lock()
+
+
+def get_quota() -> QuotaManager:
+    global _quota
+    if _quota is None:
+        with _quota_lock:
+            if _quota is None:
+                _quota = QuotaManager()
+    return _quota
+
+
+def odds_get(url: str, api_key: str | None, params: dict | None = None, **kwargs: Any) -> requests.Response | None:
+    """
+    http.get para a The Odds API com contabilidade de cota.
+    Se a cota não comporta o custo estimado, não vai à rede: devolve a última
+    resposta em cache para url+params (ou None).
+    """
+    quota = get_quota()
+    cost = estimate_cost(params)
+    if not quota.allow(api_key, cost):
+        logger.warning(
+            f"[quota] chamada bloqueada (custo {cost}, restam {quota.remaining(api_key)}); usando cache se houver"
+        )
+        return http.get_client().cache.peek(url, params)
+
+    client = http.get_client()
+
+    def send(u: str, **kw: Any) -> requests.Response:
+        # também é o sender da revalidação em segundo plano do cache
+        if not quota.allow(api_key, cost):
+            raise QuotaExceeded(f"custo {cost}, restam {quota.remaining(api_key)}")
+        resp = client.request("GET", u, **kw)
+        quota.record(api_key, resp)
+        return resp
+
+    return client.get(url, params=params, send=send, **kwargs)
+
+
+def budget_view() -> pd.DataFrame:
+    return get_quota().budget_view()
@@ -1,4 +1,4 @@
-import requests
+from src.utils import http
 import pandas as pd
 import logging
 
@@ -15,7 +15,7 @@ def get_recent_player_stats(season=2024, per_page=100):
 
         while True:
             params = {"season": season, "per_page": per_page, "page": page}
-            r = requests.get(BALLDONTLIE_URL, params=params, timeout=15)
+            r = http.get(BALLDONTLIE_URL, params=params, timeout=15)
             if r.status_code == 401:
                 logger.error("401 Unauthorized — rota incorreta para o plano gratuito.")
                 break
@@ -0,0 +1,190 @@
+# scorebet/src/db/backfill.py
+"""
+Backfill de temporadas inteiras da NBA (balldontlie -> nba_games).
+
+    python -m src.db.backfill --season 2023 2024
+    python -m src.db.backfill --season 2024 --chunk-days 10 --workers 4
+    python -m src.db.backfill --season 2024 --reset     # ignora checkpoints
+
+A temporada é quebrada em blocos de datas; os blocos são baixados em paralelo
+e gravados em ordem, página a página (upsert_nba_games_iter), conforme as
+páginas chegam — um bloco grande não fica inteiro na memória antes do
+upsert. Cada bloco gravado vira uma linha em backfill_checkpoints, então uma execução interrompida
+retoma dos blocos que faltam: um bloco só é pulado se os checkpoints cobrem
+todo o seu intervalo, então mudar --chunk-days não pula nem repete datas.
+Bloco que chega até ontem (UTC; temporada em andamento) é gravado mas não vira
+checkpoint: a próxima execução busca de novo o resto da semana e os
+placares dos jogos que ainda não tinham terminado.
+"""
+from __future__ import annotations
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import argparse
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterator, List, Tuple
+
+import pandas as pd
+from sqlalchemy import delete, select
+
+from src.api.nba_data import iter_games_frames
+from src.db.init_db import create_all
+from src.db.models import BackfillCheckpoint
+from src.db.setup import ReadSession, SessionLocal
+from src.db.upsert_games import upsert_nba_games_iter
+from src.ml.feature_store import update_feature_store
+from src.utils.logger import get_logger
+
+logger = get_logger("backfill")
+
+Chunk = Tuple[date, date]
+
+def season_bounds(season: int) -> Chunk:
+    """Temporada 'season' da balldontlie = out/season .. jun/season+1 (limitada a hoje)."""
+    start = date(season, 10, 1)
+    end = min(date(season + 1, 6, 30), date.today())
+    return start, end
+
+def split_chunks(start: date, end: date, chunk_days: int = 7) -> List[Chunk]:
+    chunks, cur = [], start
+    while cur <= end:
+        stop = min(cur + timedelta(days=chunk_days - 1), end)
+        chunks.append((cur, stop))
+        cur = stop + timedelta(days=1)
+    return chunks
+
+def is_closed(chunk: Chunk) -> bool:
+    """
+    Bloco inteiro no passado: nenhum jogo dele ainda vai mudar. A data dos
+    jogos é a dos EUA e o host pode estar em outro fuso (UTC-3): jogo da noite
+    de ontem ainda pode estar rolando, então a folga é de um dia sobre o UTC.
+    """
+    return chunk[1] < datetime.now(timezone.utc).date() - timedelta(days=1)
+
+def _done_ranges(season: int) -> List[Chunk]:
+    """Intervalos já cobertos por checkpoints da temporada (contíguos unidos)."""
+    with ReadSession() as s:
+        rows = s.execute(
+            select(BackfillCheckpoint.chunk_start, BackfillCheckpoint.chunk_end)
+            .where(BackfillCheckpoint.season == season)
+            .order_by(BackfillCheckpoint.chunk_start)
+        ).all()
+    ranges: List[Chunk] = []
+    for start, end in rows:
+        if ranges and start <= ranges[-1][1] + timedelta(days=1):
+            ranges[-1] = (ranges[-1][0], max(ranges[-1][1], end))
+        else:
+            ranges.append((start, end))
+    return ranges
+
+def is_done(chunk: Chunk, done: List[Chunk]) -> bool:
+    """Bloco feito só se [início, fim] inteiro está coberto (vale mesmo mudando --chunk-days)."""
+    return any(start <= chunk[0] and chunk[1] <= end for start, end in done)
+
+def _mark_done(season: int, chunk: Chunk, games: int) -> None:
+    with SessionLocal() as s:
+        s.merge(BackfillCheckpoint(
+            season=season, chunk_start=chunk[0], chunk_end=chunk[1],
+            games=games, finished_at=datetime.now(),
+        ))
+        s.commit()
+
+def reset_season(season: int) -> None:
+    with SessionLocal() as s:
+        s.execute(delete(BackfillCheckpoint).where(BackfillCheckpoint.season == season))
+        s.commit()
+
+_END = object()
+
+def _fetch_chunk(chunk: Chunk, out: "queue.Queue") -> None:
+    """Baixa um bloco e põe cada página (DataFrame) na fila assim que chega; termina com _END ou a exceção."""
+    days = (chunk[1] - chunk[0]).days + 1
+    dates = [(chunk[0] + timedelta(days=i)).isoformat() for i in range(days)]
+    try:
+        for frame in iter_games_frames(dates):
+            out.put(frame)
+    except Exception as e:
+        out.put(e)
+    else:
+        out.put(_END)
+
+def _drain(out: "queue.Queue") -> Iterator[pd.DataFrame]:
+    """Páginas de um bloco na ordem em que chegam, até o fim (ou a exceção do download)."""
+    while True:
+        item = out.get()
+        if item is _END:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+def backfill_season(season: int, chunk_days: int = 7, workers: int = 3) -> dict:
+    """
+    Baixa e grava uma temporada. Retorna um resumo
+    {season, chunks, skipped, failed, games}.
+    """
+    create_all()
+    start, end = season_bounds(season)
+    chunks = split_chunks(start, end, chunk_days)
+    done = _done_ranges(season)
+    todo = [c for c in chunks if not is_done(c, done)]
+    logger.info(f"[backfill] temporada {season}: {len(chunks)} blocos, {len(chunks) - len(todo)} já feitos")
+
+    games, failed, changed = 0, 0, []
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="backfill") as pool:
+        # até `workers` blocos baixando adiantado; cada um tem sua fila de páginas
+        queues = [queue.Queue() for _ in todo]
+        for chunk, out in zip(todo, queues):
+            pool.submit(_fetch_chunk, chunk, out)
+        # grava na thread principal (um único escritor no banco), bloco a bloco
+        # e página a página, conforme as páginas chegam
+        for chunk, out in zip(todo, queues):
+            try:
+                n = upsert_nba_games_iter(_drain(out))
+            except Exception as e:
+                failed += 1
+                logger.error(f"[backfill] bloco {chunk[0]}..{chunk[1]} falhou: {e}")
+                continue
+            rows = n.total + n.unchanged
+            if is_closed(chunk):
+                _mark_done(season, chunk, rows)
+            games += rows
+            changed += n.changed_ids
+            logger.info(f"[backfill] {chunk[0]}..{chunk[1]}: {rows} jogos (upsert {n})")
+
+    return {
+        "season": season,
+        "chunks": len(chunks),
+        "skipped": len(chunks) - len(todo),
+        "failed": failed,
+        "games": games,
+        "changed_ids": changed,
+    }
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Backfill de temporadas NBA (balldontlie).")
+    ap.add_argument("--season", type=int, nargs="+", required=True, help="ex.: 2023 2024")
+    ap.add_argument("--chunk-days", type=int, default=7, help="dias por bloco (padrão 7)")
+    ap.add_argument("--workers", type=int, default=3, help="blocos baixados em paralelo")
+    ap.add_argument("--reset", action="store_true", help="apaga os checkpoints antes de rodar")
+    args = ap.parse_args(argv)
+
+    create_all()
+    failed, changed = 0, []
+    for season in args.season:
+        if args.reset:
+            reset_season(season)
+        summary = backfill_season(season, chunk_days=args.chunk_days, workers=args.workers)
+        failed += summary["failed"]
+        changed += summary.pop("changed_ids")
+        print({**summary, "changed": len(changed)})
+    # backfill entra abaixo da marca d'água: o store detecta e se reconstrói uma vez só
+    print(update_feature_store(changed_ids=changed))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,232 @@
+# scorebet/src/db/bulk_upsert.py
+"""
+Upsert em lote independente de dialeto.
+
+    with engine.begin() as conn:
+        res = bulk_upsert(conn, NBAGame.__table__, rows, key_cols=["game_id"])
+
+- As linhas são divididas em blocos que cabem no limite de parâmetros por
+  statement do banco (MAX_PARAMS); cada bloco é um único INSERT multi-linha.
+- SQLite: INSERT ... ON CONFLICT DO UPDATE; PostgreSQL: o mesmo, com
+  RETURNING (xmax = 0) para saber quem foi inserido; MySQL/MariaDB:
+  INSERT ... ON DUPLICATE KEY UPDATE.
+- Outros bancos: tabela temporária de staging + UPDATE/INSERT ... SELECT
+  (dois statements por bloco em vez de um merge por linha).
+- Chaves repetidas no lote: vale a última linha.
+- inserted/updated são exatos: no PostgreSQL vêm do RETURNING; nos demais,
+  as chaves de cada bloco já existentes são lidas antes do upsert, na
+  mesma transação.
+
+bulk_upsert_columns() é o caminho colunar (arrays NumPy tipados, sem
+dicts por linha): no SQLite vai direto para o executemany do driver com
+tuplas; nos outros dialetos nativos, para o executemany do SQLAlchemy
+(que agrupa em INSERTs multi-linha — "insertmanyvalues").
+"""
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+import numpy as np
+from sqlalchemy import Column, MetaData, Table, and_, exists, insert, literal_column, select, tuple_, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from src.utils.logger import get_logger
+
+logger = get_logger("bulk_upsert")
+
+# parâmetros por statement (margem abaixo do limite real de cada driver)
+MAX_PARAMS = {
+    "sqlite": 32_000 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999,
+    "postgresql": 32_000,      # asyncpg/psycopg3 aceitam até 32767
+    "mysql": 60_000,
+    "mariadb": 60_000,
+}
+DEFAULT_MAX_PARAMS = 2_000
+
+@dataclass
+class UpsertResult:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0                                        # só quando o chamador compara antes (ex.: row_hash)
+    changed_ids: List = field(default_factory=list)           # chaves inseridas/atualizadas, quando informadas
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated
+
+    def __iadd__(self, other: "UpsertResult") -> "UpsertResult":
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+        self.changed_ids.extend(other.changed_ids)
+        return self
+
+    def __str__(self) -> str:
+        return f"{self.inserted} inseridas, {self.updated} atualizadas, {self.unchanged} sem mudança"
+
+def chunk_size(dialect: str, n_cols: int) -> int:
+    return max(1, MAX_PARAMS.get(dialect, DEFAULT_MAX_PARAMS) // max(1, n_cols))
+
+def _key_expr(table: Table, key_cols: Sequence[str]):
+    return table.c[key_cols[0]] if len(key_cols) == 1 else tuple_(*(table.c[k] for k in key_cols))
+
+def _key_of(row: dict, key_cols: Sequence[str]):
+    return row[key_cols[0]] if len(key_cols) == 1 else tuple(row[k] for k in key_cols)
+
+def _existing_keys(conn, table: Table, key_cols: Sequence[str], rows: List[dict]) -> set:
+    keys = [_key_of(r, key_cols) for r in rows]
+    stmt = select(*(table.c[k] for k in key_cols)).where(_key_expr(table, key_cols).in_(keys))
+    res = conn.execute(stmt)
+    return {r[0] for r in res} if len(key_cols) == 1 else {tuple(r) for r in res}
+
+def _upsert_native(conn, table, rows, key_cols, update_cols, dialect) -> UpsertResult:
+    if dialect == "postgresql":
+        stmt = postgresql.insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(index_elements=key_cols, set_={c: stmt.excluded[c] for c in update_cols})
+        flags = conn.execute(stmt.returning(literal_column("(xmax = 0)"))).scalars().all()
+        ins = sum(bool(f) for f in flags)
+        return UpsertResult(ins, len(flags) - ins)
+
+    inserted = len(rows) - len(_existing_keys(conn, table, key_cols, rows))
+    if dialect == "sqlite":
+        stmt = sqlite.insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(index_elements=key_cols, set_={c: stmt.excluded[c] for c in update_cols})
+    else:
+        stmt = mysql.insert(table).values(rows)
+        stmt = stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in update_cols})
+    conn.execute(stmt)
+    return UpsertResult(inserted, len(rows) - inserted)
+
+def _upsert_staging(conn, table, rows, key_cols, update_cols) -> UpsertResult:
+    """Fallback portável: staging temporária + UPDATE ... WHERE EXISTS + INSERT ... SELECT WHERE NOT EXISTS."""
+    cols = list(rows[0])
+    stage = Table(
+        f"_stage_{table.name}", MetaData(),
+        *(Column(c, table.c[c].type) for c in cols),
+        prefixes=["TEMPORARY"],
+    )
+    stage.create(conn, checkfirst=True)
+    try:
+        conn.execute(stage.delete())
+        conn.execute(insert(stage), rows)                  # executemany
+        match = and_(*(stage.c[k] == table.c[k] for k in key_cols))
+        upd = (
+            update(table)
+            .values({c: select(stage.c[c]).where(match).scalar_subquery() for c in update_cols})
+            .where(exists(select(1).select_from(stage).where(match)))
+        )
+        updated = conn.execute(upd).rowcount if update_cols else 0
+        new = select(*(stage.c[c] for c in cols)).where(~exists(select(1).select_from(table).where(match)))
+        inserted = conn.execute(insert(table).from_select(cols, new)).rowcount
+        return UpsertResult(inserted, updated)
+    finally:
+        stage.drop(conn, checkfirst=True)
+
+def bulk_upsert(
+    conn,
+    table: Table,
+    rows: List[Dict],
+    key_cols: Sequence[str],
+    update_cols: Sequence[str] | None = None,
+    method: str = "auto",
+) -> UpsertResult:
+    """
+    Insere ou atualiza `rows` (dicts com as mesmas chaves) em `table` dentro
+    da transação de `conn`. `method`: "auto" (nativo quando o dialeto tem)
+    ou "staging" (força o fallback).
+    """
+    if not rows:
+        return UpsertResult()
+    # chave repetida no lote: vale a última (o PostgreSQL recusa a mesma chave duas vezes num INSERT)
+    rows = list({_key_of(r, key_cols): r for r in rows}.values())
+    dialect = conn.dialect.name
+    cols = list(rows[0])
+    update_cols = [c for c in (update_cols or cols) if c not in key_cols]
+    native = method == "auto" and dialect in ("sqlite", "postgresql", "mysql", "mariadb")
+    size = chunk_size(dialect, len(cols))
+
+    result = UpsertResult()
+    for i in range(0, len(rows), size):
+        chunk = rows[i:i + size]
+        if native:
+            result += _upsert_native(conn, table, chunk, key_cols, update_cols, "mysql" if dialect == "mariadb" else dialect)
+        else:
+            result += _upsert_staging(conn, table, chunk, key_cols, update_cols)
+    logger.debug(f"[bulk_upsert] {table.name} ({dialect}, {'nativo' if native else 'staging'}): {result}")
+    return result
+
+# --- caminho colunar --------------------------------------------------------------
+
+def _driver_list(arr: np.ndarray, dialect: str) -> list:
+    """Array tipado -> lista de valores nativos do driver (int/float/str/date/None)."""
+    if arr.dtype.kind == "M":
+        if dialect == "sqlite":   # o tipo Date do SQLAlchemy grava ISO 'YYYY-MM-DD' no SQLite
+            out = np.datetime_as_string(arr.astype("datetime64[D]"), unit="D").astype(object)
+            out[np.isnat(arr)] = None
+            return out.tolist()
+        return arr.astype("datetime64[D]").astype(object).tolist()   # datetime.date; NaT -> None
+    return arr.tolist()
+
+def _upsert_statement(table: Table, cols: Sequence[str], key_cols: Sequence[str],
+                      update_cols: Sequence[str], dialect: str):
+    if dialect == "sqlite":
+        stmt = sqlite.insert(table)
+        return stmt.on_conflict_do_update(index_elements=key_cols, set_={c: stmt.excluded[c] for c in update_cols})
+    if dialect == "postgresql":
+        stmt = postgresql.insert(table)
+        return stmt.on_conflict_do_update(index_elements=key_cols, set_={c: stmt.excluded[c] for c in update_cols})
+    stmt = mysql.insert(table)
+    return stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in update_cols})
+
+def bulk_upsert_columns(
+    conn,
+    table: Table,
+    columns: Dict[str, np.ndarray],
+    key_cols: Sequence[str],
+    update_cols: Sequence[str] | None = None,
+    existing: np.ndarray | None = None,
+    batch_rows: int = 50_000,
+) -> UpsertResult:
+    """
+    Upsert a partir de colunas (mesmo comprimento, chaves sem repetição).
+    `existing` (bool por linha) diz quais chaves já estão na tabela — se o
+    chamador já sabe, evita a leitura; senão as chaves são consultadas.
+    """
+    cols = list(columns)
+    n = len(columns[cols[0]]) if cols else 0
+    if n == 0:
+        return UpsertResult()
+    dialect = conn.dialect.name
+    dialect = "mysql" if dialect == "mariadb" else dialect
+    update_cols = [c for c in (update_cols or cols) if c not in key_cols]
+
+    if dialect not in ("sqlite", "postgresql", "mysql"):
+        rows = [dict(zip(cols, t)) for t in zip(*(_driver_list(columns[c], dialect) for c in cols))]
+        return bulk_upsert(conn, table, rows, key_cols, update_cols, method="staging")
+
+    if existing is None:
+        keys = list(zip(*(columns[k].tolist() for k in key_cols)))
+        found, size = set(), chunk_size(dialect, len(key_cols))
+        for i in range(0, n, size):
+            part = [dict(zip(key_cols, k)) for k in keys[i:i + size]]
+            found |= _existing_keys(conn, table, key_cols, part)
+        existing = np.fromiter(((k[0] if len(key_cols) == 1 else k) in found for k in keys), bool, n)
+
+    stmt = _upsert_statement(table, cols, key_cols, update_cols, dialect)
+    if dialect == "sqlite":
+        # direto no cursor: executemany em C sobre tuplas, sem processadores de tipo por linha.
+        # As tuplas seguem a ordem dos "?" do statement compilado (ordem da tabela), não a do dict.
+        compiled = stmt.compile(dialect=conn.dialect, column_keys=cols)
+        sql, order = str(compiled), list(compiled.positiontup)
+    for i in range(0, n, batch_rows):
+        if dialect == "sqlite":
+            values = [_driver_list(columns[c][i:i + batch_rows], dialect) for c in order]
+            conn.exec_driver_sql(sql, list(zip(*values)))
+        else:
+            values = [_driver_list(columns[c][i:i + batch_rows], dialect) for c in cols]
+            conn.execute(stmt, [dict(zip(cols, t)) for t in zip(*values)])
+
+    inserted = int(n - np.count_nonzero(existing))
+    return UpsertResult(inserted, n - inserted)
@@ -1,9 +1,9 @@
 # >>> INÍCIO PATCH: src/db/init_db.py
-from src.db.setup import engine
-from src.db.models import Base
+from src.db.migrations import migrate
 
 def create_all():
-    Base.metadata.create_all(bind=engine)
+    """Cria as tabelas e aplica as migrações pendentes (src/db/migrations.py)."""
+    migrate()
 
 if __name__ == "__main__":
     create_all()
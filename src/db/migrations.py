@@ -0,0 +1,146 @@
+# scorebet/src/db/migrations.py
+"""
+Migrações do schema, sem Alembic.
+
+Base.metadata.create_all() só cria o que não existe: num scorebet.db antigo
+não adiciona coluna nem índice em tabela que já está lá. migrate() faz o
+create_all e depois aplica, em ordem, as migrações ainda não registradas em
+schema_version — cada uma numa transação junto com o próprio registro.
+
+As migrações são idempotentes (conferem o schema antes de mexer): num banco
+novo, onde create_all já criou tudo, elas só são registradas.
+
+    python -m src.db.migrations          # aplica o que falta
+    python -m src.db.migrations --status # só lista
+
+Para evoluir o schema: ajuste o modelo em src/db/models.py (bancos novos) e
+acrescente uma Migration no fim de MIGRATIONS (bancos existentes).
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List
+
+from sqlalchemy import inspect, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+
+from src.db.setup import engine as default_engine
+from src.db.models import Base, NBAGame, SchemaVersion
+from src.utils.logger import get_logger
+
+logger = get_logger("migrations")
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+def _column_names(conn: Connection, table: str) -> set:
+    return {c["name"] for c in inspect(conn).get_columns(table)}
+
+def _index_names(conn: Connection, table: str) -> set:
+    return {i["name"] for i in inspect(conn).get_indexes(table)}
+
+def _drop_index(conn: Connection, name: str, table: str) -> None:
+    on = f" ON {table}" if conn.dialect.name in ("mysql", "mariadb") else ""
+    conn.execute(text(f"DROP INDEX {name}{on}"))
+
+# --- migrações ----------------------------------------------------------------
+
+def _nba_games_row_hash(conn: Connection) -> None:
+    if "row_hash" not in _column_names(conn, "nba_games"):
+        conn.execute(text("ALTER TABLE nba_games ADD COLUMN row_hash BIGINT"))
+
+# índices de uma coluna que viraram prefixo dos compostos: só custavam escrita
+_SUPERSEDED = ("ix_nba_games_home_team", "ix_nba_games_visitor_team", "ix_nba_games_season")
+
+def _nba_games_composite_indexes(conn: Connection) -> None:
+    existing = _index_names(conn, "nba_games")
+    for index in NBAGame.__table__.indexes:
+        if index.name not in existing:
+            index.create(conn)
+    for name in _SUPERSEDED:
+        if name in existing:
+            _drop_index(conn, name, "nba_games")
+
+# um jogo vira duas linhas (uma por time); filtros em team/date descem para
+# os dois lados do UNION ALL e usam os índices (home_team, date) e (visitor_team, date)
+TEAM_GAMES_VIEW = """
+CREATE VIEW team_games AS
+SELECT game_id, date, season, home_team AS team, visitor_team AS opponent, 1 AS is_home,
+       home_score AS pts, visitor_score AS opp_pts,
+       CASE WHEN home_score > visitor_score THEN 1 ELSE 0 END AS win
+FROM nba_games
+UNION ALL
+SELECT game_id, date, season, visitor_team AS team, home_team AS opponent, 0 AS is_home,
+       visitor_score AS pts, home_score AS opp_pts,
+       CASE WHEN visitor_score > home_score THEN 1 ELSE 0 END AS win
+FROM nba_games
+"""
+
+def _team_games_view(conn: Connection) -> None:
+    conn.execute(text("DROP VIEW IF EXISTS team_games"))
+    conn.execute(text(TEAM_GAMES_VIEW))
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "nba_games.row_hash", _nba_games_row_hash),
+    Migration(2, "nba_games: índices (home_team, date), (visitor_team, date), (season, date)", _nba_games_composite_indexes),
+    Migration(3, "view team_games (um registro por time por jogo)", _team_games_view),
+]
+
+# --- execução -------------------------------------------------------------------
+
+def applied_versions(bind: Engine | None = None) -> set:
+    bind = bind or default_engine
+    with bind.connect() as conn:
+        if not inspect(conn).has_table(SchemaVersion.__tablename__):
+            return set()
+        return set(conn.scalars(select(SchemaVersion.version)))
+
+def migrate(bind: Engine | None = None) -> List[int]:
+    """create_all + migrações pendentes. Retorna as versões aplicadas agora."""
+    bind = bind or default_engine
+    Base.metadata.create_all(bind=bind)
+    done = applied_versions(bind)
+    applied = []
+    for m in MIGRATIONS:
+        if m.version in done:
+            continue
+        try:
+            with bind.begin() as conn:
+                # confere de novo já na transação (BEGIN IMMEDIATE no SQLite): outro processo
+                # (scheduler + UI subindo juntos) pode ter aplicado enquanto esperávamos o lock
+                if conn.scalar(select(SchemaVersion.version).where(SchemaVersion.version == m.version)) is not None:
+                    continue
+                m.apply(conn)
+                conn.execute(insert(SchemaVersion).values(
+                    version=m.version, description=m.description, applied_at=datetime.now(),
+                ))
+        except IntegrityError:
+            # corrida sem lock de escrita (ex.: PostgreSQL): o outro registrou primeiro; nada a fazer
+            logger.info(f"[migrations] {m.version} aplicada por outro processo")
+            continue
+        logger.info(f"[migrations] {m.version}: {m.description}")
+        applied.append(m.version)
+    return applied
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Migrações do schema do scorebet.db.")
+    ap.add_argument("--status", action="store_true", help="só lista as migrações e se já foram aplicadas")
+    args = ap.parse_args(argv)
+
+    if args.status:
+        done = applied_versions()
+        for m in MIGRATIONS:
+            print(f"[{'x' if m.version in done else ' '}] {m.version:>3} {m.description}")
+        return 0
+    applied = migrate()
+    print(f"Migrações aplicadas: {applied}" if applied else "Schema já atualizado.")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
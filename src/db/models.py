@@ -1,17 +1,146 @@
 # >>> INÍCIO PATCH: src/db/models.py
 from sqlalchemy.orm import declarative_base, Mapped, mapped_column
-from sqlalchemy import Integer, String, Date
+from sqlalchemy import BigInteger, Index, Integer, SmallInteger, String, Date, DateTime, LargeBinary, Float, Text, UniqueConstraint
 
 Base = declarative_base()
 
 class NBAGame(Base):
+    """
+    Índices seguem as consultas (src/db/read.py): "jogos do time antes da
+    data X" e "temporada + faixa de datas". Os compostos começam pela coluna
+    de igualdade e terminam em date, então também servem a busca só por time
+    ou só por temporada. Bancos antigos são ajustados em src/db/migrations.py.
+    """
     __tablename__ = "nba_games"
+    __table_args__ = (
+        Index("ix_nba_games_home_team_date", "home_team", "date"),
+        Index("ix_nba_games_visitor_team_date", "visitor_team", "date"),
+        Index("ix_nba_games_season_date", "season", "date"),
+    )
 
     game_id: Mapped[int] = mapped_column(Integer, primary_key=True)
     date: Mapped[Date] = mapped_column(Date, index=True)
-    home_team: Mapped[str] = mapped_column(String(80), index=True)
-    visitor_team: Mapped[str] = mapped_column(String(80), index=True)
+    home_team: Mapped[str] = mapped_column(String(80))
+    visitor_team: Mapped[str] = mapped_column(String(80))
     home_score: Mapped[int] = mapped_column(Integer)
     visitor_score: Mapped[int] = mapped_column(Integer)
-    season: Mapped[int] = mapped_column(Integer, index=True)
+    season: Mapped[int] = mapped_column(Integer)
+    # hash do conteúdo da linha (upsert_games.row_hashes): upsert só regrava o que mudou
+    row_hash: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+
+class SchemaVersion(Base):
+    """Uma linha por migração aplicada (src/db/migrations.py)."""
+    __tablename__ = "schema_version"
+
+    version: Mapped[int] = mapped_column(Integer, primary_key=True)
+    description: Mapped[str] = mapped_column(String(200))
+    applied_at: Mapped[DateTime] = mapped_column(DateTime)
+
+class BackfillCheckpoint(Base):
+    """Um registro por bloco de datas já gravado pelo backfill (src/db/backfill.py)."""
+    __tablename__ = "backfill_checkpoints"
+
+    season: Mapped[int] = mapped_column(Integer, primary_key=True)
+    chunk_start: Mapped[Date] = mapped_column(Date, primary_key=True)
+    chunk_end: Mapped[Date] = mapped_column(Date)
+    games: Mapped[int] = mapped_column(Integer, default=0)
+    finished_at: Mapped[DateTime] = mapped_column(DateTime)
+
+class PageSnapshot(Base):
+    """DataFrame pronto para renderizar, gravado pelo scheduler (src/jobs/scheduler.py)."""
+    __tablename__ = "page_snapshots"
+
+    key: Mapped[str] = mapped_column(String(80), primary_key=True)
+    payload: Mapped[bytes] = mapped_column(LargeBinary)
+    rows: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[DateTime] = mapped_column(DateTime)
+
+# --- feature store incremental (src/ml/feature_store.py) ---------------------
+
+class FeatureStoreMeta(Base):
+    """Marca d'água por janela: todos os jogos com date <= watermark já foram processados."""
+    __tablename__ = "feature_store_meta"
+
+    last_n: Mapped[int] = mapped_column(Integer, primary_key=True)
+    watermark: Mapped[Date] = mapped_column(Date)
+    games: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[DateTime] = mapped_column(DateTime)
+
+class FeatureStoreDay(Base):
+    """Assinatura por dia dos jogos já processados (nº de jogos + soma de row_hash/placar/game_id)."""
+    __tablename__ = "feature_store_days"
+
+    last_n: Mapped[int] = mapped_column(Integer, primary_key=True)
+    date: Mapped[Date] = mapped_column(Date, primary_key=True)
+    games: Mapped[int] = mapped_column(Integer)
+    sig: Mapped[int] = mapped_column(BigInteger)
+
+class TeamRollState(Base):
+    """Últimos `last_n` jogos de cada time (JSON [[date, pts, opp, win], ...], antigo -> recente)."""
+    __tablename__ = "team_roll_state"
+
+    team: Mapped[str] = mapped_column(String(80), primary_key=True)
+    last_n: Mapped[int] = mapped_column(Integer, primary_key=True)
+    window: Mapped[str] = mapped_column(Text)
+    last_date: Mapped[Date] = mapped_column(Date)
+
+class NBAFeature(Base):
+    """Linha de features/label por jogo (mesmas colunas de features._team_roll_stats)."""
+    __tablename__ = "nba_features"
+
+    game_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    last_n: Mapped[int] = mapped_column(Integer, primary_key=True)
+    date: Mapped[Date] = mapped_column(Date, index=True)
+    season: Mapped[int] = mapped_column(Integer)
+    home_team: Mapped[str] = mapped_column(String(80))
+    visitor_team: Mapped[str] = mapped_column(String(80))
+    home_rpts: Mapped[float] = mapped_column(Float)
+    home_ropp: Mapped[float] = mapped_column(Float)
+    home_rwin: Mapped[float] = mapped_column(Float)
+    away_rpts: Mapped[float] = mapped_column(Float)
+    away_ropp: Mapped[float] = mapped_column(Float)
+    away_rwin: Mapped[float] = mapped_column(Float)
+    home_win: Mapped[int] = mapped_column(Integer)
+    diff_rpts: Mapped[float] = mapped_column(Float)
+    diff_ropp: Mapped[float] = mapped_column(Float)
+    diff_rwin: Mapped[float] = mapped_column(Float)
+
+# --- histórico de odds (src/db/odds_history.py) ------------------------------
+
+class OddsLabel(Base):
+    """Dicionário de strings (book, market, selection): o histórico guarda só o id."""
+    __tablename__ = "odds_labels"
+    __table_args__ = (UniqueConstraint("kind", "name"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    kind: Mapped[str] = mapped_column(String(10))
+    name: Mapped[str] = mapped_column(String(120))
+
+class OddsEvent(Base):
+    __tablename__ = "odds_events"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    event_key: Mapped[str] = mapped_column(String(200), unique=True)
+    league: Mapped[str] = mapped_column(String(10), index=True)
+    commence_time: Mapped[DateTime] = mapped_column(DateTime, nullable=True, index=True)
+    home_team: Mapped[str] = mapped_column(String(80))
+    away_team: Mapped[str] = mapped_column(String(80))
+
+class OddsHistory(Base):
+    """
+    Uma linha por mudança de preço. Tudo inteiro: price = odd decimal × 1000,
+    point = linha × 100, captured_at = epoch (s). A PK já é o índice
+    (event, market, captured_at, ...) e, no SQLite, a tabela é WITHOUT ROWID
+    (sem rowid nem índice extra duplicando as colunas).
+    """
+    __tablename__ = "odds_history"
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    event_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    market_id: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    captured_at: Mapped[int] = mapped_column(Integer, primary_key=True)
+    book_id: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    selection_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    price: Mapped[int] = mapped_column(Integer)
+    point: Mapped[int] = mapped_column(Integer, nullable=True)
 # >>> FIM PATCH
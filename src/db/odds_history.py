@@ -0,0 +1,337 @@
+# scorebet/src/db/odds_history.py
+"""
+Histórico de odds (tabelas odds_events, odds_labels, odds_history).
+
+Todo fetcher de odds chama record_safe() ao final: o DataFrame dele é
+convertido (h2h_to_long, props_to_long, ...) para o formato longo
+
+    league, commence_time, home_team, away_team, book, market, selection, price, point
+
+e gravado em lote. Para não inchar o SQLite:
+- strings (book/market/selection) viram ids em odds_labels e o evento vira
+  um id em odds_events; odds_history só tem inteiros;
+- só entra linha quando o preço/linha mudou desde a última captura daquele
+  (evento, mercado, book, seleção) — polling a cada 5 min de uma linha parada
+  não grava nada. A comparação é com a última linha GRAVADA, lida dentro da
+  transação de escrita: scheduler e páginas gravam no mesmo banco e um cache
+  por processo deixaria passar (ou pular) a volta a um preço anterior.
+
+load_odds_history() devolve o histórico já decodificado (odd decimal, linha
+em float, captured_at em datetime UTC).
+"""
+from __future__ import annotations
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import and_, exists, func, insert, select, union
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from src.db.setup import engine, read_engine
+from src.db.models import Base, OddsEvent, OddsHistory, OddsLabel
+from src.utils.logger import get_logger
+from src.utils.teams import canonical_names
+
+logger = get_logger("odds_history")
+
+LONG_COLUMNS = ["league", "commence_time", "home_team", "away_team", "book", "market", "selection", "price", "point"]
+PRICE_SCALE = 1000
+POINT_SCALE = 100
+
+_lock = threading.Lock()
+_tables_ready = False
+_labels: Dict[Tuple[str, str], int] = {}
+_events: Dict[str, int] = {}
+
+def _ensure_tables() -> None:
+    global _tables_ready
+    if not _tables_ready:
+        Base.metadata.create_all(bind=engine, tables=[OddsLabel.__table__, OddsEvent.__table__, OddsHistory.__table__])
+        _tables_ready = True
+
+# --- normalização por fonte -------------------------------------------------
+
+def _empty_long() -> pd.DataFrame:
+    return pd.DataFrame(columns=LONG_COLUMNS)
+
+def h2h_to_long(df: pd.DataFrame, league: str, book: str | None = None) -> pd.DataFrame:
+    """date, home_team, away_team, home_odds, away_odds[, book] -> formato longo (2 linhas por jogo)."""
+    if df is None or df.empty:
+        return _empty_long()
+    base = pd.DataFrame({
+        "league": league,
+        "commence_time": df["date"] if "date" in df.columns else None,
+        "home_team": df["home_team"],
+        "away_team": df["away_team"],
+        "book": book if book is not None else df.get("book", "unknown"),
+        "market": "h2h",
+        "point": np.nan,
+    })
+    home = base.assign(selection=df["home_team"], price=df["home_odds"])
+    away = base.assign(selection=df["away_team"], price=df["away_odds"])
+    return pd.concat([home, away], ignore_index=True)[LONG_COLUMNS]
+
+def nfl_picks_to_long(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Saída de get_nfl_picks_data (game "Casa x Fora", pick, odd, book[, date]).
+    A API-Sports devolve o lado ("Home"/"Away") em vez do time: vira o nome
+    canônico do time, como nas outras fontes.
+    """
+    if df is None or df.empty:
+        return _empty_long()
+    teams = df["game"].str.split(" x ", n=1, expand=True)
+    side = df["pick"].astype(str).str.strip().str.lower()
+    selection = df["pick"].mask(side.isin(["home", "1"]), teams[0]).mask(side.isin(["away", "2"]), teams[1])
+    home, away = canonical_names(teams[0], "nfl"), canonical_names(teams[1], "nfl")
+    selection = canonical_names(selection, "nfl")
+    return pd.DataFrame({
+        "league": "nfl",
+        "commence_time": df["date"] if "date" in df.columns else None,
+        "home_team": home,
+        "away_team": away,
+        "book": df["book"],
+        "market": "h2h",
+        "selection": selection,
+        "price": df["odd"],
+        "point": np.nan,
+    })[LONG_COLUMNS]
+
+def props_to_long(df: pd.DataFrame, league: str, price_col: str, point_col: str,
+                  player_col: str, side_col: str | None = None, book: str | None = None) -> pd.DataFrame:
+    """Player props: seleção = "jogador|lado" (Over/Under) quando o lado existe."""
+    if df is None or df.empty:
+        return _empty_long()
+    selection = df[player_col].astype(str)
+    if side_col and side_col in df.columns:
+        selection = selection + "|" + df[side_col].fillna("").astype(str)
+    return pd.DataFrame({
+        "league": league,
+        "commence_time": df["commence_time"] if "commence_time" in df.columns else None,
+        "home_team": df["home_team"],
+        "away_team": df["away_team"],
+        "book": book if book is not None else df["book"],
+        "market": df["market"],
+        "selection": selection,
+        "price": df[price_col],
+        "point": df[point_col],
+    })[LONG_COLUMNS]
+
+def theodds_events_to_long(events: list, league: str) -> pd.DataFrame:
+    """JSON cru da The Odds API (/odds): todos os books, mercados e seleções."""
+    rows = [
+        (league, ev.get("commence_time"), ev.get("home_team"), ev.get("away_team"),
+         bm.get("key"), mkt.get("key"),
+         f"{out.get('description')}|{out.get('name')}" if out.get("description") else out.get("name"),
+         out.get("price"), out.get("point"))
+        for ev in events or []
+        for bm in ev.get("bookmakers", [])
+        for mkt in bm.get("markets", [])
+        for out in mkt.get("outcomes", [])
+    ]
+    return pd.DataFrame(rows, columns=LONG_COLUMNS)
+
+# --- escrita ----------------------------------------------------------------
+
+def _insert_ignore(conn, model):
+    """INSERT que ignora chave já existente (outro processo pode ter gravado antes)."""
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert(model).on_conflict_do_nothing()
+    if dialect == "postgresql":
+        return postgresql.insert(model).on_conflict_do_nothing()
+    if dialect in ("mysql", "mariadb"):
+        return mysql.insert(model).prefix_with("IGNORE")
+    return insert(model)
+
+# _label_ids/_event_ids põem os ids lidos/criados na transação em `fresh`, não
+# nos caches globais: record_odds só os publica depois do commit. Se a
+# transação desfaz, um id criado nela não pode ficar no cache (o banco pode
+# reusá-lo para outro nome/evento).
+
+def _label_ids(conn, kind: str, names: Iterable[str], fresh: Dict) -> Dict[str, int]:
+    names = set(names)
+    missing = [n for n in names if (kind, n) not in _labels and (kind, n) not in fresh]
+    if missing:
+        stmt = _insert_ignore(conn, OddsLabel)
+        conn.execute(stmt, [{"kind": kind, "name": n} for n in missing])
+        rows = conn.execute(select(OddsLabel.name, OddsLabel.id)
+                            .where(OddsLabel.kind == kind, OddsLabel.name.in_(missing))).all()
+        fresh.update({(kind, n): i for n, i in rows})
+    return {n: _labels.get((kind, n)) or fresh[(kind, n)] for n in names}
+
+def _event_ids(conn, events: pd.DataFrame, fresh: Dict) -> Dict[str, int]:
+    missing = events[~events["event_key"].isin(_events)]
+    if not missing.empty:
+        stmt = _insert_ignore(conn, OddsEvent)
+        conn.execute(stmt, missing.to_dict("records"))
+        rows = conn.execute(select(OddsEvent.event_key, OddsEvent.id)
+                            .where(OddsEvent.event_key.in_(missing["event_key"].tolist()))).all()
+        fresh.update(dict(rows))
+    return {k: _events.get(k) or fresh[k] for k in events["event_key"]}
+
+def _load_last_state(conn, event_ids: Iterable[int]) -> Dict[Tuple[int, int, int, int], Tuple[int, int | None]]:
+    """(ev, mkt, book, sel) -> (price, point) da última captura gravada dos eventos."""
+    ids = sorted({int(e) for e in event_ids})
+    h = OddsHistory
+    key = (h.event_id, h.market_id, h.book_id, h.selection_id)
+    out = {}
+    for i in range(0, len(ids), 500):
+        last = (
+            select(*key, func.max(h.captured_at).label("ts"))
+            .where(h.event_id.in_(ids[i:i + 500]))
+            .group_by(*key)
+            .subquery()
+        )
+        rows = conn.execute(
+            select(*key, h.price, h.point)
+            .join(last, and_(*(c == last.c[c.key] for c in key), h.captured_at == last.c.ts))
+        ).all()
+        out.update({(ev, mkt, book, sel): (price, point) for ev, mkt, book, sel, price, point in rows})
+    return out
+
+def event_keys(long: pd.DataFrame) -> pd.Series:
+    """league|data local (ET) do jogo|mandante|visitante — data vazia se a fonte não informa. Espera nomes canônicos."""
+    ts = pd.to_datetime(long["commence_time"], utc=True, errors="coerce")
+    day_code, days = pd.factorize(ts.dt.tz_convert("America/New_York").dt.tz_localize(None).dt.normalize())
+    day_label = np.append(days.strftime("%Y-%m-%d"), "")   # NaT -> código -1 -> ""
+    # monta a string só uma vez por evento distinto (o lote repete o evento por book/seleção)
+    parts = pd.DataFrame({
+        "league": long["league"].astype(str).to_numpy(), "day": day_code,
+        "home": long["home_team"].astype(str).to_numpy(), "away": long["away_team"].astype(str).to_numpy(),
+    })
+    ids = parts.groupby(list(parts.columns), sort=False).ngroup().to_numpy()
+    uniq = parts.drop_duplicates()
+    labels = (uniq["league"] + "|" + day_label[uniq["day"].to_numpy()] + "|" + uniq["home"] + "|" + uniq["away"]).to_numpy()
+    return pd.Series(labels[ids], index=long.index)
+
+def record_odds(long: pd.DataFrame, captured_at: datetime | None = None) -> int:
+    """Grava um lote no formato longo; retorna quantas linhas (mudanças) entraram."""
+    if long is None or long.empty:
+        return 0
+    df = long.copy()
+    df["price"] = pd.to_numeric(df["price"], errors="coerce")
+    df["point"] = pd.to_numeric(df["point"], errors="coerce")
+    df = df.dropna(subset=["price", "home_team", "away_team", "book", "market", "selection"])
+    if df.empty:
+        return 0
+
+    # mesmo jogo em fontes diferentes -> mesmo evento (nomes canônicos do registro de times)
+    for league, idx in df.groupby("league").groups.items():
+        for col in ("home_team", "away_team"):
+            df.loc[idx, col] = canonical_names(df.loc[idx, col], league)
+        h2h = idx[df.loc[idx, "market"].eq("h2h").to_numpy()]
+        df.loc[h2h, "selection"] = canonical_names(df.loc[h2h, "selection"], league)
+
+    ts = int((captured_at or datetime.now(timezone.utc)).timestamp())
+    df["event_key"] = event_keys(df)
+    commence = pd.to_datetime(df["commence_time"], utc=True, errors="coerce").dt.tz_localize(None)
+    df["commence_time"] = commence.astype(object).where(commence.notna(), None)
+
+    with _lock:
+        _ensure_tables()
+        new_events, new_labels = {}, {}
+        with engine.begin() as conn:
+            events = df.drop_duplicates("event_key")[["event_key", "league", "commence_time", "home_team", "away_team"]]
+            ev = df["event_key"].map(_event_ids(conn, events, new_events)).to_numpy(dtype=np.int64)
+            book = df["book"].astype(str).map(_label_ids(conn, "book", df["book"].astype(str), new_labels)).to_numpy(dtype=np.int64)
+            mkt = df["market"].astype(str).map(_label_ids(conn, "market", df["market"].astype(str), new_labels)).to_numpy(dtype=np.int64)
+            sel = df["selection"].astype(str).map(_label_ids(conn, "selection", df["selection"].astype(str), new_labels)).to_numpy(dtype=np.int64)
+            price = np.rint(df["price"].to_numpy(dtype=float) * PRICE_SCALE).astype(np.int64)
+            pt = df["point"].to_numpy(dtype=float)
+            point = np.where(np.isnan(pt), -1, np.rint(np.nan_to_num(pt) * POINT_SCALE)).astype(np.int64)
+
+            last = _load_last_state(conn, ev)
+            rows, seen = [], set()
+            for e, m, b, s, p, q in zip(ev.tolist(), mkt.tolist(), book.tolist(), sel.tolist(),
+                                        price.tolist(), point.tolist()):
+                key = (e, m, b, s)
+                q = None if q == -1 else q
+                if key in seen or last.get(key) == (p, q):
+                    continue   # repetido no lote ou sem mudança desde a última captura
+                seen.add(key)
+                rows.append({"event_id": e, "market_id": m, "captured_at": ts, "book_id": b,
+                             "selection_id": s, "price": p, "point": q})
+            if rows:
+                conn.execute(_insert_ignore(conn, OddsHistory), rows)
+        # só depois do commit: ids de uma transação desfeita nunca entram no cache
+        _events.update(new_events)
+        _labels.update(new_labels)
+
+    logger.info(f"[odds_history] {len(rows)} mudanças gravadas ({len(df)} cotações recebidas)")
+    return len(rows)
+
+def record_safe(long: pd.DataFrame, source: str) -> int:
+    """record_odds para uso dentro dos fetchers: falha de gravação nunca derruba a busca."""
+    try:
+        return record_odds(long)
+    except Exception as e:
+        logger.warning(f"[odds_history] falha ao gravar odds de {source}: {e}")
+        return 0
+
+def reset_cache() -> None:
+    """Esquece os ids em memória (ex.: após trocar de banco)."""
+    global _tables_ready
+    with _lock:
+        _labels.clear(); _events.clear()
+        _tables_ready = False
+
+# --- leitura ----------------------------------------------------------------
+
+def active_event_ids(league: str | None, since: datetime) -> list:
+    """
+    Eventos que começam a partir de `since` (futuros ou recém-iniciados), pela
+    data do jogo e não pela data da captura: linha parada há dias não tem
+    captura recente, mas o jogo continua valendo. Sem data de início: os que
+    tiveram captura desde `since`.
+    """
+    e, h = OddsEvent, OddsHistory
+    start = since.astimezone(timezone.utc).replace(tzinfo=None)   # commence_time é gravado em UTC sem fuso
+    dated = select(e.id).where(e.commence_time >= start)
+    undated = select(e.id).where(
+        e.commence_time.is_(None),
+        exists().where(h.event_id == e.id, h.captured_at >= int(since.timestamp())),
+    )
+    if league is not None:
+        dated, undated = dated.where(e.league == league), undated.where(e.league == league)
+    _ensure_tables()
+    with read_engine.connect() as conn:
+        return sorted(conn.execute(union(dated, undated)).scalars().all())
+
+def load_odds_history(
+    league: str | None = None,
+    market: str | None = None,
+    event_ids: Iterable[int] | None = None,
+    since: datetime | None = None,
+) -> pd.DataFrame:
+    """Histórico decodificado: event_id, league, commence_time, times, book, market, selection, price, point, captured_at."""
+    h, e = OddsHistory, OddsEvent
+    book, mkt, sel = (OddsLabel.__table__.alias(n) for n in ("book", "mkt", "sel"))
+    stmt = (
+        select(h.event_id, e.league, e.commence_time, e.home_team, e.away_team,
+               book.c.name.label("book"), mkt.c.name.label("market"), sel.c.name.label("selection"),
+               h.price, h.point, h.captured_at)
+        .join(e, e.id == h.event_id)
+        .join(book, book.c.id == h.book_id)
+        .join(mkt, mkt.c.id == h.market_id)
+        .join(sel, sel.c.id == h.selection_id)
+    )
+    if league is not None:
+        stmt = stmt.where(e.league == league)
+    if market is not None:
+        stmt = stmt.where(mkt.c.name == market)
+    if event_ids is not None:
+        stmt = stmt.where(h.event_id.in_(list(event_ids)))
+    if since is not None:
+        stmt = stmt.where(h.captured_at >= int(since.timestamp()))
+    stmt = stmt.order_by(h.event_id, h.market_id, h.captured_at)
+
+    _ensure_tables()
+    with read_engine.connect() as conn:
+        df = pd.read_sql(stmt, conn)
+    df["price"] = df["price"] / PRICE_SCALE
+    df["point"] = df["point"] / POINT_SCALE
+    df["captured_at"] = pd.to_datetime(df["captured_at"], unit="s", utc=True)
+    df["commence_time"] = pd.to_datetime(df["commence_time"], utc=True)
+    return df
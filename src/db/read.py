@@ -0,0 +1,76 @@
+# scorebet/src/db/read.py
+"""
+Leitura colunar de nba_games.
+
+Em vez de `select(NBAGame)` + um objeto ORM por linha + DataFrame montado
+linha a linha, faz um SELECT só das colunas pedidas (Core) e entrega ao
+pandas direto, com os filtros (temporada, datas, times) aplicados no SQL.
+"""
+from __future__ import annotations
+from datetime import date
+from typing import Iterable, Sequence
+
+import pandas as pd
+from sqlalchemy import or_, select
+
+from src.db.setup import read_engine
+from src.db.models import NBAGame
+
+GAME_COLUMNS = ("game_id", "date", "season", "home_team", "visitor_team", "home_score", "visitor_score")
+_INT_COLUMNS = {"game_id", "season", "home_score", "visitor_score"}
+
+def _as_list(value) -> list:
+    if isinstance(value, (str, int)):
+        return [value]
+    return list(value)
+
+def games_query(
+    columns: Sequence[str] = GAME_COLUMNS,
+    *,
+    season: int | Iterable[int] | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    before: date | None = None,
+    team: str | Iterable[str] | None = None,
+):
+    """SELECT projetado em nba_games. `start`/`end` inclusivos; `before` exclusivo."""
+    unknown = [c for c in columns if c not in GAME_COLUMNS]
+    if unknown:
+        raise ValueError(f"Colunas desconhecidas em nba_games: {unknown}")
+
+    stmt = select(*[getattr(NBAGame, c) for c in columns])
+    if season is not None:
+        stmt = stmt.where(NBAGame.season.in_(_as_list(season)))
+    if start is not None:
+        stmt = stmt.where(NBAGame.date >= start)
+    if end is not None:
+        stmt = stmt.where(NBAGame.date <= end)
+    if before is not None:
+        stmt = stmt.where(NBAGame.date < before)
+    if team is not None:
+        teams = _as_list(team)
+        stmt = stmt.where(or_(NBAGame.home_team.in_(teams), NBAGame.visitor_team.in_(teams)))
+    return stmt.order_by(NBAGame.date, NBAGame.game_id)
+
+def load_games(
+    columns: Sequence[str] = GAME_COLUMNS,
+    *,
+    season: int | Iterable[int] | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    before: date | None = None,
+    team: str | Iterable[str] | None = None,
+    bind=None,
+) -> pd.DataFrame:
+    """
+    Jogos como DataFrame (ordenados por data), `date` já em datetime64.
+    `bind` permite reaproveitar uma Connection/transação aberta (padrão: read_engine).
+    """
+    stmt = games_query(columns, season=season, start=start, end=end, before=before, team=team)
+    dtype = {c: "int64" for c in columns if c in _INT_COLUMNS}
+    parse_dates = ["date"] if "date" in columns else None
+
+    if bind is None:
+        with read_engine.connect() as conn:
+            return pd.read_sql(stmt, conn, dtype=dtype, parse_dates=parse_dates)
+    return pd.read_sql(stmt, bind, dtype=dtype, parse_dates=parse_dates)
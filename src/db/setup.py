@@ -1,20 +1,86 @@
 # src/db/setup.py
 # >>> INÍCIO PATCH: src/db/setup.py
-from sqlalchemy import create_engine
+"""
+Engines do banco: um escritor e um de leitura, criados por make_engine().
+
+No SQLite (arquivo):
+- WAL: leitores não bloqueiam o escritor nem são bloqueados por ele — a
+  página lê o último commit enquanto o ingest grava;
+- synchronous=NORMAL (seguro com WAL, sem fsync a cada commit), cache e
+  mmap maiores, temp_store em memória, busy_timeout para esperar lock em
+  vez de falhar com "database is locked";
+- o escritor abre transações com BEGIN IMMEDIATE: o lock de escrita é pego
+  no início (respeitando busy_timeout) em vez de estourar no meio da
+  transação ao promover um lock de leitura;
+- o engine de leitura tem query_only=ON e pool próprio, então leitura
+  nunca fica na fila atrás de uma conexão de escrita.
+
+Em outros bancos só o pool é configurado; DB_READ_URL pode apontar para
+uma réplica.
+"""
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker
 from src.utils.config import settings
 
 # Default: SQLite no arquivo scorebet.db na raiz do projeto
 DB_URL = settings.DB_URL or "sqlite:///scorebet.db"
+DB_READ_URL = settings.DB_READ_URL or DB_URL
+
+def sqlite_pragmas() -> dict:
+    return {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -settings.DB_CACHE_MB * 1024,        # negativo = KiB
+        "mmap_size": settings.DB_MMAP_MB * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": settings.DB_BUSY_TIMEOUT_MS,
+    }
+
+def _is_sqlite_file(url) -> bool:
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:") \
+        and not url.database.startswith("file::memory:")
+
+def make_engine(url: str = DB_URL, readonly: bool = False, **kwargs) -> Engine:
+    """Engine com pool dimensionado; em SQLite de arquivo aplica os pragmas a cada conexão nova."""
+    url = make_url(url)
+    if url.get_backend_name() != "sqlite":
+        opts = {"pool_size": settings.DB_POOL_SIZE, "max_overflow": settings.DB_MAX_OVERFLOW, "pool_pre_ping": True}
+        return create_engine(url, future=True, echo=False, **{**opts, **kwargs})
+
+    # check_same_thread=False para evitar erro no Streamlit/threads com SQLite
+    connect_args = {"check_same_thread": False, "timeout": settings.DB_BUSY_TIMEOUT_MS / 1000}
+    if not _is_sqlite_file(url):
+        return create_engine(url, connect_args=connect_args, future=True, echo=False, **kwargs)
 
-# check_same_thread=False para evitar erro no Streamlit/threads com SQLite
-engine = create_engine(
-    DB_URL,
-    connect_args={"check_same_thread": False} if DB_URL.startswith("sqlite") else {},
-    future=True,
-    echo=False,
-)
+    opts = {"pool_size": settings.DB_POOL_SIZE, "max_overflow": settings.DB_MAX_OVERFLOW}
+    engine = create_engine(url, connect_args=connect_args, future=True, echo=False, **{**opts, **kwargs})
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record):
+        # transação fica por conta do SQLAlchemy (evento "begin" abaixo), não do driver
+        dbapi_conn.isolation_level = None
+        cur = dbapi_conn.cursor()
+        for key, value in pragmas.items():
+            if readonly and key == "journal_mode":
+                continue   # quem define o modo do arquivo é o escritor
+            cur.execute(f"PRAGMA {key}={value}")
+        if readonly:
+            cur.execute("PRAGMA query_only=ON")
+        cur.close()
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(conn):
+        conn.exec_driver_sql("BEGIN" if readonly else "BEGIN IMMEDIATE")
+
+    return engine
+
+engine = make_engine(DB_URL)
+# leitura: sem SQLite de arquivo (ex.: :memory:) não há como ter um segundo engine vendo os mesmos dados
+read_engine = make_engine(DB_READ_URL, readonly=True) if DB_READ_URL != DB_URL or _is_sqlite_file(DB_URL) else engine
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+ReadSession = sessionmaker(bind=read_engine, autoflush=False, autocommit=False, future=True)
 # >>> FIM PATCH
-
@@ -0,0 +1,54 @@
+# scorebet/src/db/snapshots.py
+"""
+Snapshots de dados das páginas (tabela page_snapshots).
+
+O scheduler (src/jobs/scheduler.py) grava os DataFrames já prontos; as
+páginas só leem. Se não houver snapshot (scheduler parado, banco novo) a
+página cai no fetch ao vivo via `fallback`.
+"""
+from __future__ import annotations
+import pickle
+from datetime import datetime, timedelta
+from typing import Callable, Tuple
+
+import pandas as pd
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.db.setup import ReadSession, SessionLocal
+from src.db.models import PageSnapshot
+from src.utils.logger import get_logger
+
+logger = get_logger("snapshots")
+
+def write_snapshot(key: str, df: pd.DataFrame) -> None:
+    with SessionLocal() as s:
+        s.merge(PageSnapshot(
+            key=key,
+            payload=pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL),
+            rows=len(df),
+            created_at=datetime.now(),
+        ))
+        s.commit()
+
+def read_snapshot(key: str, max_age: timedelta | None = None) -> Tuple[pd.DataFrame | None, datetime | None]:
+    """Retorna (df, created_at) ou (None, None) se não existir / estiver velho demais."""
+    try:
+        with ReadSession() as s:
+            snap = s.get(PageSnapshot, key)
+    except SQLAlchemyError as e:
+        logger.warning(f"[snapshots] leitura de '{key}' falhou: {e}")
+        return None, None
+    if snap is None:
+        return None, None
+    if max_age is not None and datetime.now() - snap.created_at > max_age:
+        return None, snap.created_at
+    return pickle.loads(snap.payload), snap.created_at
+
+def load_snapshot(key: str, fallback: Callable[[], pd.DataFrame],
+                  max_age: timedelta | None = timedelta(hours=1)) -> pd.DataFrame:
+    """Lê o snapshot; sem snapshot válido, busca ao vivo com `fallback()`."""
+    df, _ = read_snapshot(key, max_age=max_age)
+    if df is not None:
+        return df
+    logger.info(f"[snapshots] '{key}' indisponível, buscando ao vivo")
+    return fallback()
@@ -1,74 +1,134 @@
 # scorebet/src/db/upsert_games.py
-from typing import Iterable
+"""
+Gravação de jogos da NBA (nba_games).
+
+Cada linha leva um row_hash do seu conteúdo. Antes de gravar, os hashes já
+salvos dos mesmos game_ids são lidos e só entram no upsert as linhas novas
+ou com conteúdo diferente — baixar de novo uma janela de datas que já está
+no banco não reescreve nada. O resultado traz os game_ids alterados, que
+vão para update_feature_store(changed_ids=...). A coluna row_hash em bancos
+antigos vem da migração 1 (src/db/migrations.py, via init_db.create_all).
+
+O caminho é colunar: o DataFrame vira um array NumPy tipado por coluna
+(_columns), hash, deduplicação e comparação são vetorizados, e a escrita é
+um executemany de tuplas (bulk_upsert_columns). Benchmark em
+tests/bench_upsert.py.
+"""
+from typing import Dict, Iterable, Tuple
+import numpy as np
 import pandas as pd
-from sqlalchemy.dialects.sqlite import insert as sqlite_insert
-from sqlalchemy import text
-from src.db.setup import engine, SessionLocal
+from sqlalchemy import select
+from src.db.bulk_upsert import MAX_PARAMS, DEFAULT_MAX_PARAMS, UpsertResult, bulk_upsert_columns
+from src.db.setup import engine
 from src.db.models import NBAGame
+from src.utils.logger import get_logger
+
+logger = get_logger("upsert_games")
 
 # --- helpers ---------------------------------------------------------------
 
 _INT_COLS = ["game_id", "home_score", "visitor_score", "season"]
 _BASE_COLS = ["game_id", "date", "home_team", "visitor_team", "home_score", "visitor_score", "season"]
 
-def _coerce_types(df: pd.DataFrame) -> pd.DataFrame:
-    """Normaliza tipos para o ORM (SQLite exige date real)."""
-    out = df.copy()
+def _columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    DataFrame -> um array tipado por coluna de _BASE_COLS: inteiros int64,
+    date datetime64[D], times object. Sem df.copy() nem dict por linha;
+    coluna que já está no tipo certo sai como view do próprio DataFrame.
+    """
+    missing = [c for c in _BASE_COLS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Colunas ausentes para upsert: {missing}")
+    cols = {}
+    for c in _BASE_COLS:
+        s = df[c]
+        if c in _INT_COLS:
+            if s.dtype != np.int64:
+                s = pd.to_numeric(s, errors="coerce").fillna(0)
+            cols[c] = s.to_numpy(dtype=np.int64)
+        elif c == "date":
+            cols[c] = pd.to_datetime(s, errors="coerce").to_numpy(dtype="datetime64[D]")
+        else:
+            cols[c] = s.astype(str).to_numpy(dtype=object)
+    return cols
 
-    # date -> datetime.date
-    if "date" in out.columns:
-        out["date"] = pd.to_datetime(out["date"], errors="coerce").dt.date
+def _hash_columns(cols: Dict[str, np.ndarray]) -> np.ndarray:
+    content = pd.DataFrame({
+        "game_id": cols["game_id"],
+        "date": cols["date"].astype(np.int64),
+        "home_team": cols["home_team"],
+        "visitor_team": cols["visitor_team"],
+        **{c: cols[c] for c in ("home_score", "visitor_score", "season")},
+    }, copy=False)
+    return pd.util.hash_pandas_object(content, index=False).to_numpy().view(np.int64)
 
-    # inteiros garantidos
-    for c in _INT_COLS:
-        if c in out.columns:
-            out[c] = pd.to_numeric(out[c], errors="coerce").fillna(0).astype(int)
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """Hash de 64 bits (int64) do conteúdo de cada linha, estável entre processos."""
+    return _hash_columns(_columns(df))
 
-    # strings básicas
-    for c in ["home_team", "visitor_team"]:
-        if c in out.columns:
-            out[c] = out[c].astype(str)
+def _last_per_key(keys: np.ndarray) -> np.ndarray:
+    """Posições da última ocorrência de cada chave, na ordem original."""
+    _, first_rev = np.unique(keys[::-1], return_index=True)
+    return np.sort(len(keys) - 1 - first_rev)
 
-    return out
+def _compare_stored(conn, ids: np.ndarray, hashes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (já existe, mesmo row_hash) para cada id. Lote grande e denso (ids da
+    API são sequenciais) lê por faixa — um BETWEEN em vez de dezenas de IN.
+    """
+    t = NBAGame.__table__
+    lo, hi = int(ids.min()), int(ids.max())
+    limit = MAX_PARAMS.get(conn.dialect.name, DEFAULT_MAX_PARAMS)
+    if len(ids) > limit and hi - lo < 4 * len(ids):
+        found = conn.execute(select(t.c.game_id, t.c.row_hash).where(t.c.game_id.between(lo, hi))).all()
+    else:
+        found = []
+        for i in range(0, len(ids), limit):
+            found += conn.execute(select(t.c.game_id, t.c.row_hash).where(t.c.game_id.in_(ids[i:i + limit].tolist()))).all()
+    if not found:
+        return np.zeros(len(ids), bool), np.zeros(len(ids), bool)
 
-def _df_to_rows(df: pd.DataFrame):
-    df = _coerce_types(df)
-    missing = [c for c in _BASE_COLS if c not in df.columns]
-    if missing:
-        raise ValueError(f"Colunas ausentes para upsert: {missing}")
-    return df[_BASE_COLS].to_dict(orient="records")
+    s_ids = np.array([r[0] for r in found], dtype=np.int64)
+    s_hash = np.array([0 if r[1] is None else r[1] for r in found], dtype=np.int64)
+    has_hash = np.array([r[1] is not None for r in found])     # linha gravada antes do row_hash: regrava
+    order = np.argsort(s_ids)
+    s_ids, s_hash, has_hash = s_ids[order], s_hash[order], has_hash[order]
+    pos = np.minimum(np.searchsorted(s_ids, ids), len(s_ids) - 1)
+    exists = s_ids[pos] == ids
+    return exists, exists & has_hash[pos] & (s_hash[pos] == hashes)
 
 # --- upsert ----------------------------------------------------------------
 
-def upsert_nba_games(df: pd.DataFrame) -> int:
-    """Upsert em lote de jogos da NBA.
-    - SQLite: usa ON CONFLICT (game_id).
-    - Outros bancos: fallback com merge linha-a-linha (portável).
-    Retorna um número aproximado de linhas afetadas.
+def upsert_nba_games(df: pd.DataFrame) -> UpsertResult:
+    """Upsert em lote de jogos da NBA (src/db/bulk_upsert.py: ON CONFLICT no
+    SQLite/PostgreSQL, ON DUPLICATE KEY no MySQL, staging nos demais), em
+    blocos que respeitam o limite de parâmetros do banco. Linhas cujo
+    row_hash não mudou não são regravadas.
+    Retorna inseridas/atualizadas/sem mudança e os game_ids alterados.
     """
     if df.empty:
-        return 0
+        return UpsertResult()
 
-    rows = _df_to_rows(df)
+    cols = _columns(df)
+    keep = _last_per_key(cols["game_id"])
+    if len(keep) < len(df):
+        cols = {c: a[keep] for c, a in cols.items()}
+    cols["row_hash"] = _hash_columns(cols)
 
     with engine.begin() as conn:
-        if engine.dialect.name == "sqlite":
-            stmt = sqlite_insert(NBAGame).values(rows)
-            update_cols = {c: stmt.excluded[c] for c in _BASE_COLS if c != "game_id"}
-            stmt = stmt.on_conflict_do_update(
-                index_elements=[NBAGame.game_id],
-                set_=update_cols
-            )
-            result = conn.execute(stmt)
-            affected = result.rowcount or 0
-            if affected == 0:
-                conn.execute(text("SELECT 1"))
-            return affected
-        else:
-            # Fallback portável
-            from sqlalchemy.orm import Session
-            with Session(bind=conn) as s:
-                for r in rows:
-                    s.merge(NBAGame(**r))
-                s.commit()
-                return len(rows)
+        exists, same = _compare_stored(conn, cols["game_id"], cols["row_hash"])
+        todo = ~same
+        res = bulk_upsert_columns(conn, NBAGame.__table__, {c: a[todo] for c, a in cols.items()},
+                                  key_cols=["game_id"], existing=exists[todo])
+    res.unchanged = int(len(todo) - np.count_nonzero(todo))
+    res.changed_ids = cols["game_id"][todo].tolist()
+    logger.info(f"[upsert_games] {res}")
+    return res
+
+def upsert_nba_games_iter(frames: Iterable[pd.DataFrame]) -> UpsertResult:
+    """Upsert em streaming: grava cada DataFrame (ex.: página da API) assim que chega."""
+    total = UpsertResult()
+    for df in frames:
+        if df is not None and not df.empty:
+            total += upsert_nba_games(df)
+    return total
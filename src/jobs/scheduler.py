@@ -0,0 +1,107 @@
+# scorebet/src/jobs/scheduler.py
+"""
+Scheduler que pré-aquece os dados de todas as páginas.
+
+    python -m src.jobs.scheduler          # roda para sempre (APScheduler)
+    python -m src.jobs.scheduler --once   # executa cada job uma vez e sai
+
+Cada job chama um fetcher de src/api (ou a predição de src/ml/upcoming) e grava
+o DataFrame pronto em page_snapshots; as páginas só leem esses snapshots
+(src/db/snapshots.load_snapshot), então o tempo de render não depende da
+latência das APIs externas.
+"""
+from __future__ import annotations
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import argparse
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List
+
+import pandas as pd
+
+from src.api.espn_api import get_espn_games
+from src.api.nfl_games_api import get_nfl_games_data
+from src.api.nfl_picks_api import get_nfl_picks_data
+from src.api.odds_aggregator import best_odds
+from src.api.odds_players_api_free import get_player_props_data
+from src.db.init_db import create_all
+from src.db.snapshots import write_snapshot
+from src.ml.line_movement import materialize as line_movement
+from src.ml.upcoming import predict_upcoming
+from src.utils.logger import get_logger
+
+logger = get_logger("scheduler")
+
+@dataclass(frozen=True)
+class Job:
+    key: str                          # chave em page_snapshots
+    fn: Callable[[], pd.DataFrame]
+    every_seconds: int
+
+# parâmetros iguais aos usados pelas páginas
+JOBS: List[Job] = [
+    Job("nba_predictions", lambda: predict_upcoming(days_ahead=3, last_n=5), 15 * 60),
+    Job("nba_best_odds", lambda: best_odds("nba"), 5 * 60),     # todas as fontes; inclui a pinnacle
+    Job("nba_espn_games", lambda: get_espn_games("nba", days_ahead=3), 60),
+    Job("nba_player_props", get_player_props_data, 30 * 60),
+    Job("nfl_picks_odds", get_nfl_picks_data, 5 * 60),
+    Job("nfl_espn_games", lambda: get_espn_games("nfl", days_ahead=5), 60),
+    Job("nfl_games", get_nfl_games_data, 30 * 60),
+    # lêem só odds_history (gravado pelos fetchers acima)
+    Job("nba_line_movement", lambda: line_movement("nba"), 5 * 60),
+    Job("nfl_line_movement", lambda: line_movement("nfl"), 5 * 60),
+]
+
+def run_job(job: Job) -> bool:
+    """Executa um job e grava o snapshot. Resultado vazio não sobrescreve o último bom."""
+    t0 = time.perf_counter()
+    try:
+        df = job.fn()
+    except Exception as e:
+        logger.error(f"[scheduler] {job.key} falhou: {e}")
+        return False
+    if df is None or df.empty:
+        logger.warning(f"[scheduler] {job.key} voltou vazio; snapshot anterior mantido")
+        return False
+    write_snapshot(job.key, df)
+    logger.info(f"[scheduler] {job.key}: {len(df)} linhas em {(time.perf_counter() - t0):.1f}s")
+    return True
+
+def run_once(jobs: List[Job] = JOBS) -> dict:
+    return {job.key: run_job(job) for job in jobs}
+
+def run_forever(jobs: List[Job] = JOBS) -> None:
+    from apscheduler.schedulers.blocking import BlockingScheduler
+
+    sched = BlockingScheduler()
+    for job in jobs:
+        sched.add_job(
+            run_job, "interval", args=[job], seconds=job.every_seconds, id=job.key,
+            next_run_time=datetime.now(),   # aquece tudo ao subir
+            max_instances=1, coalesce=True, misfire_grace_time=job.every_seconds,
+        )
+    logger.info(f"[scheduler] {len(jobs)} jobs agendados")
+    try:
+        sched.start()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Pré-aquece os snapshots das páginas.")
+    ap.add_argument("--once", action="store_true", help="executa cada job uma vez e sai")
+    args = ap.parse_args(argv)
+
+    create_all()
+    if args.once:
+        print(run_once())
+    else:
+        run_forever()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
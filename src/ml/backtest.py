@@ -0,0 +1,298 @@
+# >>> INÍCIO: src/ml/backtest.py
+"""
+Backtest walk-forward do baseline NBA.
+
+Em vez de um train_test_split aleatório (que vaza o futuro), o histórico é
+fatiado por data: cada janela treina com os jogos anteriores a `test_start`
+(tudo desde o início = "expanding", ou só os últimos `train_days` =
+"sliding") e avalia nos `test_days` seguintes. As janelas são
+independentes e rodam num ProcessPoolExecutor.
+
+Por janela: acurácia, AUC, log-loss, Brier, erro de calibração (ECE) e, se
+houver odds históricas (colunas date, home_team, away_team, home_odds,
+away_odds em odd decimal, como em odds_api.get_h2h_odds_theodds), ROI de
+apostar 1 unidade no lado com valor esperado > `edge`. Na linha de comando
+as odds vêm do odds_history (fechamento de cada jogo, closing_h2h).
+
+    python -m src.ml.backtest --last-n 5 --mode sliding --train-days 365 --test-days 30
+    python -m src.ml.backtest --book pinnacle --edge 0.02
+"""
+from __future__ import annotations
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+for p in (ROOT, SRC):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, brier_score_loss, log_loss, roc_auc_score
+
+from src.db.odds_history import load_odds_history
+from src.ml.features import build_feature_table
+from src.ml.model_train import FEATURES
+from src.utils.logger import get_logger
+from src.utils.teams import match_events
+
+logger = get_logger("backtest")
+
+@dataclass(frozen=True)
+class BacktestConfig:
+    last_n: int = 5
+    features: Tuple[str, ...] = tuple(FEATURES)
+    mode: str = "expanding"          # "expanding" | "sliding"
+    train_days: int = 365            # só no modo sliding
+    test_days: int = 30
+    step_days: int | None = None     # padrão = test_days (janelas de teste sem sobreposição)
+    min_train: int = 200             # janelas com menos jogos de treino são puladas
+    edge: float = 0.0                # aposta se p*odd - 1 > edge
+
+@dataclass
+class BacktestResult:
+    config: BacktestConfig
+    windows: pd.DataFrame            # uma linha por janela
+    predictions: pd.DataFrame        # uma linha por jogo avaliado
+    summary: dict = field(default_factory=dict)
+
+    def calibration(self, bins: int = 10) -> pd.DataFrame:
+        return calibration_table(self.predictions["home_win"], self.predictions["p_home_win"], bins)
+
+# --- janelas ----------------------------------------------------------------
+
+def make_windows(dates: pd.Series, cfg: BacktestConfig) -> List[Tuple[pd.Timestamp, ...]]:
+    """[(train_start, test_start, test_end)]: treino em [train_start, test_start), teste em [test_start, test_end)."""
+    dates = pd.to_datetime(dates)
+    first, last = dates.min().normalize(), dates.max().normalize()
+    step = pd.Timedelta(days=cfg.step_days or cfg.test_days)
+    test_len = pd.Timedelta(days=cfg.test_days)
+
+    # primeiro teste começa quando já há min_train jogos para treinar
+    ordered = np.sort(dates.values)
+    if len(ordered) <= cfg.min_train:
+        return []
+    test_start = pd.Timestamp(ordered[cfg.min_train]).normalize()
+
+    windows = []
+    while test_start <= last:
+        train_start = first if cfg.mode == "expanding" else test_start - pd.Timedelta(days=cfg.train_days)
+        windows.append((train_start, test_start, test_start + test_len))
+        test_start += step
+    return windows
+
+# --- métricas ---------------------------------------------------------------
+
+def calibration_table(y, p, bins: int = 10) -> pd.DataFrame:
+    df = pd.DataFrame({"y": np.asarray(y, dtype=float), "p": np.asarray(p, dtype=float)})
+    df["bin"] = np.minimum((df["p"] * bins).astype(int), bins - 1)
+    out = df.groupby("bin").agg(p_mean=("p", "mean"), y_rate=("y", "mean"), n=("y", "size")).reset_index()
+    out["gap"] = out["y_rate"] - out["p_mean"]
+    return out
+
+def _ece(y, p, bins: int = 10) -> float:
+    cal = calibration_table(y, p, bins)
+    return float((cal["gap"].abs() * cal["n"]).sum() / max(1, cal["n"].sum()))
+
+def bet_profit(p_home, home_odds, away_odds, home_win, edge: float = 0.0) -> np.ndarray:
+    """
+    Lucro por jogo apostando 1 unidade no lado de maior valor esperado
+    (se passar de `edge`). NaN = sem odds; 0 = sem aposta.
+    """
+    p_home = np.asarray(p_home, dtype=float)
+    home_odds = np.asarray(home_odds, dtype=float)
+    away_odds = np.asarray(away_odds, dtype=float)
+    home_win = np.asarray(home_win).astype(bool)
+
+    ev_home = p_home * home_odds - 1
+    ev_away = (1 - p_home) * away_odds - 1
+    bet_home = (ev_home > edge) & (ev_home >= ev_away)
+    bet_away = (ev_away > edge) & ~bet_home
+
+    profit = np.where(bet_home, np.where(home_win, home_odds - 1, -1.0), 0.0)
+    profit = np.where(bet_away, np.where(~home_win, away_odds - 1, -1.0), profit)
+    profit[np.isnan(home_odds) | np.isnan(away_odds)] = np.nan
+    return profit
+
+# --- execução ---------------------------------------------------------------
+
+def _run_window(job: tuple) -> tuple:
+    """Treina e avalia uma janela (função de topo: precisa ser picklable)."""
+    idx, estimator, cfg, window, train, test = job
+    cols = list(cfg.features)
+    train_start, test_start, test_end = window
+    row = {
+        "window": idx, "train_start": train_start, "test_start": test_start, "test_end": test_end,
+        "n_train": len(train), "n_test": len(test),
+        # datas efetivas dos jogos usados: o último do treino tem que ser anterior ao primeiro do teste
+        "train_last": train["date"].max() if len(train) else pd.NaT,
+        "test_first": test["date"].min() if len(test) else pd.NaT,
+    }
+    if len(train) < cfg.min_train or test.empty or train["home_win"].nunique() < 2:
+        return row, pd.DataFrame()
+
+    model = clone(estimator)
+    model.fit(train[cols].values.astype(float), train["home_win"].values.astype(int))
+    p = model.predict_proba(test[cols].values.astype(float))[:, 1]
+    y = test["home_win"].values.astype(int)
+
+    row.update({
+        "acc": float(accuracy_score(y, (p >= 0.5).astype(int))),
+        "auc": float(roc_auc_score(y, p)) if len(np.unique(y)) == 2 else np.nan,
+        "log_loss": float(log_loss(y, p, labels=[0, 1])),
+        "brier": float(brier_score_loss(y, p)),
+        "ece": _ece(y, p),
+    })
+
+    pred = test[["game_id", "date", "home_team", "visitor_team", "home_win"]].copy()
+    pred["window"] = idx
+    pred["p_home_win"] = p
+    if {"home_odds", "away_odds"} <= set(test.columns):
+        pred["home_odds"], pred["away_odds"] = test["home_odds"].values, test["away_odds"].values
+        pred["profit"] = bet_profit(p, pred["home_odds"], pred["away_odds"], y, cfg.edge)
+        bets = pred["profit"].fillna(0) != 0
+        row.update({
+            "bets": int(bets.sum()),
+            "profit": float(pred.loc[bets, "profit"].sum()),
+            "roi": float(pred.loc[bets, "profit"].mean()) if bets.any() else np.nan,
+        })
+    return row, pred
+
+def join_odds(feat: pd.DataFrame, odds: pd.DataFrame) -> pd.DataFrame:
+    """Anexa home_odds/away_odds por (dia do jogo em ET, mandante, visitante) — ver teams.match_events."""
+    o = odds[["date", "home_team", "away_team", "home_odds", "away_odds"]]
+    # commence_time vem em UTC: o jogo das 20h ET cai no dia seguinte em UTC; match_events compara em ET
+    out = match_events(feat, o, "nba", teams=("home_team", "visitor_team"), right_teams=("home_team", "away_team"),
+                       days=0, suffixes=("", "_odds"), name="backtest_odds")
+    out["date"] = pd.to_datetime(out["date"]).dt.normalize()
+    return out.drop(columns=["date_odds", "away_team"])
+
+def closing_h2h(hist: pd.DataFrame, book: str | None = None) -> pd.DataFrame:
+    """
+    Histórico de odds (odds_history.load_odds_history) -> odds de fechamento
+    h2h por jogo, no formato de join_odds: date, home_team, away_team,
+    home_odds, away_odds. Fechamento = última captura antes do início do jogo;
+    entre books vale a mediana (ou só `book`).
+    """
+    cols = ["date", "home_team", "away_team", "home_odds", "away_odds"]
+    if hist.empty:
+        return pd.DataFrame(columns=cols)
+    h = hist[(hist["market"] == "h2h") & (hist["captured_at"] <= hist["commence_time"])]
+    if book is not None:
+        h = h[h["book"].str.lower() == book.lower()]
+
+    last = h.sort_values("captured_at").groupby(["event_id", "book", "selection"], sort=False).tail(1)
+    last = last.assign(side=np.select([last["selection"] == last["home_team"], last["selection"] == last["away_team"]],
+                                      ["home_odds", "away_odds"], ""))
+    last = last[last["side"] != ""]
+    if last.empty:
+        return pd.DataFrame(columns=cols)
+    wide = last.pivot_table(index="event_id", columns="side", values="price", aggfunc="median")
+    events = last.drop_duplicates("event_id").set_index("event_id")[["commence_time", "home_team", "away_team"]]
+    out = events.join(wide.reindex(columns=["home_odds", "away_odds"]), how="inner")
+    return out.rename(columns={"commence_time": "date"}).dropna(subset=["home_odds", "away_odds"])[cols] \
+        .reset_index(drop=True)
+
+def walk_forward(
+    cfg: BacktestConfig = BacktestConfig(),
+    feat: pd.DataFrame | None = None,
+    odds: pd.DataFrame | None = None,
+    estimator=None,
+    max_workers: int | None = None,
+) -> BacktestResult:
+    """
+    Roda o backtest. `feat` = tabela de features (padrão: build_feature_table),
+    `estimator` = qualquer classificador sklearn (padrão: LogisticRegression do
+    baseline), `max_workers=1` roda tudo no processo atual.
+    """
+    if feat is None:
+        feat = build_feature_table(last_n=cfg.last_n)
+    if feat.empty:
+        return BacktestResult(cfg, pd.DataFrame(), pd.DataFrame())
+    feat = feat.dropna(subset=list(cfg.features)).copy()
+    feat["date"] = pd.to_datetime(feat["date"])
+    if odds is not None and not odds.empty:
+        feat = join_odds(feat, odds)
+    feat = feat.sort_values("date").reset_index(drop=True)
+    estimator = estimator if estimator is not None else LogisticRegression(max_iter=200)
+
+    dates = feat["date"].values
+    jobs = []
+    for train_start, test_start, test_end in make_windows(feat["date"], cfg):
+        lo, mid, hi = np.searchsorted(dates, np.array([train_start, test_start, test_end], dtype=dates.dtype))
+        if mid == hi:
+            continue  # sem jogos no período de teste (entressafra)
+        jobs.append((len(jobs), estimator, cfg, (train_start, test_start, test_end), feat.iloc[lo:mid], feat.iloc[mid:hi]))
+
+    workers = max_workers or min(len(jobs), os.cpu_count() or 1) or 1
+    if workers == 1:
+        results = [_run_window(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_window, jobs))
+
+    windows = pd.DataFrame([r for r, _ in results])
+    preds = [p for _, p in results if not p.empty]
+    predictions = pd.concat(preds, ignore_index=True) if preds else pd.DataFrame()
+    result = BacktestResult(cfg, windows, predictions, summarize(predictions))
+    logger.info(f"[backtest] {len(jobs)} janelas, {len(predictions)} jogos avaliados: {result.summary}")
+    return result
+
+def summarize(predictions: pd.DataFrame) -> dict:
+    """Métricas agregadas sobre todas as janelas (fora da amostra)."""
+    if predictions.empty:
+        return {}
+    y, p = predictions["home_win"].values.astype(int), predictions["p_home_win"].values
+    out = {
+        "n": int(len(y)),
+        "acc": float(accuracy_score(y, (p >= 0.5).astype(int))),
+        "auc": float(roc_auc_score(y, p)) if len(np.unique(y)) == 2 else float("nan"),
+        "log_loss": float(log_loss(y, p, labels=[0, 1])),
+        "brier": float(brier_score_loss(y, p)),
+        "ece": _ece(y, p),
+    }
+    if "profit" in predictions.columns:
+        bets = predictions["profit"].fillna(0) != 0
+        out["bets"] = int(bets.sum())
+        out["roi"] = float(predictions.loc[bets, "profit"].mean()) if bets.any() else float("nan")
+    return out
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Backtest walk-forward do baseline NBA.")
+    ap.add_argument("--last-n", type=int, default=5)
+    ap.add_argument("--mode", choices=["expanding", "sliding"], default="expanding")
+    ap.add_argument("--train-days", type=int, default=365)
+    ap.add_argument("--test-days", type=int, default=30)
+    ap.add_argument("--min-train", type=int, default=200)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--edge", type=float, default=0.0, help="aposta se p*odd - 1 > edge")
+    ap.add_argument("--book", default=None, help="odds de fechamento de um book só (padrão: mediana entre books)")
+    ap.add_argument("--no-odds", action="store_true", help="sem odds históricas (só métricas de previsão)")
+    args = ap.parse_args(argv)
+
+    cfg = BacktestConfig(last_n=args.last_n, mode=args.mode, train_days=args.train_days,
+                         test_days=args.test_days, min_train=args.min_train, edge=args.edge)
+    feat = build_feature_table(last_n=cfg.last_n)
+    odds = None
+    windows = make_windows(feat["date"], cfg) if not feat.empty else []
+    if windows and not args.no_odds:
+        # linhas abrem dias antes do jogo: folga antes do primeiro período de teste
+        since = (windows[0][1] - pd.Timedelta(days=14)).tz_localize("UTC").to_pydatetime()
+        odds = closing_h2h(load_odds_history(league="nba", market="h2h", since=since), book=args.book)
+        logger.info(f"[backtest] odds de fechamento de {len(odds)} jogos desde {since:%Y-%m-%d}")
+    res = walk_forward(cfg, feat=feat, odds=odds, max_workers=args.workers)
+    with pd.option_context("display.width", 200, "display.max_columns", 30):
+        print(res.windows)
+    print(res.summary)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+# >>> FIM
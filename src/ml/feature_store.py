@@ -0,0 +1,299 @@
+# >>> INÍCIO: src/ml/feature_store.py
+"""
+Feature store incremental para o baseline NBA.
+
+Em vez de recalcular o rolling de todo o histórico a cada treino/predição,
+guardamos:
+- team_roll_state: os últimos `last_n` jogos de cada time;
+- nba_features: uma linha de features por jogo (já calculada);
+- feature_store_meta: a marca d'água (último dia processado);
+- feature_store_days: nº de jogos e assinatura (row_hash/placar) de cada
+  dia processado.
+
+update_feature_store() só lê os jogos novos (date > watermark), avança as
+janelas dos times envolvidos e acrescenta as linhas novas. Se algo mudar
+abaixo da marca d'água (backfill de datas antigas, placar corrigido — venha
+ou não em `changed_ids`), as assinaturas dos dias apontam o dia mais antigo
+alterado: as features desse dia em diante são apagadas, as janelas são
+refeitas com os últimos `last_n` jogos de cada time antes dele e o
+processamento segue dali. O custo é o do trecho refeito, não o do histórico.
+
+Só entram jogos de dias já encerrados (date < hoje): jogos de hoje ainda
+não têm placar final.
+
+A checagem "há algo a fazer?" roda no engine de leitura; a sessão de escrita
+(BEGIN IMMEDIATE no SQLite) só é aberta quando há trabalho, então as páginas
+que chamam update_feature_store() não esperam atrás do ingest no caso comum.
+Duas atualizações do mesmo last_n em processos diferentes são serializadas
+por _store_lock (BEGIN IMMEDIATE no SQLite, advisory lock no PostgreSQL,
+GET_LOCK no MySQL, SELECT ... FOR UPDATE nos demais).
+"""
+from __future__ import annotations
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+for p in (ROOT, SRC):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+import json
+from collections import deque
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List
+
+import pandas as pd
+from sqlalchemy import delete, func, insert, select, text, union_all
+
+from src.db.setup import ReadSession, SessionLocal
+from src.db.models import NBAGame, NBAFeature, TeamRollState, FeatureStoreDay, FeatureStoreMeta
+from src.db.read import load_games
+from src.utils.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger("feature_store")
+
+GAME_COLS = ["game_id", "date", "season", "home_team", "visitor_team", "home_score", "visitor_score"]
+FEATURE_COLS = [
+    "game_id", "date", "season", "home_team", "visitor_team",
+    "home_rpts", "home_ropp", "home_rwin",
+    "away_rpts", "away_ropp", "away_rwin",
+    "home_win",
+    "diff_rpts", "diff_ropp", "diff_rwin",
+]
+
+def _means(window: deque) -> tuple:
+    n = len(window)
+    return (
+        sum(w[1] for w in window) / n,
+        sum(w[2] for w in window) / n,
+        sum(w[3] for w in window) / n,
+    )
+
+def _advance(games: pd.DataFrame, windows: Dict[str, deque], last_n: int) -> List[dict]:
+    """
+    Percorre os jogos em ordem de data: gera a linha de features com as
+    janelas ANTES do jogo (igual ao shift+rolling) e depois empurra o jogo
+    nas janelas dos dois times.
+    """
+    rows = []
+    for g in games.itertuples(index=False):
+        wh = windows.setdefault(g.home_team, deque(maxlen=last_n))
+        wa = windows.setdefault(g.visitor_team, deque(maxlen=last_n))
+        home_win = int(g.home_score > g.visitor_score)
+        day = pd.Timestamp(g.date).date()
+
+        if wh and wa:  # sem histórico de um dos lados -> linha descartada (dropna no cálculo completo)
+            hp, ho, hw = _means(wh)
+            ap, ao, aw = _means(wa)
+            rows.append({
+                "game_id": int(g.game_id), "last_n": last_n, "date": day, "season": int(g.season),
+                "home_team": g.home_team, "visitor_team": g.visitor_team,
+                "home_rpts": hp, "home_ropp": ho, "home_rwin": hw,
+                "away_rpts": ap, "away_ropp": ao, "away_rwin": aw,
+                "home_win": home_win,
+                "diff_rpts": hp - ap, "diff_ropp": ho - ao, "diff_rwin": hw - aw,
+            })
+
+        d = day.isoformat()
+        wh.append([d, int(g.home_score), int(g.visitor_score), home_win])
+        wa.append([d, int(g.visitor_score), int(g.home_score), int(g.visitor_score > g.home_score)])
+    return rows
+
+# --- o que mudou abaixo da marca d'água ---------------------------------------------
+
+_SIG_MOD = 1_000_000_007
+_IN_CHUNK = 500   # game_ids por IN (limite de parâmetros do SQLite antigo)
+
+def _sig_expr():
+    """Assinatura de um jogo: row_hash + game_id + placar (placar cobre linhas antigas sem row_hash)."""
+    g = NBAGame
+    term = (func.coalesce(g.row_hash % _SIG_MOD, 0) + g.game_id
+            + func.coalesce(g.home_score, 0) * 1009 + func.coalesce(g.visitor_score, 0) * 7919)
+    return term % _SIG_MOD
+
+def _live_days(s, upto: date, since: date | None = None) -> Dict[date, tuple]:
+    """(nº de jogos, assinatura) por dia em nba_games, dias <= upto."""
+    stmt = select(NBAGame.date, func.count(), func.sum(_sig_expr())).where(NBAGame.date <= upto)
+    if since is not None:
+        stmt = stmt.where(NBAGame.date >= since)
+    return {d: (int(n), int(sig or 0)) for d, n, sig in s.execute(stmt.group_by(NBAGame.date))}
+
+def _stored_days(s, last_n: int) -> Dict[date, tuple]:
+    d = FeatureStoreDay
+    rows = s.execute(select(d.date, d.games, d.sig).where(d.last_n == last_n))
+    return {day: (int(n), int(sig)) for day, n, sig in rows}
+
+def _totals(s, last_n: int, upto: date) -> tuple:
+    """(jogos, assinatura) somados: ao vivo em nba_games e como estavam quando foram processados."""
+    live = s.execute(select(func.count(), func.sum(_sig_expr())).where(NBAGame.date <= upto)).one()
+    d = FeatureStoreDay
+    stored = s.execute(select(func.sum(d.games), func.sum(d.sig)).where(d.last_n == last_n)).one()
+    return tuple(int(v or 0) for v in live), tuple(int(v or 0) for v in stored)
+
+def _changed_since(s, meta: FeatureStoreMeta | None, last_n: int, changed_ids: List[int]) -> date | None:
+    """
+    Dia mais antigo <= marca d'água cujo conteúdo mudou depois de processado
+    (None = nada mudou; date.min = store inexistente). Pega tanto os
+    `changed_ids` do upsert quanto correções gravadas por outro processo:
+    a assinatura dos dias processados fica em feature_store_days.
+    """
+    if meta is None:
+        return date.min
+    first = None
+    live, stored = _totals(s, last_n, meta.watermark)
+    if live != stored:
+        # só quando o total não bate: compara dia a dia para achar o primeiro diferente
+        now, before = _live_days(s, meta.watermark), _stored_days(s, last_n)
+        diff = [d for d in now.keys() | before.keys() if now.get(d) != before.get(d)]
+        first = min(diff) if diff else date.min
+    for i in range(0, len(changed_ids), _IN_CHUNK):
+        d = s.scalar(
+            select(func.min(NBAGame.date))
+            .where(NBAGame.game_id.in_(changed_ids[i:i + _IN_CHUNK]), NBAGame.date <= meta.watermark)
+        )
+        if d is not None and (first is None or d < first):
+            first = d
+    return first
+
+def _windows_before(s, day: date, last_n: int) -> Dict[str, deque]:
+    """Janelas dos times com os últimos `last_n` jogos antes de `day` (ROW_NUMBER por time, sem varrer o histórico em Python)."""
+    g = NBAGame
+    sides = [
+        select(g.game_id, g.date, g.home_team.label("team"), g.home_score.label("pts"), g.visitor_score.label("opp")),
+        select(g.game_id, g.date, g.visitor_team.label("team"), g.visitor_score.label("pts"), g.home_score.label("opp")),
+    ]
+    u = union_all(*(q.where(g.date < day) for q in sides)).subquery()
+    rn = func.row_number().over(partition_by=u.c.team, order_by=(u.c.date.desc(), u.c.game_id.desc()))
+    ranked = select(u, rn.label("rn")).subquery()
+    rows = s.execute(
+        select(ranked.c.team, ranked.c.date, ranked.c.pts, ranked.c.opp)
+        .where(ranked.c.rn <= last_n)
+        .order_by(ranked.c.team, ranked.c.date, ranked.c.game_id)
+    ).all()
+    windows: Dict[str, deque] = {}
+    for team, d, pts, opp in rows:
+        windows.setdefault(team, deque(maxlen=last_n)).append(
+            [pd.Timestamp(d).date().isoformat(), int(pts), int(opp), int(pts > opp)]
+        )
+    return windows
+
+_LOCK_KEY = 0x5C0BE7_0000   # + last_n: chave do advisory lock
+
+@contextmanager
+def _store_lock(s, last_n: int):
+    """Lock entre processos para atualizar o store de `last_n` (segurado até o commit)."""
+    dialect = s.get_bind().dialect.name
+    if dialect == "postgresql":
+        s.execute(text("SELECT pg_advisory_xact_lock(:k)"), {"k": _LOCK_KEY + last_n})
+        yield
+    elif dialect in ("mysql", "mariadb"):
+        name = f"scorebet_feature_store_{last_n}"
+        got = s.execute(text("SELECT GET_LOCK(:n, :t)"),
+                        {"n": name, "t": settings.DB_BUSY_TIMEOUT_MS // 1000}).scalar()
+        if got != 1:
+            raise TimeoutError(f"feature store last_n={last_n} ocupado por outro processo")
+        try:
+            yield
+        finally:
+            s.execute(text("SELECT RELEASE_LOCK(:n)"), {"n": name})
+    else:
+        # SQLite: a transação do escritor já é BEGIN IMMEDIATE; nos demais trava a linha de meta
+        if dialect != "sqlite":
+            s.execute(select(FeatureStoreMeta).where(FeatureStoreMeta.last_n == last_n).with_for_update())
+        yield
+
+def _up_to_date(s, meta: FeatureStoreMeta | None, last_n: int, changed_ids: List[int], watermark: date) -> bool:
+    return (meta is not None and meta.watermark >= watermark
+            and _changed_since(s, meta, last_n, changed_ids) is None)
+
+def update_feature_store(last_n: int = 5, changed_ids: Iterable[int] | None = None,
+                         today: date | None = None) -> dict:
+    """
+    Atualiza o store para a janela `last_n`. `changed_ids` (opcional) são os
+    game_ids alterados pelo último upsert. Se algo mudou abaixo da marca
+    d'água, reprocessa só a partir do dia mais antigo alterado.
+    Retorna {mode, since, games, features}.
+    """
+    changed_ids = [int(i) for i in (changed_ids or [])]
+    cutoff = today or date.today()
+    watermark = cutoff - timedelta(days=1)
+
+    with ReadSession() as s:
+        if _up_to_date(s, s.get(FeatureStoreMeta, last_n), last_n, changed_ids, watermark):
+            return {"mode": "noop", "since": None, "games": 0, "features": 0}
+
+    with SessionLocal() as s, _store_lock(s, last_n):
+        # confere de novo já com o lock de escrita: outro processo pode ter acabado de atualizar
+        meta = s.get(FeatureStoreMeta, last_n)
+        since = _changed_since(s, meta, last_n, changed_ids)
+        rebuild = since is not None
+
+        if rebuild:
+            # o que vem antes de `since` continua valendo: apaga daí para frente e
+            # refaz as janelas com os últimos last_n jogos de cada time antes do dia
+            since = None if since == date.min else since
+            for model in (NBAFeature, FeatureStoreDay):
+                cond = [model.last_n == last_n] + ([model.date >= since] if since else [])
+                s.execute(delete(model).where(*cond))
+            s.execute(delete(TeamRollState).where(TeamRollState.last_n == last_n))
+            windows = _windows_before(s, since, last_n) if since else {}
+        else:
+            if meta.watermark >= watermark:
+                return {"mode": "noop", "since": None, "games": 0, "features": 0}
+            states = s.execute(select(TeamRollState).where(TeamRollState.last_n == last_n)).scalars().all()
+            windows = {st.team: deque(json.loads(st.window), maxlen=last_n) for st in states}
+            since = meta.watermark + timedelta(days=1)
+
+        games = load_games(GAME_COLS, start=since, before=cutoff, bind=s.connection())
+        rows = _advance(games, windows, last_n)
+
+        if rows:
+            s.execute(insert(NBAFeature), rows)
+        touched = set(games["home_team"]) | set(games["visitor_team"]) if not games.empty else set()
+        for team in (windows.keys() if rebuild else touched):
+            win = windows[team]
+            s.merge(TeamRollState(
+                team=team, last_n=last_n, window=json.dumps(list(win)),
+                last_date=date.fromisoformat(win[-1][0]),
+            ))
+        days = _live_days(s, watermark, since=since)
+        if days:
+            s.execute(insert(FeatureStoreDay), [
+                {"last_n": last_n, "date": d, "games": n, "sig": sig} for d, (n, sig) in days.items()
+            ])
+        total = s.scalar(select(func.sum(FeatureStoreDay.games)).where(FeatureStoreDay.last_n == last_n))
+        s.merge(FeatureStoreMeta(
+            last_n=last_n, watermark=watermark, games=int(total or 0), updated_at=datetime.now(),
+        ))
+        s.commit()
+
+    mode = "rebuild" if rebuild else "incremental"
+    logger.info(f"[feature_store] last_n={last_n} {mode} desde {since or 'o início'}: "
+                f"{len(games)} jogos, {len(rows)} linhas novas")
+    return {"mode": mode, "since": since, "games": len(games), "features": len(rows)}
+
+def load_feature_table(last_n: int = 5) -> pd.DataFrame:
+    """Tabela de features/label já materializada (mesmo formato de _team_roll_stats)."""
+    cols = [getattr(NBAFeature, c) for c in FEATURE_COLS]
+    with ReadSession() as s:
+        rows = s.execute(
+            select(*cols).where(NBAFeature.last_n == last_n).order_by(NBAFeature.date, NBAFeature.game_id)
+        ).all()
+    df = pd.DataFrame(rows, columns=FEATURE_COLS)
+    if not df.empty:
+        df["date"] = pd.to_datetime(df["date"])
+    return df
+
+def load_team_windows(last_n: int = 5) -> pd.DataFrame:
+    """Últimos `last_n` jogos de cada time em formato longo: team, date, pts, opp, win."""
+    with ReadSession() as s:
+        states = s.execute(
+            select(TeamRollState.team, TeamRollState.window).where(TeamRollState.last_n == last_n)
+        ).all()
+    recs = [(team, *g) for team, window in states for g in json.loads(window)]
+    df = pd.DataFrame(recs, columns=["team", "date", "pts", "opp", "win"])
+    if not df.empty:
+        df["date"] = pd.to_datetime(df["date"])
+    return df
+# >>> FIM
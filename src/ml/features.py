@@ -8,96 +8,105 @@ for p in (ROOT, SRC):
         sys.path.insert(0, str(p))
 
 import pandas as pd
-from sqlalchemy import select
-from datetime import datetime
-from src.db.setup import SessionLocal
-from src.db.models import NBAGame
+from src.db.read import load_games
+from src.ml.feature_store import update_feature_store, load_feature_table
 
-def _team_roll_stats(games: pd.DataFrame, last_n: int = 5) -> pd.DataFrame:
+import numpy as np
+
+ROLL_STATS = ("pts", "opp", "win")
+ROLL_WINDOWS = (3, 5, 10)
+
+def _shifted_rolling_mean(values: np.ndarray, group_start: np.ndarray, window: int) -> np.ndarray:
     """
-    Gera estatísticas por time ao longo do tempo (rolling, antes do jogo).
-    Retorna DF com colunas para home_* e visitor_* + label home_win.
+    Média dos `window` valores ANTERIORES dentro de cada grupo (equivale a
+    groupby().shift().rolling(window, min_periods=1).mean()), via soma
+    acumulada sobre o array já ordenado por grupo. NaN no primeiro do grupo.
+    """
+    idx = np.arange(len(values))
+    cs = np.concatenate(([0.0], np.cumsum(values, dtype=float)))
+    lo = np.maximum(group_start, idx - window)
+    count = idx - lo
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = (cs[idx] - cs[lo]) / count
+    out[count == 0] = np.nan
+    return out
+
+def team_roll_stats_multi(games: pd.DataFrame, windows=ROLL_WINDOWS) -> pd.DataFrame:
+    """
+    Estatísticas rolling (antes do jogo) para várias janelas num único passe.
+    Retorna uma linha por jogo (ordem de data) com game_id, date, season,
+    times, home_win e, para cada janela n: home_r{pts,opp,win}_{n},
+    away_r..._{n} e diff_r..._{n}. Sem groupby.apply e sem merges: os jogos
+    viram 2 linhas por time, são ordenados por (time, data) e os resultados
+    voltam para a posição original por índice.
     """
     df = games.copy()
     df["date"] = pd.to_datetime(df["date"])
-    df = df.sort_values("date")
-
-    # transforma em linhas por time (lado "team", "pts", "opp", "is_home")
-    home = df[["date","home_team","home_score","visitor_score"]].copy()
-    home.columns = ["date","team","pts","opp"]
-    home["is_home"] = 1
-    away = df[["date","visitor_team","visitor_score","home_score"]].copy()
-    away.columns = ["date","team","pts","opp"]
-    away["is_home"] = 0
-    long = pd.concat([home, away], ignore_index=True)
-    long["win"] = (long["pts"] > long["opp"]).astype(int)
-
-    # rolling por time, EXCLUINDO o próprio jogo (shift)
-    long = long.sort_values(["team","date"])
-    for col in ["pts","opp","win"]:
-        long[f"r{last_n}_{col}"] = (
-            long.groupby("team")[col]
-                .apply(lambda s: s.shift().rolling(last_n, min_periods=1).mean())
-                .values
-        )
-
-    # agora voltamos ao formato por partida juntando stats do time da casa e do visitante
-    # mapeia stats por (team,date) para merge rápido
-    key = ["team","date"]
-    stats_cols = [f"r{last_n}_pts", f"r{last_n}_opp", f"r{last_n}_win"]
-    stats = long[key + stats_cols]
+    df = df.sort_values("date", kind="mergesort").reset_index(drop=True)
+    n = len(df)
 
-    # junta no dataframe de jogos
-    m_home = df.merge(stats, left_on=["home_team","date"], right_on=["team","date"], how="left")
-    m_home = m_home.rename(columns={
-        f"r{last_n}_pts": "home_rpts",
-        f"r{last_n}_opp": "home_ropp",
-        f"r{last_n}_win": "home_rwin",
-    }).drop(columns=["team"])
+    hs = df["home_score"].to_numpy(dtype=float)
+    vs = df["visitor_score"].to_numpy(dtype=float)
+    team_codes, _ = pd.factorize(pd.concat([df["home_team"], df["visitor_team"]], ignore_index=True))
+    long = {
+        "pts": np.concatenate([hs, vs]),
+        "opp": np.concatenate([vs, hs]),
+    }
+    long["win"] = (long["pts"] > long["opp"]).astype(float)
+    dates = np.concatenate([df["date"].to_numpy()] * 2)
 
-    m_both = m_home.merge(stats, left_on=["visitor_team","date"], right_on=["team","date"], how="left")
-    m_both = m_both.rename(columns={
-        f"r{last_n}_pts": "away_rpts",
-        f"r{last_n}_opp": "away_ropp",
-        f"r{last_n}_win": "away_rwin",
-    }).drop(columns=["team"])
+    # ordena por (time, data); empate resolvido pela posição (lexsort é estável)
+    order = np.lexsort((np.arange(2 * n), dates, team_codes))
+    teams_sorted = team_codes[order]
+    is_start = np.ones(2 * n, dtype=bool)
+    is_start[1:] = teams_sorted[1:] != teams_sorted[:-1]
+    group_start = np.maximum.accumulate(np.where(is_start, np.arange(2 * n), 0))
 
-    # label
-    m_both["home_win"] = (m_both["home_score"] > m_both["visitor_score"]).astype(int)
+    out = df[["game_id", "date", "season", "home_team", "visitor_team"]].copy()
+    out["home_win"] = (hs > vs).astype(int)
+    for w in windows:
+        for col in ROLL_STATS:
+            back = np.empty(2 * n)
+            back[order] = _shifted_rolling_mean(long[col][order], group_start, w)
+            out[f"home_r{col}_{w}"] = back[:n]
+            out[f"away_r{col}_{w}"] = back[n:]
+            out[f"diff_r{col}_{w}"] = back[:n] - back[n:]
+    return out
 
-    # features básicas + controle de home advantage
-    feat = m_both[[
+def _team_roll_stats(games: pd.DataFrame, last_n: int = 5) -> pd.DataFrame:
+    """
+    Gera estatísticas por time ao longo do tempo (rolling, antes do jogo).
+    Retorna DF com colunas para home_* e visitor_* + label home_win.
+    """
+    multi = team_roll_stats_multi(games, windows=(last_n,))
+    feat = multi.rename(columns={
+        f"{side}_r{col}_{last_n}": f"{side}_r{col}"
+        for side in ("home", "away", "diff") for col in ROLL_STATS
+    })[[
         "game_id","date","season","home_team","visitor_team",
         "home_rpts","home_ropp","home_rwin",
         "away_rpts","away_ropp","away_rwin",
-        "home_win"
-    ]].copy()
-
-    # algumas derivadas simples
-    feat["diff_rpts"] = feat["home_rpts"] - feat["away_rpts"]
-    feat["diff_ropp"] = feat["home_ropp"] - feat["away_ropp"]
-    feat["diff_rwin"] = feat["home_rwin"] - feat["away_rwin"]
+        "home_win",
+        "diff_rpts","diff_ropp","diff_rwin",
+    ]]
 
     # drop qualquer linha muito antiga sem histórico
     feat = feat.dropna().reset_index(drop=True)
     return feat
 
-def build_feature_table(last_n: int = 5) -> pd.DataFrame:
-    """Lê jogos do banco e monta tabela de features/label."""
-    with SessionLocal() as s:
-        rows = s.execute(select(NBAGame)).scalars().all()
-    if not rows:
-        return pd.DataFrame()
+def build_feature_table(last_n: int = 5, incremental: bool = True) -> pd.DataFrame:
+    """
+    Monta tabela de features/label.
+    incremental=True: atualiza o feature store só com os jogos novos e lê a
+    tabela materializada; incremental=False: recalcula tudo a partir de nba_games.
+    """
+    if incremental:
+        update_feature_store(last_n=last_n)
+        return load_feature_table(last_n=last_n)
 
-    games = pd.DataFrame([{
-        "game_id": r.game_id,
-        "date": r.date,
-        "season": r.season,
-        "home_team": r.home_team,
-        "visitor_team": r.visitor_team,
-        "home_score": r.home_score,
-        "visitor_score": r.visitor_score,
-    } for r in rows])
+    games = load_games()
+    if games.empty:
+        return pd.DataFrame()
 
     return _team_roll_stats(games, last_n=last_n)
 # >>> FIM
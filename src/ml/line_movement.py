@@ -0,0 +1,227 @@
+# >>> INÍCIO: src/ml/line_movement.py
+"""
+Movimento de linha e CLV sobre o histórico de odds (src/db/odds_history.py).
+
+O histórico só tem uma linha por mudança de preço, então:
+- abertura  = primeira captura da seleção naquele book;
+- fechamento = última captura antes do início do jogo (ou a atual, se o
+  jogo ainda não começou);
+- velocidade = variação da probabilidade implícita nas últimas
+  `velocity_hours` antes do fechamento, por hora (as-of, via merge_asof);
+- steam = vários books (>= `min_books`) movendo a mesma seleção na mesma
+  direção, cada um >= `min_move` de probabilidade, dentro de uma janela
+  deslizante de `window` (não em blocos fixos de relógio).
+
+Tudo em operações de coluna/groupby (sem loop por evento). materialize()
+grava o resumo por jogo (mercado h2h) como snapshot "<liga>_line_movement"
+para as páginas de picks; os jogos são escolhidos pela data de início e cada
+um entra com o histórico inteiro (a abertura é a abertura de verdade, mesmo
+que a linha esteja parada há dias — comum na NFL).
+"""
+from __future__ import annotations
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+for p in (ROOT, SRC):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from src.db.odds_history import active_event_ids, load_odds_history
+from src.utils.logger import get_logger
+from src.utils.teams import event_day, match_events, team_ids
+
+logger = get_logger("line_movement")
+
+KEY = ["event_id", "market", "book", "selection"]
+SEL_KEY = ["event_id", "market", "selection"]
+
+def _prepare(hist: pd.DataFrame) -> pd.DataFrame:
+    df = hist.sort_values(KEY + ["captured_at"], kind="mergesort").reset_index(drop=True)
+    # load_odds_history entrega resolução de segundos; merge_asof exige a mesma unidade dos dois lados
+    df["captured_at"] = pd.to_datetime(df["captured_at"], utc=True).dt.as_unit("ns")
+    df["prob"] = 1.0 / df["price"]
+    return df
+
+def line_summary(hist: pd.DataFrame, velocity_hours: float = 6.0) -> pd.DataFrame:
+    """Uma linha por (evento, mercado, book, seleção): abertura, fechamento, nº de mudanças e velocidade."""
+    if hist.empty:
+        return pd.DataFrame()
+    df = _prepare(hist)
+
+    # só capturas até o início do jogo contam para o fechamento
+    pre = df[df["commence_time"].isna() | (df["captured_at"] <= df["commence_time"])]
+    g = pre.groupby(KEY, sort=False)
+    out = g.agg(
+        league=("league", "first"), commence_time=("commence_time", "first"),
+        home_team=("home_team", "first"), away_team=("away_team", "first"),
+        open_price=("price", "first"), open_at=("captured_at", "first"),
+        close_price=("price", "last"), close_at=("captured_at", "last"),
+        open_point=("point", "first"), close_point=("point", "last"),
+        changes=("price", "size"),
+    ).reset_index()
+    out["changes"] -= 1
+    out["move_prob"] = 1 / out["close_price"] - 1 / out["open_price"]
+
+    # preço vigente `velocity_hours` antes do fechamento (as-of)
+    probe = out[KEY + ["close_at"]].assign(at=(out["close_at"] - pd.Timedelta(hours=velocity_hours)).dt.as_unit("ns"))
+    asof = pd.merge_asof(
+        probe.sort_values("at"), pre[KEY + ["captured_at", "prob"]].sort_values("captured_at"),
+        left_on="at", right_on="captured_at", by=KEY, direction="backward",
+    )
+    asof = asof.set_index(KEY)["prob"]
+    before = asof.reindex(pd.MultiIndex.from_frame(out[KEY])).to_numpy()
+    before = np.where(np.isnan(before), 1 / out["open_price"].to_numpy(), before)   # abriu dentro da janela
+    out["velocity"] = (1 / out["close_price"].to_numpy() - before) / velocity_hours
+    return out
+
+def detect_steam(hist: pd.DataFrame, window: str = "10min", min_books: int = 3,
+                 min_move: float = 0.015) -> pd.DataFrame:
+    """Movimentos sincronizados entre books: event_id, market, selection, at, direction, books, avg_move."""
+    cols = SEL_KEY + ["at", "direction", "books", "avg_move"]
+    if hist.empty:
+        return pd.DataFrame(columns=cols)
+    df = _prepare(hist)
+    df["delta"] = df.groupby(KEY, sort=False)["prob"].diff()
+    moves = df[df["delta"].abs() >= min_move].copy()
+    if moves.empty:
+        return pd.DataFrame(columns=cols)
+    moves["direction"] = np.sign(moves["delta"]).astype(int)   # +1 = seleção encurtando (dinheiro entrando)
+    moves = moves[SEL_KEY + ["direction", "book", "captured_at", "delta"]]
+    span = pd.Timedelta(window)
+
+    # janela deslizante: cada movimento olha os da mesma seleção/direção em (t - window, t].
+    # Movimentos relevantes são poucos por seleção, então o self-join fica pequeno.
+    pairs = moves.merge(moves, on=SEL_KEY + ["direction"], suffixes=("", "_w"))
+    lag = pairs["captured_at"] - pairs["captured_at_w"]
+    pairs = pairs[(lag >= pd.Timedelta(0)) & (lag < span)]
+    anchors = (
+        pairs.groupby(SEL_KEY + ["direction", "captured_at"], sort=False)
+             .agg(books=("book_w", "nunique"), avg_move=("delta_w", "mean"))
+             .reset_index()
+    )
+    hits = anchors[anchors["books"] >= min_books].sort_values(SEL_KEY + ["direction", "captured_at"])
+    if hits.empty:
+        return pd.DataFrame(columns=cols)
+
+    # janelas que se sobrepõem são o mesmo steam: novo episódio só depois de `window` sem disparo
+    grp = hits.groupby(SEL_KEY + ["direction"], sort=False)["captured_at"]
+    hits["episode"] = (grp.diff().isna() | (grp.diff() >= span)).cumsum()
+    steam = (
+        hits.groupby("episode", sort=False)
+            .agg(**{c: (c, "first") for c in SEL_KEY + ["direction"]},
+                 at=("captured_at", "first"), books=("books", "max"), avg_move=("avg_move", "mean"))
+    )
+    return steam.reset_index(drop=True)[cols]
+
+def selection_view(summary: pd.DataFrame, steam: pd.DataFrame) -> pd.DataFrame:
+    """Consenso entre books por (evento, mercado, seleção)."""
+    if summary.empty:
+        return pd.DataFrame()
+    summary = summary.assign(open_prob=1 / summary["open_price"], close_prob=1 / summary["close_price"])
+    agg = summary.groupby(SEL_KEY, sort=False).agg(
+        league=("league", "first"), commence_time=("commence_time", "first"),
+        home_team=("home_team", "first"), away_team=("away_team", "first"),
+        books=("book", "nunique"),
+        open_prob=("open_prob", "mean"), close_prob=("close_prob", "mean"),
+        best_close=("close_price", "max"),
+        velocity=("velocity", "mean"),
+        last_change=("close_at", "max"),
+    ).reset_index()
+    agg["move_pp"] = (agg["close_prob"] - agg["open_prob"]) * 100
+    agg["velocity_pp_h"] = agg["velocity"] * 100
+    agg["close_price"] = 1 / agg["close_prob"]
+
+    if not steam.empty:
+        st = steam.groupby(SEL_KEY).agg(steam=("at", "size"), last_steam=("at", "max"),
+                                        steam_dir=("direction", "last")).reset_index()
+        agg = agg.merge(st, on=SEL_KEY, how="left")
+    else:
+        agg["steam"], agg["last_steam"], agg["steam_dir"] = 0, pd.NaT, 0
+    agg["steam"] = agg["steam"].fillna(0).astype(int)
+    agg["steam_dir"] = agg["steam_dir"].fillna(0).astype(int)
+    return agg.drop(columns=["velocity"])
+
+def event_view(sel: pd.DataFrame) -> pd.DataFrame:
+    """h2h por jogo: colunas home_*/away_* (abertura, fechamento, Δpp, velocidade, steam)."""
+    h2h = sel[sel["market"] == "h2h"] if not sel.empty else sel
+    if h2h.empty:
+        return pd.DataFrame()
+    cols = ["open_prob", "close_prob", "close_price", "move_pp", "velocity_pp_h", "steam", "steam_dir"]
+    base = h2h.drop_duplicates("event_id")[["event_id", "league", "commence_time", "home_team", "away_team"]]
+    home = h2h[h2h["selection"] == h2h["home_team"]].set_index("event_id")[cols].add_prefix("home_")
+    away = h2h[h2h["selection"] == h2h["away_team"]].set_index("event_id")[cols].add_prefix("away_")
+    return base.join(home, on="event_id").join(away, on="event_id").reset_index(drop=True)
+
+def closing_line_value(picks: pd.DataFrame, sel: pd.DataFrame, league: str = "nba") -> pd.DataFrame:
+    """
+    CLV de cada pick contra o fechamento de consenso. `picks` precisa de
+    home_team, away_team, selection e price (odd decimal pega); `date`
+    (opcional) desambigua jogos repetidos entre os mesmos times.
+    clv = price / fechamento - 1; clv_pp = prob(fechamento) - prob(pick), em pontos.
+    """
+    keys = ["_h", "_a", "_s"]
+    ids = lambda df: {k: team_ids(df[c], league).values for k, c in zip(keys, ("home_team", "away_team", "selection"))}
+    out = picks.assign(**ids(picks))
+    ref = sel[sel["market"] == "h2h"]
+    ref = ref.assign(**ids(ref))[keys + ["commence_time", "close_price", "close_prob"]]
+    on = keys
+    if "date" in out.columns:
+        out["_day"] = event_day(out["date"])
+        ref = ref.assign(_day=event_day(ref["commence_time"]))
+        on = keys + ["_day"]
+    out = out.merge(ref.drop(columns=["commence_time"]).drop_duplicates(on, keep="last"), on=on, how="left")
+    out["clv"] = out["price"] / out["close_price"] - 1
+    out["clv_pp"] = (out["close_prob"] - 1 / out["price"]) * 100
+    return out.drop(columns=keys + ["_day"], errors="ignore")
+
+def attach_to_picks(picks: pd.DataFrame, view: pd.DataFrame, league: str = "nba") -> pd.DataFrame:
+    """
+    Junta event_view() às linhas das páginas de picks (teams.match_events)
+    e calcula `clv` do lado recomendado (coluna `recommendation`:
+    Mandante/Visitante/Nenhum) com a odd exibida contra o fechamento.
+    """
+    if view is None or view.empty:
+        return picks
+    cols = [c for c in view.columns if c.startswith(("home_", "away_")) and c not in ("home_team", "away_team")]
+    view = view[["home_team", "away_team", "commence_time"] + cols].rename(columns={"commence_time": "date"})
+    out = match_events(picks, view, league, date_col="date" if "date" in picks.columns else None,
+                       suffixes=("", "_lm"), name="line_movement").drop(columns=["date_lm"], errors="ignore")
+    if "recommendation" in out.columns and {"home_odds", "away_odds"} <= set(out.columns):
+        home = out["recommendation"] == "Mandante"
+        taken = np.where(home, out["home_odds"], out["away_odds"]).astype(float)
+        close = np.where(home, out["home_close_price"], out["away_close_price"]).astype(float)
+        out["clv"] = np.where(out["recommendation"] == "Nenhum", np.nan, taken / close - 1)
+    return out
+
+def move_str(r: pd.Series, side: str) -> str:
+    """
+    HTML curto para os cards das páginas de picks (linha de attach_to_picks):
+    abertura → agora em prob. implícita, Δ em pontos e 🔥 se houve steam.
+    """
+    if pd.isna(r.get(f"{side}_open_prob", np.nan)):
+        return ""
+    d = r[f"{side}_move_pp"]
+    arrow = "▲" if d > 0.05 else ("▼" if d < -0.05 else "•")
+    steam = " 🔥" if r.get(f"{side}_steam", 0) > 0 else ""
+    return (f"<small style='color:#777;'>{r[f'{side}_open_prob']*100:.0f}% → "
+            f"{r[f'{side}_close_prob']*100:.0f}% {arrow}{abs(d):.1f}pp{steam}</small>")
+
+def materialize(league: str = "nba", days_back: int = 3) -> pd.DataFrame:
+    """Resumo por jogo (h2h) dos jogos futuros ou iniciados há até `days_back` dias; é o que o scheduler grava."""
+    ids = active_event_ids(league, datetime.now(timezone.utc) - timedelta(days=days_back))
+    if not ids:
+        return pd.DataFrame()
+    hist = load_odds_history(league=league, event_ids=ids)
+    if hist.empty:
+        return pd.DataFrame()
+    summary = line_summary(hist)
+    sel = selection_view(summary, detect_steam(hist))
+    view = event_view(sel)
+    logger.info(f"[line_movement] {league}: {len(hist)} capturas -> {len(view)} jogos")
+    return view
+# >>> FIM
@@ -0,0 +1,118 @@
+# >>> INÍCIO: src/ml/model_cache.py
+"""
+Cache de bundles de modelo ({"model", "features", ...}) para o processo inteiro.
+
+Cada arquivo é deserializado uma vez só. A cada acesso comparamos mtime e
+tamanho (um os.stat); se mudaram, lemos os bytes e comparamos o hash: hash
+novo = versão nova (recarrega), hash igual = só atualiza o carimbo. A versão
+é o prefixo do sha1 do arquivo e as últimas versões ficam em memória para
+quem precisar fixar uma (get(path, version=...)).
+"""
+from __future__ import annotations
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+for p in (ROOT, SRC):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict
+
+import joblib
+
+from src.utils.logger import get_logger
+
+logger = get_logger("model_cache")
+
+@dataclass
+class LoadedBundle:
+    path: Path
+    version: str
+    bundle: Dict[str, Any]
+    mtime_ns: int
+    size: int
+    loaded_at: datetime = field(default_factory=datetime.now)
+
+    @property
+    def model(self):
+        return self.bundle["model"]
+
+    @property
+    def features(self) -> list:
+        return self.bundle["features"]
+
+class ModelCache:
+    def __init__(self, max_versions: int = 3):
+        self.max_versions = max_versions
+        self._lock = threading.Lock()
+        self._current: Dict[Path, LoadedBundle] = {}
+        self._history: Dict[Path, "OrderedDict[str, LoadedBundle]"] = {}
+
+    def _load(self, path: Path, st) -> LoadedBundle:
+        raw = path.read_bytes()
+        version = hashlib.sha1(raw).hexdigest()[:12]
+        prev = self._current.get(path)
+        if prev is not None and prev.version == version:
+            prev.mtime_ns, prev.size = st.st_mtime_ns, st.st_size   # tocado, mas igual
+            return prev
+
+        hist = self._history.setdefault(path, OrderedDict())
+        if version in hist:                                          # voltou para uma versão conhecida
+            entry = hist[version]
+            entry.mtime_ns, entry.size = st.st_mtime_ns, st.st_size
+        else:
+            entry = LoadedBundle(path, version, joblib.load(io.BytesIO(raw)), st.st_mtime_ns, st.st_size)
+            logger.info(f"[model_cache] {path.name} carregado (versão {version})")
+        hist[version] = entry
+        hist.move_to_end(version)
+        while len(hist) > self.max_versions:
+            hist.popitem(last=False)
+        return entry
+
+    def get(self, path: str | Path, version: str | None = None) -> LoadedBundle:
+        """
+        Bundle atual de `path` (recarrega se o arquivo mudou). Com `version`,
+        devolve aquela versão se ainda estiver em memória (KeyError se não).
+        """
+        path = Path(path).resolve()
+        st = path.stat()   # FileNotFoundError se não houver modelo treinado
+        with self._lock:
+            cur = self._current.get(path)
+            if cur is None or (cur.mtime_ns, cur.size) != (st.st_mtime_ns, st.st_size):
+                cur = self._current[path] = self._load(path, st)
+            if version is None or version == cur.version:
+                return cur
+            try:
+                return self._history[path][version]
+            except KeyError:
+                raise KeyError(f"versão {version} de {path.name} não está em memória") from None
+
+    def versions(self, path: str | Path) -> list:
+        """Versões em memória, da mais antiga para a atual."""
+        with self._lock:
+            return list(self._history.get(Path(path).resolve(), {}))
+
+    def invalidate(self, path: str | Path | None = None) -> None:
+        with self._lock:
+            if path is None:
+                self._current.clear()
+                self._history.clear()
+            else:
+                self._current.pop(Path(path).resolve(), None)
+                self._history.pop(Path(path).resolve(), None)
+
+_cache = ModelCache()
+
+def get_bundle(path: str | Path, version: str | None = None) -> LoadedBundle:
+    return _cache.get(path, version)
+
+def model_cache() -> ModelCache:
+    return _cache
+# >>> FIM
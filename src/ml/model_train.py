@@ -7,7 +7,7 @@ for p in (ROOT, SRC):
     if str(p) not in sys.path:
         sys.path.insert(0, str(p))
 
-import joblib
+import time
 import numpy as np
 import pandas as pd
 from pathlib import Path
@@ -16,10 +16,11 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, roc_auc_score
 
 from src.ml.features import build_feature_table
+from src.ml.registry import get_registry
 
 MODEL_DIR = Path("models")
 MODEL_DIR.mkdir(exist_ok=True, parents=True)
-MODEL_PATH = MODEL_DIR / "nba_baseline.pkl"
+MODEL_PATH = MODEL_DIR / "nba_baseline.pkl"   # legado: usado só se o registro estiver vazio
 
 FEATURES = [
     "home_rpts","home_ropp","home_rwin",
@@ -27,7 +28,8 @@ FEATURES = [
     "diff_rpts","diff_ropp","diff_rwin",
 ]
 
-def train_baseline(last_n: int = 5) -> dict:
+def train_baseline(last_n: int = 5, promote: bool = True) -> dict:
+    t0 = time.perf_counter()
     df = build_feature_table(last_n=last_n)
     if df.empty:
         return {"ok": False, "msg": "Sem dados suficientes para treinar."}
@@ -48,13 +50,28 @@ def train_baseline(last_n: int = 5) -> dict:
     acc = accuracy_score(y_test, (p_test >= 0.5).astype(int))
     auc = roc_auc_score(y_test, p_test)
 
-    joblib.dump({"model": model, "features": FEATURES, "last_n": last_n}, MODEL_PATH)
+    # cada treino vira uma versão nova no registro; leitores seguem na anterior até a promoção
+    registry = get_registry()
+    version = registry.register(
+        {"model": model, "features": FEATURES, "last_n": last_n},
+        {
+            "train_start": str(pd.to_datetime(df["date"]).min().date()),
+            "train_end": str(pd.to_datetime(df["date"]).max().date()),
+            "samples": int(len(df)),
+            "acc": float(acc),
+            "auc": float(auc),
+            "train_seconds": round(time.perf_counter() - t0, 3),
+        },
+    )
+    if promote:
+        registry.promote(version)
 
     return {
         "ok": True,
         "samples": len(df),
         "acc": float(acc),
         "auc": float(auc),
-        "model_path": str(MODEL_PATH),
+        "version": version,
+        "model_path": str(registry.bundle_path(version)),
     }
 # >>> FIM
@@ -2,7 +2,24 @@ from typing import Tuple, Dict
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, roc_auc_score
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression
+
+MODEL_FAMILIES = ("logreg", "rf", "gb")
+
+def make_classifier(family: str, **params):
+    """
+    Classificador por família: "logreg" (baseline de model_train), "rf"
+    (mesmos padrões de train_baseline_classifier) ou "gb" (gradient boosting
+    por histogramas). `params` sobrescrevem os padrões.
+    """
+    if family == "logreg":
+        return LogisticRegression(**{"max_iter": 200, "C": 1.0, **params})
+    if family == "rf":
+        return RandomForestClassifier(**{"n_estimators": 300, "max_depth": None, "random_state": 42, "n_jobs": -1, **params})
+    if family == "gb":
+        return HistGradientBoostingClassifier(**{"learning_rate": 0.05, "max_iter": 200, "random_state": 42, **params})
+    raise ValueError(f"família de modelo desconhecida: {family}")
 
 def train_baseline_classifier(df: pd.DataFrame, target_col: str) -> Tuple[RandomForestClassifier, Dict[str, float]]:
     """
@@ -16,12 +33,7 @@ def train_baseline_classifier(df: pd.DataFrame, target_col: str) -> Tuple[Random
         X, y, test_size=0.25, random_state=42, stratify=y
     )
 
-    model = RandomForestClassifier(
-        n_estimators=300,
-        max_depth=None,
-        random_state=42,
-        n_jobs=-1
-    )
+    model = make_classifier("rf")
     model.fit(X_train, y_train)
 
     y_pred = model.predict(X_test)
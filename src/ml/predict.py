@@ -7,18 +7,22 @@ for p in (ROOT, SRC):
     if str(p) not in sys.path:
         sys.path.insert(0, str(p))
 
-import joblib
 import numpy as np
 import pandas as pd
 from pathlib import Path
 
+from src.ml.registry import load_active
+
 MODEL_PATH = Path("models") / "nba_baseline.pkl"
 
-def predict_proba_home(df_features: pd.DataFrame) -> np.ndarray:
-    """Recebe DataFrame com as mesmas colunas de treino e devolve P(home_win)."""
-    bundle = joblib.load(MODEL_PATH)
-    model = bundle["model"]
-    cols  = bundle["features"]
+def predict_proba_home(df_features: pd.DataFrame, version: str | None = None) -> np.ndarray:
+    """
+    Recebe DataFrame com as mesmas colunas de treino e devolve P(home_win).
+    Usa a versão ativa do registro (ou `version`), sempre via cache do processo.
+    """
+    loaded = load_active(fallback=MODEL_PATH, version=version)
+    model = loaded.model
+    cols  = loaded.features
     X = df_features[cols].values.astype(float)
     return model.predict_proba(X)[:,1]
 # >>> FIM
@@ -0,0 +1,163 @@
+# >>> INÍCIO: src/ml/registry.py
+"""
+Registro versionado de modelos.
+
+    models/registry/<nome>/
+        versions/<versão>/bundle.pkl      (imutável depois de gravado)
+        versions/<versão>/manifest.json   (features, last_n, janela de treino, métricas...)
+        CURRENT                           (id da versão ativa)
+
+- register(): grava bundle+manifest num diretório temporário e renomeia
+  para versions/<versão> de uma vez; leitores nunca veem versão incompleta.
+- promote(): troca CURRENT com os.replace (atômico). Como cada versão tem
+  arquivo próprio, quem está lendo a versão anterior não é afetado.
+- current_version(): leitura de CURRENT em cache, revalidada por os.stat.
+"""
+from __future__ import annotations
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+for p in (ROOT, SRC):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict
+
+import joblib
+import pandas as pd
+
+from src.ml.model_cache import LoadedBundle, get_bundle
+from src.utils.logger import get_logger
+
+logger = get_logger("registry")
+
+REGISTRY_DIR = Path("models") / "registry"
+
+class ModelRegistry:
+    def __init__(self, name: str = "nba_baseline", root: str | Path = REGISTRY_DIR):
+        self.name = name
+        self.root = Path(root) / name
+        self.versions_dir = self.root / "versions"
+        self.pointer = self.root / "CURRENT"
+        self._lock = threading.Lock()
+        self._pointer_stat: tuple | None = None
+        self._current: str | None = None
+
+    # --- escrita --------------------------------------------------------------------
+
+    def register(self, bundle: Dict[str, Any], manifest: Dict[str, Any]) -> str:
+        """Grava uma versão nova e devolve seu id (não promove)."""
+        self.versions_dir.mkdir(parents=True, exist_ok=True)
+        created = datetime.now()
+        tmp = self.versions_dir / f".tmp-{os.getpid()}-{threading.get_ident()}"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir()
+
+        joblib.dump(bundle, tmp / "bundle.pkl")
+        digest = hashlib.sha1((tmp / "bundle.pkl").read_bytes()).hexdigest()[:8]
+        base = f"{created:%Y%m%dT%H%M%S}-{digest}"
+
+        # mesmo modelo registrado duas vezes no mesmo segundo: sufixo -2, -3...
+        for n in itertools.count(1):
+            version = base if n == 1 else f"{base}-{n}"
+            if (self.versions_dir / version).exists():
+                continue
+            manifest_out = {
+                "name": self.name,
+                "version": version,
+                "created_at": created.isoformat(timespec="seconds"),
+                "features": list(bundle.get("features", [])),
+                "last_n": bundle.get("last_n"),
+                **manifest,
+            }
+            (tmp / "manifest.json").write_text(json.dumps(manifest_out, indent=2, default=str), encoding="utf-8")
+            try:
+                os.rename(tmp, self.versions_dir / version)
+                break
+            except OSError:
+                if not (self.versions_dir / version).exists():
+                    raise
+                # outro processo pegou o mesmo nome entre o exists() e o rename
+        logger.info(f"[registry] {self.name}: versão {version} registrada")
+        return version
+
+    def promote(self, version: str) -> None:
+        """Torna `version` a versão ativa (troca atômica de CURRENT)."""
+        if not (self.versions_dir / version / "bundle.pkl").exists():
+            raise FileNotFoundError(f"versão {version} não existe em {self.versions_dir}")
+        tmp = self.pointer.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(version, encoding="utf-8")
+        os.replace(tmp, self.pointer)
+        logger.info(f"[registry] {self.name}: versão ativa -> {version}")
+
+    # --- leitura --------------------------------------------------------------------
+
+    def current_version(self) -> str | None:
+        try:
+            st = self.pointer.stat()
+        except FileNotFoundError:
+            return None
+        key = (st.st_mtime_ns, st.st_size, st.st_ino)
+        with self._lock:
+            if key != self._pointer_stat:
+                self._current = self.pointer.read_text(encoding="utf-8").strip() or None
+                self._pointer_stat = key
+            return self._current
+
+    def bundle_path(self, version: str | None = None) -> Path | None:
+        version = version or self.current_version()
+        return None if version is None else self.versions_dir / version / "bundle.pkl"
+
+    def manifest(self, version: str | None = None) -> Dict[str, Any]:
+        version = version or self.current_version()
+        if version is None:
+            raise FileNotFoundError(f"{self.name}: nenhuma versão ativa")
+        return json.loads((self.versions_dir / version / "manifest.json").read_text(encoding="utf-8"))
+
+    def load(self, version: str | None = None) -> LoadedBundle:
+        path = self.bundle_path(version)
+        if path is None:
+            raise FileNotFoundError(f"{self.name}: nenhuma versão ativa")
+        return get_bundle(path)
+
+    def list_versions(self) -> pd.DataFrame:
+        """Manifests de todas as versões (mais recente primeiro) + coluna `active`."""
+        rows = []
+        for mf in self.versions_dir.glob("*/manifest.json"):
+            try:
+                rows.append(json.loads(mf.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue
+        df = pd.DataFrame(rows)
+        if df.empty:
+            return df
+        df["active"] = df["version"] == self.current_version()
+        return df.sort_values("created_at", ascending=False).reset_index(drop=True)
+
+_registries: Dict[str, ModelRegistry] = {}
+_registries_lock = threading.Lock()
+
+def get_registry(name: str = "nba_baseline") -> ModelRegistry:
+    with _registries_lock:
+        if name not in _registries:
+            _registries[name] = ModelRegistry(name)
+        return _registries[name]
+
+def load_active(name: str = "nba_baseline", fallback: str | Path | None = None,
+                version: str | None = None) -> LoadedBundle:
+    """Bundle ativo do registro; sem registro, cai no arquivo legado `fallback`."""
+    reg = get_registry(name)
+    if version is not None or reg.current_version() is not None:
+        return reg.load(version)
+    if fallback is None:
+        raise FileNotFoundError(f"{name}: nenhuma versão ativa")
+    return get_bundle(fallback)
+# >>> FIM
@@ -0,0 +1,178 @@
+# >>> INÍCIO: src/ml/sweep.py
+"""
+Varredura de configurações do baseline NBA (last_n × features × modelo × regularização).
+
+- As tabelas de features de todos os `last_n` saem de um único passe
+  (features.team_roll_stats_multi) sobre os jogos lidos uma vez do banco.
+- Cada configuração é avaliada com o backtest walk-forward (backtest.py),
+  então a nota é fora da amostra e respeita o tempo.
+- Os fits rodam num ProcessPoolExecutor; as tabelas vão para cada worker
+  uma vez só (initializer), não a cada tarefa.
+
+    python -m src.ml.sweep --last-n 3 5 10 --families logreg rf gb --workers 8 --out sweep.csv
+"""
+from __future__ import annotations
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+for p in (ROOT, SRC):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List
+
+import pandas as pd
+
+from src.db.read import load_games
+from src.ml.backtest import BacktestConfig, walk_forward
+from src.ml.features import ROLL_STATS, team_roll_stats_multi
+from src.ml.model_train import FEATURES
+from src.ml.pipeline import make_classifier
+from src.utils.logger import get_logger
+
+logger = get_logger("sweep")
+
+FEATURE_SETS: Dict[str, List[str]] = {
+    "all": FEATURES,
+    "diff": ["diff_rpts", "diff_ropp", "diff_rwin"],
+    "sides": [c for c in FEATURES if not c.startswith("diff_")],
+    "win_only": ["home_rwin", "away_rwin", "diff_rwin"],
+}
+
+# regularização por família: logreg = C, rf = max_depth, gb = max_depth
+PARAM_GRID: Dict[str, List[dict]] = {
+    "logreg": [{"C": c} for c in (0.01, 0.1, 1.0, 10.0)],
+    "rf": [{"max_depth": d, "n_estimators": 200, "min_samples_leaf": 5} for d in (4, 8, None)],
+    "gb": [{"max_depth": d} for d in (2, 3, 5)],
+}
+
+# ordem do ranking: (métrica, ascendente?)
+SCORE_METRICS = {"log_loss": True, "brier": True, "auc": False, "acc": False, "roi": False}
+
+def feature_tables(last_ns: Iterable[int], games: pd.DataFrame | None = None) -> Dict[int, pd.DataFrame]:
+    """Uma tabela de features por last_n (mesmo formato de build_feature_table), num passe só."""
+    last_ns = sorted(set(last_ns))
+    if games is None:
+        games = load_games()
+    if games.empty:
+        return {n: pd.DataFrame() for n in last_ns}
+
+    multi = team_roll_stats_multi(games, windows=last_ns)
+    base = ["game_id", "date", "season", "home_team", "visitor_team", "home_win"]
+    tables = {}
+    for n in last_ns:
+        cols = {f"{side}_r{c}_{n}": f"{side}_r{c}" for side in ("home", "away", "diff") for c in ROLL_STATS}
+        tables[n] = multi[base + list(cols)].rename(columns=cols).dropna().reset_index(drop=True)
+    return tables
+
+def expand_grid(
+    last_ns: Iterable[int] = (3, 5, 10),
+    feature_sets: Iterable[str] = tuple(FEATURE_SETS),
+    families: Iterable[str] = ("logreg", "rf", "gb"),
+    param_grid: Dict[str, List[dict]] | None = None,
+) -> List[dict]:
+    grid = param_grid or PARAM_GRID
+    return [
+        {"last_n": n, "feature_set": fs, "family": fam, "params": params}
+        for n, fs, fam in itertools.product(last_ns, feature_sets, families)
+        for params in grid.get(fam, [{}])
+    ]
+
+# --- execução (workers) -----------------------------------------------------
+
+_TABLES: Dict[int, pd.DataFrame] = {}
+
+def _init_worker(tables: Dict[int, pd.DataFrame]) -> None:
+    global _TABLES
+    _TABLES = tables
+
+def _evaluate(job: tuple) -> dict:
+    """Backtest de uma configuração (roda dentro do worker)."""
+    conf, bt = job
+    t0 = time.perf_counter()
+    row = {
+        "last_n": conf["last_n"], "feature_set": conf["feature_set"], "family": conf["family"],
+        "params": ", ".join(f"{k}={v}" for k, v in sorted(conf["params"].items())),
+    }
+    try:
+        params = dict(conf["params"])
+        if conf["family"] == "rf":
+            params.setdefault("n_jobs", 1)   # o paralelismo já é do pool
+        cfg = BacktestConfig(last_n=conf["last_n"], features=tuple(FEATURE_SETS[conf["feature_set"]]), **bt)
+        res = walk_forward(cfg, feat=_TABLES[conf["last_n"]], estimator=make_classifier(conf["family"], **params),
+                           max_workers=1)
+        row.update(res.summary)
+        row["windows"] = len(res.windows)
+    except Exception as e:
+        row["error"] = str(e)
+    row["seconds"] = round(time.perf_counter() - t0, 3)
+    return row
+
+def run_sweep(
+    configs: List[dict] | None = None,
+    tables: Dict[int, pd.DataFrame] | None = None,
+    sort_by: str = "log_loss",
+    max_workers: int | None = None,
+    mode: str = "expanding",
+    test_days: int = 30,
+    min_train: int = 200,
+) -> pd.DataFrame:
+    """
+    Avalia todas as configurações e devolve a tabela de resultados ordenada
+    por `sort_by` (uma de SCORE_METRICS; a melhor fica no topo).
+    """
+    if sort_by not in SCORE_METRICS:
+        raise ValueError(f"sort_by deve ser um de {list(SCORE_METRICS)}")
+    configs = configs if configs is not None else expand_grid()
+    if tables is None:
+        tables = feature_tables({c["last_n"] for c in configs})
+    bt = {"mode": mode, "test_days": test_days, "min_train": min_train}
+    jobs = [(c, bt) for c in configs]
+
+    t0 = time.perf_counter()
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(tables)
+        rows = [_evaluate(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(tables,)) as pool:
+            rows = list(pool.map(_evaluate, jobs, chunksize=1))
+    logger.info(f"[sweep] {len(jobs)} configurações em {time.perf_counter() - t0:.1f}s ({workers} processos)")
+
+    return sort_results(pd.DataFrame(rows), sort_by)
+
+def sort_results(results: pd.DataFrame, sort_by: str = "log_loss") -> pd.DataFrame:
+    if results.empty or sort_by not in results.columns:
+        return results
+    asc = SCORE_METRICS[sort_by]
+    return results.sort_values(sort_by, ascending=asc, na_position="last").reset_index(drop=True)
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Varredura de configurações do baseline NBA.")
+    ap.add_argument("--last-n", type=int, nargs="+", default=[3, 5, 10])
+    ap.add_argument("--feature-sets", nargs="+", default=list(FEATURE_SETS), choices=list(FEATURE_SETS))
+    ap.add_argument("--families", nargs="+", default=["logreg", "rf", "gb"], choices=list(PARAM_GRID))
+    ap.add_argument("--mode", choices=["expanding", "sliding"], default="expanding")
+    ap.add_argument("--test-days", type=int, default=30)
+    ap.add_argument("--sort-by", choices=list(SCORE_METRICS), default="log_loss")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--out", default=None, help="grava os resultados em CSV")
+    args = ap.parse_args(argv)
+
+    configs = expand_grid(args.last_n, args.feature_sets, args.families)
+    results = run_sweep(configs, sort_by=args.sort_by, max_workers=args.workers,
+                        mode=args.mode, test_days=args.test_days)
+    if args.out:
+        results.to_csv(args.out, index=False)
+    with pd.option_context("display.width", 200, "display.max_columns", 30):
+        print(results.head(20))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+# >>> FIM
@@ -7,14 +7,13 @@ for p in (ROOT, SRC):
     if str(p) not in sys.path:
         sys.path.insert(0, str(p))
 
-import joblib
 import pandas as pd
 import numpy as np
-from sqlalchemy import select
 from datetime import date, timedelta
-from src.db.setup import SessionLocal
-from src.db.models import NBAGame
-from src.ml.model_train import FEATURES, MODEL_DIR
+from src.db.read import load_games
+from src.ml.model_train import FEATURES, MODEL_PATH
+from src.ml.registry import load_active
+from src.ml.feature_store import update_feature_store, load_team_windows
 from src.api.nba_data import get_upcoming_games
 
 
@@ -30,76 +29,82 @@ def _team_recent_stats(df_hist: pd.DataFrame, last_n: int = 5) -> pd.DataFrame:
 
     long = pd.concat([home, away], ignore_index=True).sort_values(["team","date"])
     long["win"] = (long["pts"] > long["opp"]).astype(int)
-    long["days_ago"] = (pd.to_datetime(date.today()) - long["date"]).dt.days
 
     rec = long[long["date"] < pd.to_datetime(date.today())].groupby("team").tail(last_n)
+    return _weighted_team_stats(rec)
+
+
+def _weighted_team_stats(rec: pd.DataFrame) -> pd.DataFrame:
+    """Média ponderada por recência de pts/opp/win (rec = últimos jogos de cada time)."""
+    rec = rec.copy()
+    rec["days_ago"] = (pd.to_datetime(date.today()) - rec["date"]).dt.days
     # pesos: jogos mais recentes têm mais influência
     rec["weight"] = np.exp(-0.15 * rec["days_ago"].clip(0, 10))
 
-    agg = rec.groupby("team").apply(
-        lambda g: pd.Series({
-            "rpts": np.average(g["pts"], weights=g["weight"]),
-            "ropp": np.average(g["opp"], weights=g["weight"]),
-            "rwin": np.average(g["win"], weights=g["weight"]),
-        })
-    ).reset_index()
+    # média ponderada = soma(x*w) / soma(w), tudo num groupby.sum só
+    cols = ["pts", "opp", "win"]
+    weighted = rec[cols].mul(rec["weight"], axis=0)
+    weighted["weight"] = rec["weight"]
+    sums = weighted.groupby(rec["team"]).sum()
 
-    return agg
+    agg = sums[cols].div(sums["weight"], axis=0)
+    agg.columns = ["rpts", "ropp", "rwin"]
+    return agg.rename_axis("team").reset_index()
 
 
 # ======================================================
 # MONTA FEATURES PARA PRÓXIMOS JOGOS
 # ======================================================
-def make_upcoming_features(days_ahead: int = 3, last_n: int = 5) -> pd.DataFrame:
-    with SessionLocal() as s:
-        rows = s.execute(select(NBAGame)).scalars().all()
-    if not rows:
+def _team_recent_stats_full(last_n: int = 5) -> pd.DataFrame:
+    """Mesmo cálculo de _team_recent_stats lendo o histórico inteiro de nba_games."""
+    df_hist = load_games(
+        ["date", "home_team", "visitor_team", "home_score", "visitor_score"], before=date.today(),
+    )
+    if df_hist.empty:
         return pd.DataFrame()
 
-    df_hist = pd.DataFrame([{
-        "date": pd.to_datetime(r.date),
-        "home_team": r.home_team,
-        "visitor_team": r.visitor_team,
-        "home_score": r.home_score,
-        "visitor_score": r.visitor_score,
-    } for r in rows]).sort_values("date")
+    return _team_recent_stats(df_hist, last_n=last_n)
+
+
+def upcoming_feature_matrix(df_up: pd.DataFrame, stats: pd.DataFrame) -> pd.DataFrame:
+    """
+    Junta cada jogo com as stats do mandante e do visitante (stats indexadas
+    por time) e calcula diffs + power_index de uma vez. Jogos com um time sem
+    histórico ficam de fora.
+    """
+    by_team = stats.set_index("team")[["rpts", "ropp", "rwin"]]
+    feat = df_up[["date", "season", "home_team", "visitor_team"]].copy()
+    feat["date"] = pd.to_datetime(feat["date"])
+    feat = (
+        feat.join(by_team.add_prefix("home_"), on="home_team", how="inner")
+            .join(by_team.add_prefix("away_"), on="visitor_team", how="inner")
+    )
 
-    stats = _team_recent_stats(df_hist, last_n=last_n)
+    # features diferenciais
+    for col in ("rpts", "ropp", "rwin"):
+        feat[f"diff_{col}"] = feat[f"home_{col}"] - feat[f"away_{col}"]
+    feat["power_index"] = 0.6 * feat["diff_rpts"] - 0.4 * feat["diff_ropp"] + 0.8 * feat["diff_rwin"]
+    return feat.reset_index(drop=True)
+
+
+def make_upcoming_features(days_ahead: int = 3, last_n: int = 5, use_store: bool = True) -> pd.DataFrame:
+    stats = pd.DataFrame()
+    if use_store:
+        # janelas dos times já vêm prontas do feature store (só os últimos last_n jogos)
+        update_feature_store(last_n=last_n)
+        rec = load_team_windows(last_n=last_n)
+        if not rec.empty:
+            stats = _weighted_team_stats(rec)
+    if stats.empty:
+        stats = _team_recent_stats_full(last_n=last_n)
+    if stats.empty:
+        return pd.DataFrame()
 
     df_up = get_upcoming_games(days_ahead=days_ahead)
     if df_up.empty:
         return pd.DataFrame()
 
-    feat_rows = []
-    for _, g in df_up.iterrows():
-        h, a = g["home_team"], g["visitor_team"]
-        sh, sa = stats[stats["team"] == h], stats[stats["team"] == a]
-        if sh.empty or sa.empty:
-            continue
-
-        row = {
-            "date": pd.to_datetime(g["date"]),
-            "season": g["season"],
-            "home_team": h,
-            "visitor_team": a,
-            "home_rpts": sh["rpts"].values[0],
-            "home_ropp": sh["ropp"].values[0],
-            "home_rwin": sh["rwin"].values[0],
-            "away_rpts": sa["rpts"].values[0],
-            "away_ropp": sa["ropp"].values[0],
-            "away_rwin": sa["rwin"].values[0],
-        }
-
-        # features diferenciais
-        row["diff_rpts"] = row["home_rpts"] - row["away_rpts"]
-        row["diff_ropp"] = row["home_ropp"] - row["away_ropp"]
-        row["diff_rwin"] = row["home_rwin"] - row["away_rwin"]
-        row["power_index"] = (
-            0.6 * row["diff_rpts"] - 0.4 * row["diff_ropp"] + 0.8 * row["diff_rwin"]
-        )
-        feat_rows.append(row)
-
-    return pd.DataFrame(feat_rows)
+    return upcoming_feature_matrix(df_up, stats)
 
 
 # ======================================================
@@ -112,13 +117,15 @@ def predict_upcoming(days_ahead: int = 3, last_n: int = 5) -> pd.DataFrame:
         return df_feat
 
     try:
-        bundle = joblib.load(MODEL_DIR / "nba_baseline.pkl")
-        model, cols = bundle["model"], bundle["features"]
+        loaded = load_active(fallback=MODEL_PATH)   # versão ativa do registro, em cache
+        model, cols = loaded.model, loaded.features
         df_feat = df_feat.dropna(subset=cols)
         proba = model.predict_proba(df_feat[cols].values)[:, 1]
+        version = loaded.version
     except Exception:
         # fallback heurístico leve se modelo não existir
         proba = 1 / (1 + np.exp(-df_feat["power_index"].fillna(0)))
+        version = "heuristic"
 
     df_feat["p_home_win"] = proba
     df_feat["p_away_win"] = 1 - proba
@@ -127,6 +134,7 @@ def predict_upcoming(days_ahead: int = 3, last_n: int = 5) -> pd.DataFrame:
         np.where(df_feat["p_away_win"] >= 0.55, "Visitante", "Nenhum")
     )
     df_feat["conf"] = (df_feat["p_home_win"] - 0.5).abs() * 200
+    df_feat["model_version"] = version
 
     return df_feat.sort_values("date").reset_index(drop=True)
 # >>> FIM
@@ -9,14 +9,13 @@ for p in (ROOT, SRC):
 
 import streamlit as st
 import pandas as pd
-from sqlalchemy import select
 from datetime import datetime, date, timedelta
 
-from src.db.setup import SessionLocal
-from src.db.models import NBAGame
 from src.db.init_db import create_all
+from src.db.read import load_games
 from src.api.nba_data import get_games
 from src.db.upsert_games import upsert_nba_games
+from src.ml.feature_store import update_feature_store
 
 st.set_page_config(page_title="NBA Games", page_icon="🏀", layout="wide")
 st.title("🏀 NBA — Jogos Recentes (Banco + API)")
@@ -25,20 +24,7 @@ st.title("🏀 NBA — Jogos Recentes (Banco + API)")
 @st.cache_data(ttl=300)  # 5 min
 def load_from_db() -> pd.DataFrame:
     create_all()
-    with SessionLocal() as s:
-        rows = s.execute(select(NBAGame)).scalars().all()
-    if not rows:
-        return pd.DataFrame(columns=["game_id","date","home_team","visitor_team","home_score","visitor_score","season"])
-    df = pd.DataFrame([{
-        "game_id": r.game_id,
-        "date": pd.to_datetime(r.date),
-        "home_team": r.home_team,
-        "visitor_team": r.visitor_team,
-        "home_score": r.home_score,
-        "visitor_score": r.visitor_score,
-        "season": r.season
-    } for r in rows])
-    return df
+    return load_games(["game_id","date","home_team","visitor_team","home_score","visitor_score","season"])
 
 def kpi_block(df: pd.DataFrame):
     c1, c2, c3, c4 = st.columns(4)
@@ -88,7 +74,8 @@ with st.sidebar:
             st.warning("Nenhum jogo retornado pela API.")
         else:
             n = upsert_nba_games(df_new)
-            st.success(f"Upsert concluído: {n} linhas processadas.")
+            update_feature_store(changed_ids=n.changed_ids)
+            st.success(f"Upsert concluído: {n}.")
         st.cache_data.clear()
 
 # aplica filtros
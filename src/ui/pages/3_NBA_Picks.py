@@ -7,7 +7,6 @@ import pandas as pd
 import numpy as np
 import streamlit as st
 from datetime import datetime, timedelta, timezone
-import requests
 
 # 🔧 Corrige import do src
 CURRENT = Path(__file__).resolve()
@@ -18,13 +17,17 @@ for p in (SRC_DIR, ROOT_DIR):
         sys.path.insert(0, str(p))
 
 from src.ml.upcoming import predict_upcoming
-from src.api.odds_api import get_h2h_odds_theodds
+from src.api.odds_aggregator import best_odds
+from src.api.espn_api import get_espn_games
+from src.db.snapshots import load_snapshot
+from src.ml.line_movement import attach_to_picks, materialize as line_movement, move_str
+from src.utils.teams import match_events
 
 # ===============================================
 # CONFIG
 # ===============================================
 st.set_page_config(page_title="💰 ScoreBet — NBA Picks", page_icon="💰", layout="wide")
-st.title("💰 ScoreBet — Picks NBA (Bet365)")
+st.title("💰 ScoreBet — Picks NBA (melhor odd)")
 
 # ===============================================
 # FUNÇÕES AUXILIARES
@@ -43,30 +46,6 @@ def get_team_logo(name):
     code = TEAM_LOGOS.get(str(name).lower(), "nba")
     return f"https://a.espncdn.com/i/teamlogos/nba/500/{code}.png"
 
-def get_espn_games(days_ahead=3):
-    """Busca jogos reais da ESPN (com status real e placares)."""
-    base = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard"
-    all_games = []
-    today = datetime.now(timezone(timedelta(hours=-3)))
-    for i in range(days_ahead):
-        date = (today + timedelta(days=i)).strftime("%Y%m%d")
-        resp = requests.get(f"{base}?dates={date}")
-        if resp.status_code != 200:
-            continue
-        for ev in resp.json().get("events", []):
-            comp = ev.get("competitions", [])[0]
-            home = next(c for c in comp["competitors"] if c["homeAway"] == "home")
-            away = next(c for c in comp["competitors"] if c["homeAway"] == "away")
-            all_games.append({
-                "date": comp["date"],
-                "home_team": home["team"]["displayName"],
-                "away_team": away["team"]["displayName"],
-                "status": comp["status"]["type"]["name"],
-                "home_score": home.get("score"),
-                "away_score": away.get("score"),
-            })
-    return pd.DataFrame(all_games)
-
 # ===============================================
 # DADOS
 # ===============================================
@@ -75,9 +54,12 @@ last_n = 5
 prob_thres = 0.55
 
 try:
-    pred_df = predict_upcoming(days_ahead=days_ahead, last_n=last_n)
-    odds_df = get_h2h_odds_theodds(book="pinnacle", days_to=days_ahead)
-    espn_df = get_espn_games(days_ahead=days_ahead)
+    # snapshots pré-calculados pelo scheduler (src/jobs/scheduler.py); sem eles, busca ao vivo
+    pred_df = load_snapshot("nba_predictions", lambda: predict_upcoming(days_ahead=days_ahead, last_n=last_n))
+    odds_df = load_snapshot("nba_best_odds", lambda: best_odds("nba"))   # melhor preço entre todos os books
+    espn_df = load_snapshot("nba_espn_games", lambda: get_espn_games("nba", days_ahead=days_ahead),
+                            max_age=timedelta(minutes=5))
+    move_df = load_snapshot("nba_line_movement", lambda: line_movement("nba"))
 except Exception as e:
     st.error(f"Erro ao carregar dados: {e}")
     st.stop()
@@ -86,9 +68,9 @@ rename_map = {"team_home": "home_team", "team_away": "away_team", "visitor_team"
 pred_df = pred_df.rename(columns=rename_map)
 odds_df = odds_df.rename(columns=rename_map)
 
-# Merge
-merged = pd.merge(pred_df, odds_df, on=["home_team", "away_team"], how="left")
-merged = pd.merge(merged, espn_df, on=["home_team", "away_team"], how="left", suffixes=("", "_espn"))
+# Merge por time canônico + dia do jogo (cada fonte escreve os nomes do seu jeito)
+merged = match_events(pred_df, odds_df, "nba", suffixes=("", "_odds"), name="nba_odds")
+merged = match_events(merged, espn_df, "nba", suffixes=("_pred", ""), name="nba_espn")
 
 # ===============================================
 # LÓGICA DE PICKS
@@ -105,6 +87,9 @@ merged["color"] = np.where(merged["recommendation"] == "Mandante", "#00C853",
                    np.where(merged["recommendation"] == "Visitante", "#2979FF", "#999999"))
 merged["conf"] = (merged["p_home_win"] - 0.5).abs() * 200
 
+# movimento de linha + CLV do pick contra o fechamento de consenso (odds_history)
+merged = attach_to_picks(merged, move_df)
+
 # ===============================================
 # STATUS REAL (usando ESPN)
 # ===============================================
@@ -131,6 +116,7 @@ for dia in dias:
         away_logo = get_team_logo(r["away_team"])
 
         ev_str = f"{r['ev_best']*100:.1f}%" if pd.notna(r['ev_best']) else "—"
+        clv_str = f"<br><small>CLV: {r['clv']*100:+.1f}%</small>" if pd.notna(r.get("clv", np.nan)) else ""
         side = r["recommendation"]
         conf_val = min(max(r.get("conf", 0), 0), 100)
 
@@ -138,7 +124,8 @@ for dia in dias:
             st.markdown(
                 f"<div style='display:flex;align-items:center;gap:6px;'>"
                 f"<img src='{home_logo}' width='28'> <b>{r['home_team']}</b></div>"
-                f"<div style='margin-left:33px;'>🪙 {r.get('home_odds','—')}</div>",
+                f"<div style='margin-left:33px;'>🪙 {r.get('home_odds','—')} <small style='color:#777;'>{r.get('home_book') or ''}</small></div>"
+                f"<div style='margin-left:33px;'>{move_str(r, 'home')}</div>",
                 unsafe_allow_html=True
             )
 
@@ -154,7 +141,7 @@ for dia in dias:
                 st.markdown(
                     f"<div style='text-align:center;'><b style='color:#00C853;'>🟢 AO VIVO</b><br>"
                     f"<b>{r['home_score']} × {r['away_score']}</b><br>"
-                    f"<small>EV: {ev_str}</small><br>"
+                    f"<small>EV: {ev_str}</small>{clv_str}<br>"
                     f"<small>• Apostar no <b>{side}</b></small>{conf_bar}</div>",
                     unsafe_allow_html=True
                 )
@@ -166,7 +153,7 @@ for dia in dias:
                 st.markdown(
                     f"<div style='text-align:center;'>"
                     f"<b style='color:#D50000;'>🔴 ENCERRADO</b><br>"
-                    f"<b>{r['home_score']} × {r['away_score']}</b><br>{result_text}{conf_bar}</div>",
+                    f"<b>{r['home_score']} × {r['away_score']}</b><br>{result_text}{clv_str}{conf_bar}</div>",
                     unsafe_allow_html=True
                 )
             else:
@@ -181,7 +168,8 @@ for dia in dias:
             st.markdown(
                 f"<div style='display:flex;align-items:center;gap:6px;justify-content:right;'>"
                 f"<b>{r['away_team']}</b> <img src='{away_logo}' width='28'></div>"
-                f"<div style='text-align:right;'>🪙 {r.get('away_odds','—')}</div>",
+                f"<div style='text-align:right;'><small style='color:#777;'>{r.get('away_book') or ''}</small> 🪙 {r.get('away_odds','—')}</div>"
+                f"<div style='text-align:right;'>{move_str(r, 'away')}</div>",
                 unsafe_allow_html=True
             )
 
@@ -3,8 +3,9 @@
 # ============================================================
 import streamlit as st
 import pandas as pd
-import requests
+from src.utils import http
 from src.api.odds_players_api_free import get_player_props_data
+from src.db.snapshots import load_snapshot
 
 st.set_page_config(page_title="Player Picks", layout="wide")
 st.title("🏀 Sugestões de Player Picks")
@@ -12,7 +13,7 @@ st.title("🏀 Sugestões de Player Picks")
 # ============================================================
 # Carrega dados simulados
 # ============================================================
-df = get_player_props_data()
+df = load_snapshot("nba_player_props", get_player_props_data)
 
 if df is None or df.empty:
     st.warning("Nenhum dado de player props disponível no momento (as casas podem não ter aberto ainda).")
@@ -25,7 +26,7 @@ if df is None or df.empty:
 def get_player_image(player_name):
     try:
         url = f"https://www.thesportsdb.com/api/v1/json/3/searchplayers.php?p={player_name.replace(' ', '_')}"
-        res = requests.get(url, timeout=10)
+        res = http.get(url, timeout=10)
         data = res.json()
         if data and data.get("player"):
             player = data["player"][0]
@@ -1,13 +1,14 @@
 import streamlit as st
 import pandas as pd
 from src.api.nfl_games_api import get_nfl_games_data
+from src.db.snapshots import load_snapshot
 
 st.set_page_config(page_title="NFL Games", layout="wide")
 
 st.title("🏈 NFL: Jogos por Semana")
 
 # Carrega os jogos
-df = get_nfl_games_data()
+df = load_snapshot("nfl_games", get_nfl_games_data)
 
 if df is None or df.empty:
     st.warning("Nenhum jogo disponível no momento.")
@@ -3,7 +3,7 @@
 # ============================================================
 import streamlit as st
 import pandas as pd
-import requests
+from src.utils import http
 from src.api.odds_players_api_nfl import get_player_props_data_nfl
 
 st.set_page_config(page_title="NFL Player Picks", layout="wide")
@@ -51,7 +51,7 @@ if "home_team" not in df.columns or "away_team" not in df.columns:
 def get_player_image(player_name):
     try:
         url = f"https://www.thesportsdb.com/api/v1/json/3/searchplayers.php?p={player_name.replace(' ', '_')}"
-        res = requests.get(url, timeout=10)
+        res = http.get(url, timeout=10)
         data = res.json()
         if data and data.get("player"):
             player = data["player"][0]
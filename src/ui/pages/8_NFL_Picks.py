@@ -6,8 +6,7 @@ from pathlib import Path
 import pandas as pd
 import numpy as np
 import streamlit as st
-from datetime import datetime, timedelta, timezone
-import requests
+from datetime import datetime, timedelta
 
 # Caminhos padrão do projeto
 CURRENT = Path(__file__).resolve()
@@ -18,6 +17,10 @@ for p in (SRC_DIR, ROOT_DIR):
         sys.path.insert(0, str(p))
 
 from src.api.nfl_picks_api import get_nfl_picks_data
+from src.api.espn_api import get_espn_games
+from src.db.snapshots import load_snapshot
+from src.ml.line_movement import attach_to_picks, materialize as line_movement, move_str
+from src.utils.teams import match_events
 
 # ===============================================
 # CONFIGURAÇÕES GERAIS
@@ -46,34 +49,6 @@ def get_team_logo(name: str) -> str:
     code = TEAM_LOGOS.get(str(name).lower(), "nfl")
     return f"https://a.espncdn.com/i/teamlogos/nfl/500/{code}.png"
 
-def get_espn_games(days_ahead: int = 5) -> pd.DataFrame:
-    """Busca jogos reais da NFL via ESPN API"""
-    base = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
-    all_games = []
-    today = datetime.now(timezone(timedelta(hours=-3)))
-
-    for i in range(days_ahead):
-        date = (today + timedelta(days=i)).strftime("%Y%m%d")
-        resp = requests.get(f"{base}?dates={date}")
-        if resp.status_code != 200:
-            continue
-
-        for ev in resp.json().get("events", []):
-            comp = ev.get("competitions", [])[0]
-            home = next(c for c in comp["competitors"] if c["homeAway"] == "home")
-            away = next(c for c in comp["competitors"] if c["homeAway"] == "away")
-
-            all_games.append({
-                "date": comp.get("date"),
-                "home_team": home["team"]["displayName"],
-                "away_team": away["team"]["displayName"],
-                "status": comp["status"]["type"]["name"],
-                "home_score": home.get("score"),
-                "away_score": away.get("score"),
-            })
-
-    return pd.DataFrame(all_games)
-
 # ===============================================
 # DADOS
 # ===============================================
@@ -81,8 +56,11 @@ days_ahead = 5
 prob_thres = 0.55
 
 try:
-    pred_df = get_nfl_picks_data()
-    espn_df = get_espn_games(days_ahead=days_ahead)
+    # snapshots pré-calculados pelo scheduler (src/jobs/scheduler.py); sem eles, busca ao vivo
+    pred_df = load_snapshot("nfl_picks_odds", get_nfl_picks_data)
+    espn_df = load_snapshot("nfl_espn_games", lambda: get_espn_games("nfl", days_ahead=days_ahead),
+                            max_age=timedelta(minutes=5))
+    move_df = load_snapshot("nfl_line_movement", lambda: line_movement("nfl"))
 except Exception as e:
     st.error(f"Erro ao carregar dados: {e}")
     st.stop()
@@ -109,7 +87,7 @@ rename_map = {
 pred_df = pred_df.rename(columns=rename_map)
 
 # Merge ESPN + modelo
-merged = pd.merge(pred_df, espn_df, on=["home_team", "away_team"], how="left")
+merged = match_events(pred_df, espn_df, "nfl", suffixes=("_pred", ""), name="nfl_espn")
 
 # ===============================================
 # LÓGICA DE PICKS
@@ -126,6 +104,9 @@ merged["color"] = np.where(merged["recommendation"] == "Mandante", "#00C853",
                    np.where(merged["recommendation"] == "Visitante", "#2979FF", "#999999"))
 merged["conf"] = (merged[["p_home_win", "p_away_win"]].max(axis=1) - 0.5) * 200
 
+# movimento de linha + CLV do pick contra o fechamento de consenso (odds_history)
+merged = attach_to_picks(merged, move_df, "nfl")
+
 # ===============================================
 # DATAS E STATUS
 # ===============================================
@@ -157,6 +138,7 @@ else:
             home_logo = get_team_logo(r["home_team"])
             away_logo = get_team_logo(r["away_team"])
             ev_str = f"{r['ev_best']*100:.1f}%" if pd.notna(r['ev_best']) else "—"
+            clv_str = f"<br><small>CLV: {r['clv']*100:+.1f}%</small>" if pd.notna(r.get("clv", np.nan)) else ""
             side = r["recommendation"]
             conf_val = min(max(r.get("conf", 0), 0), 100)
 
@@ -165,7 +147,8 @@ else:
                 st.markdown(
                     f"<div style='display:flex;align-items:center;gap:6px;'>"
                     f"<img src='{home_logo}' width='32'> <b>{r['home_team']}</b></div>"
-                    f"<div style='margin-left:38px;'>🪙 {r.get('home_odds','—')}</div>",
+                    f"<div style='margin-left:38px;'>🪙 {r.get('home_odds','—')}</div>"
+                    f"<div style='margin-left:38px;'>{move_str(r, 'home')}</div>",
                     unsafe_allow_html=True
                 )
 
@@ -188,7 +171,7 @@ else:
                     st.markdown(
                         f"<div style='text-align:center;'><b style='color:#00C853;'>🟢 AO VIVO</b><br>"
                         f"<b>{r.get('home_score','-')} × {r.get('away_score','-')}</b><br>"
-                        f"<small>EV: {ev_str}</small><br>"
+                        f"<small>EV: {ev_str}</small>{clv_str}<br>"
                         f"<small>• Apostar no <b>{side}</b></small>{conf_bar}</div>",
                         unsafe_allow_html=True
                     )
@@ -200,7 +183,7 @@ else:
                     st.markdown(
                         f"<div style='text-align:center;'>"
                         f"<b style='color:#D50000;'>🔴 ENCERRADO</b><br>"
-                        f"<b>{r.get('home_score','-')} × {r.get('away_score','-')}</b><br>{result_text}{conf_bar}</div>",
+                        f"<b>{r.get('home_score','-')} × {r.get('away_score','-')}</b><br>{result_text}{clv_str}{conf_bar}</div>",
                         unsafe_allow_html=True
                     )
                 else:
@@ -216,7 +199,8 @@ else:
                 st.markdown(
                     f"<div style='display:flex;align-items:center;gap:6px;justify-content:right;'>"
                     f"<b>{r['away_team']}</b> <img src='{away_logo}' width='32'></div>"
-                    f"<div style='text-align:right;'>🪙 {r.get('away_odds','—')}</div>",
+                    f"<div style='text-align:right;'>🪙 {r.get('away_odds','—')}</div>"
+                    f"<div style='text-align:right;'>{move_str(r, 'away')}</div>",
                     unsafe_allow_html=True
                 )
 
@@ -10,6 +10,32 @@ class Settings(BaseModel):
     ODDS_API_KEY: str | None = os.getenv("ODDS_API_KEY")
     API_SPORTS_KEY: str | None = os.getenv("API_SPORTS_KEY")  # <-- ADICIONE ESTA LINHA
     DB_URL: str = os.getenv("DB_URL", "sqlite:///scorebet.db")
+    DB_READ_URL: str | None = os.getenv("DB_READ_URL")   # réplica de leitura (padrão: DB_URL)
+
+    # pool e pragmas do banco (src/db/setup.py)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_BUSY_TIMEOUT_MS: int = int(os.getenv("DB_BUSY_TIMEOUT_MS", "15000"))
+    DB_CACHE_MB: int = int(os.getenv("DB_CACHE_MB", "64"))
+    DB_MMAP_MB: int = int(os.getenv("DB_MMAP_MB", "256"))
+
+    # cliente HTTP compartilhado (src/utils/http.py)
+    HTTP_TIMEOUT: float = float(os.getenv("HTTP_TIMEOUT", "20"))
+    HTTP_MAX_RETRIES: int = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+    HTTP_BACKOFF: float = float(os.getenv("HTTP_BACKOFF", "0.5"))
+    HTTP_POOL_SIZE: int = int(os.getenv("HTTP_POOL_SIZE", "10"))
+    HTTP_CACHE_DIR: str = os.getenv("HTTP_CACHE_DIR", ".cache/http")
+
+    # The Odds API: créditos mínimos a preservar / abaixo disso agrupa mercados
+    ODDS_QUOTA_RESERVE: int = int(os.getenv("ODDS_QUOTA_RESERVE", "25"))
+    ODDS_QUOTA_LOW: int = int(os.getenv("ODDS_QUOTA_LOW", "150"))
+    ODDS_QUOTA_FILE: str = os.getenv("ODDS_QUOTA_FILE", ".cache/odds_quota.json")
+
+    # balldontlie: páginas em paralelo respeitando o limite do plano
+    # limite do plano (Free 5, ALL-STAR 60, GOAT 600 req/min); burst = pedidos sem espera
+    BDL_RATE_LIMIT: float = float(os.getenv("BDL_RATE_LIMIT", "60"))  # req/min
+    BDL_RATE_BURST: float = float(os.getenv("BDL_RATE_BURST", os.getenv("BDL_RATE_LIMIT", "60")))
+    BDL_MAX_WORKERS: int = int(os.getenv("BDL_MAX_WORKERS", "4"))
 
 settings = Settings()
 
@@ -1,9 +1,5 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from src.utils.config import settings
-
-engine = create_engine(settings.DB_URL, echo=False)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Compatibilidade: o engine e as sessões são os de src/db/setup.py (um único pool por processo).
+from src.db.setup import ReadSession, SessionLocal, engine, read_engine
 
 def get_db():
     """Fornece uma sessão de banco de dados para operações locais."""
@@ -0,0 +1,302 @@
+# scorebet/src/utils/http.py
+"""
+Cliente HTTP compartilhado por todos os fetchers de src/api (e páginas da UI).
+
+- Uma única requests.Session por processo: o urllib3 mantém um pool keep-alive
+  por host, então chamadas repetidas não pagam um novo handshake TCP+TLS.
+- Timeout padrão configurável (settings.HTTP_TIMEOUT), sobrescrevível por chamada.
+- Retry com backoff exponencial + jitter em 429/5xx e erros de conexão
+  (respeita Retry-After quando numérico).
+- Métricas de latência por host (chamadas, erros, retries, média/máx em ms).
+- Cache opcional de respostas (get(..., cache=True)), ver src/utils/http_cache.py.
+"""
+from __future__ import annotations
+
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Hashable, Iterable, TypeVar
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.utils.config import settings
+from src.utils.http_cache import ResponseCache, rule_for
+from src.utils.logger import get_logger
+
+logger = get_logger("http")
+
+T = TypeVar("T")
+
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+MAX_BACKOFF = 10.0
+
+
+@dataclass
+class HostStats:
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_ms: float = 0.0
+    last_status: int | None = None
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+class HttpClient:
+    """Wrapper fino sobre requests.Session com pools por host, retry e métricas."""
+
+    def __init__(
+        self,
+        timeout: float | None = None,
+        max_retries: int | None = None,
+        backoff: float | None = None,
+        pool_maxsize: int | None = None,
+    ):
+        self.timeout = settings.HTTP_TIMEOUT if timeout is None else timeout
+        self.max_retries = settings.HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff = settings.HTTP_BACKOFF if backoff is None else backoff
+        pool_maxsize = settings.HTTP_POOL_SIZE if pool_maxsize is None else pool_maxsize
+
+        self.session = requests.Session()
+        # pool_connections = nº de hosts mantidos em cache; pool_maxsize = conexões por host
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._stats: dict[str, HostStats] = {}
+        self._lock = threading.Lock()
+        self._cache: ResponseCache | None = None
+
+    @property
+    def cache(self) -> ResponseCache:
+        if self._cache is None:
+            with self._lock:
+                if self._cache is None:
+                    self._cache = ResponseCache()
+        return self._cache
+
+    # --- métricas ------------------------------------------------------------
+
+    def _record(self, host: str, elapsed_ms: float, status: int | None, error: bool, retry: bool) -> None:
+        with self._lock:
+            st = self._stats.setdefault(host, HostStats())
+            st.calls += 1
+            st.total_ms += elapsed_ms
+            st.last_ms = elapsed_ms
+            st.max_ms = max(st.max_ms, elapsed_ms)
+            st.last_status = status
+            if error:
+                st.errors += 1
+            if retry:
+                st.retries += 1
+
+    def stats(self) -> dict[str, dict]:
+        """Snapshot das métricas por host (dict serializável)."""
+        with self._lock:
+            return {h: {**asdict(s), "avg_ms": round(s.avg_ms, 1)} for h, s in self._stats.items()}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    # --- requisições -----------------------------------------------------------
+
+    def _sleep_before_retry(self, attempt: int, resp: requests.Response | None) -> None:
+        delay = None
+        if resp is not None:
+            retry_after = resp.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = min(float(retry_after), MAX_BACKOFF)
+        if delay is None:
+            # "full jitter": espalha os retries de clientes concorrentes
+            delay = random.uniform(0, min(MAX_BACKOFF, self.backoff * (2 ** attempt)))
+        time.sleep(delay)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        timeout: float | tuple[float, float] | None = None,
+        retries: int | None = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        Executa a requisição com retry em 429/5xx e erros de conexão.
+        Esgotadas as tentativas, devolve a última resposta (o chamador decide
+        com raise_for_status) ou relança a última exceção de rede.
+        """
+        host = urlsplit(url).netloc
+        timeout = self.timeout if timeout is None else timeout
+        retries = self.max_retries if retries is None else retries
+
+        for attempt in range(retries + 1):
+            last = attempt == retries
+            t0 = time.perf_counter()
+            try:
+                resp = self.session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                elapsed = (time.perf_counter() - t0) * 1000
+                self._record(host, elapsed, None, error=True, retry=not last)
+                if last:
+                    raise
+                logger.warning(f"[http] {host} falhou ({type(e).__name__}), tentativa {attempt + 1}/{retries + 1}")
+                self._sleep_before_retry(attempt, None)
+                continue
+
+            elapsed = (time.perf_counter() - t0) * 1000
+            retry = resp.status_code in RETRY_STATUS and not last
+            self._record(host, elapsed, resp.status_code, error=resp.status_code >= 400, retry=retry)
+            logger.debug(f"[http] {method} {host} {resp.status_code} {elapsed:.0f}ms")
+            if not retry:
+                return resp
+
+            logger.warning(f"[http] {host} HTTP {resp.status_code}, tentativa {attempt + 1}/{retries + 1}")
+            self._sleep_before_retry(attempt, resp)
+
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def get(
+        self,
+        url: str,
+        *,
+        cache: bool = False,
+        cache_ttl: float | None = None,
+        stale_ttl: float | None = None,
+        send: Callable[..., requests.Response] | None = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        GET com retry. Com `cache=True` (ou `cache_ttl`) passa pelo cache de
+        respostas; TTLs não informados vêm de http_cache.CACHE_RULES.
+        O header X-Cache da resposta indica HIT/STALE/MISS/REVALIDATED.
+        `send(url, **kw)` substitui o GET de rede (inclusive nas revalidações
+        em segundo plano) — ex.: odds_quota.odds_get contabilizando créditos.
+        """
+        send = send or (lambda u, **kw: self.request("GET", u, **kw))
+        if not cache and cache_ttl is None:
+            return send(url, **kwargs)
+
+        rule_ttl, rule_stale = rule_for(url)
+        return self.cache.get(
+            url,
+            send,
+            ttl=rule_ttl if cache_ttl is None else cache_ttl,
+            stale_ttl=rule_stale if stale_ttl is None else stale_ttl,
+            **kwargs,
+        )
+
+
+# --- cliente padrão do processo ------------------------------------------------
+
+_client: HttpClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """Retorna o cliente compartilhado (criado sob demanda, um por processo)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    """Atalho para get_client().get(...) — mesma assinatura de requests.get."""
+    return get_client().get(url, **kwargs)
+
+
+def stats() -> dict[str, dict]:
+    return get_client().stats()
+
+
+def cache_stats() -> dict[str, int]:
+    """Contadores do cache de respostas (hits, stale_hits, misses, revalidated...)."""
+    return asdict(get_client().cache.stats)
+
+
+# --- limite de taxa ---------------------------------------------------------------
+
+class RateLimiter:
+    """
+    Token bucket (thread-safe): até `burst` chamadas saem na hora e o saldo
+    repõe `per_minute` por minuto. burst=1 só espaça as chamadas por igual.
+    Use como context manager ou chame acquire() antes do request.
+    """
+
+    def __init__(self, per_minute: float, burst: float = 1):
+        self.rate = per_minute / 60.0 if per_minute and per_minute > 0 else 0.0   # fichas/s
+        self.capacity = max(1.0, float(burst))
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= 1
+            # saldo negativo = ficha reservada no futuro; cada thread espera a sua
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay > 0:
+            time.sleep(delay)
+
+    def __enter__(self) -> "RateLimiter":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+# --- fan-out concorrente --------------------------------------------------------
+
+def gather(
+    tasks: Iterable[tuple[Hashable, Callable[[], T]]],
+    max_workers: int = 4,
+    deadline: float | None = None,
+) -> dict[Hashable, T | BaseException]:
+    """
+    Executa `tasks` (pares chave -> função sem argumentos) em paralelo, com no
+    máximo `max_workers` simultâneas e um prazo global de `deadline` segundos.
+
+    Retorna {chave: resultado | exceção}, na ordem das tarefas. Tarefas que não
+    terminam dentro do prazo recebem TimeoutError e não são aguardadas.
+    """
+    tasks = list(tasks)
+    if not tasks:
+        return {}
+
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks))), thread_name_prefix="http")
+    futures = {pool.submit(fn): key for key, fn in tasks}
+    results: dict[Hashable, T | BaseException] = {}
+    end = None if deadline is None else time.monotonic() + deadline
+    try:
+        pending = set(futures)
+        while pending:
+            timeout = None if end is None else max(0.0, end - time.monotonic())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break  # prazo global estourado
+            for fut in done:
+                exc = fut.exception()
+                results[futures[fut]] = exc if exc is not None else fut.result()
+        for fut in pending:
+            results[futures[fut]] = TimeoutError(f"prazo de {deadline}s excedido")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return {key: results[key] for key, _ in tasks}
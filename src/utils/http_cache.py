@@ -0,0 +1,235 @@
+# scorebet/src/utils/http_cache.py
+"""
+Cache de respostas HTTP (memória + disco) usado por src/utils/http.py.
+
+- Chave = URL + params (ordenados); o conteúdo fica em memória (LRU) e em
+  disco (settings.HTTP_CACHE_DIR), então sobrevive a reruns e restarts.
+- TTL por endpoint (CACHE_RULES, por host/prefixo de caminho) ou explícito.
+- Revalidação condicional (If-None-Match / If-Modified-Since) quando o
+  servidor mandou ETag/Last-Modified: um 304 só renova o carimbo.
+- Stale-while-revalidate: dentro da janela `stale_ttl` a resposta velha é
+  devolvida na hora e a atualização roda numa thread em segundo plano.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from src.utils.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger("http_cache")
+
+# (host, prefixo do caminho) -> (ttl, stale_ttl) em segundos; o prefixo mais longo vence
+CACHE_RULES: dict[tuple[str, str], tuple[float, float]] = {
+    ("site.api.espn.com", ""): (30, 300),          # placar ao vivo: curto
+    ("api.the-odds-api.com", ""): (300, 1800),     # cobrado por request
+    ("api.balldontlie.io", ""): (600, 3600),
+    ("v1.american-football.api-sports.io", ""): (1800, 6 * 3600),
+    ("v1.odds.api-sports.io", ""): (300, 1800),
+    ("www.thesportsdb.com", ""): (24 * 3600, 7 * 24 * 3600),
+}
+DEFAULT_RULE = (60.0, 300.0)
+
+
+def rule_for(url: str) -> tuple[float, float]:
+    parts = urlsplit(url)
+    best, best_len = DEFAULT_RULE, -1
+    for (host, prefix), rule in CACHE_RULES.items():
+        if parts.netloc == host and parts.path.startswith(prefix) and len(prefix) > best_len:
+            best, best_len = rule, len(prefix)
+    return best
+
+
+def cache_key(url: str, params: Any = None) -> str:
+    if isinstance(params, dict):
+        items = sorted((str(k), str(v)) for k, v in params.items())
+    else:
+        items = sorted((str(k), str(v)) for k, v in (params or []))
+    raw = url + "?" + "&".join(f"{k}={v}" for k, v in items)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    status_code: int
+    headers: dict
+    content: bytes
+    stored_at: float = field(default_factory=time.time)
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    @property
+    def etag(self) -> str | None:
+        return self.headers.get("ETag") or self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> str | None:
+        return self.headers.get("Last-Modified") or self.headers.get("last-modified")
+
+    def to_response(self, cache_status: str) -> requests.Response:
+        r = requests.Response()
+        r.status_code = self.status_code
+        r._content = self.content
+        r.headers = CaseInsensitiveDict(self.headers)
+        r.headers["X-Cache"] = cache_status
+        r.url = self.url
+        r.reason = "OK"
+        r.encoding = get_encoding_from_headers(r.headers)
+        return r
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    revalidated: int = 0     # 304 Not Modified
+    refreshes: int = 0       # revalidações em segundo plano disparadas
+    errors: int = 0
+
+
+class ResponseCache:
+    def __init__(self, directory: str | Path | None = None, max_memory: int = 256):
+        self.directory = Path(directory or settings.HTTP_CACHE_DIR)
+        self.max_memory = max_memory
+        self._mem: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: set[str] = set()
+        self._bg = ThreadPoolExecutor(max_workers=2, thread_name_prefix="http-cache")
+        self.stats = CacheStats()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+    # --- armazenamento --------------------------------------------------------------
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pkl"
+
+    def load(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                self._mem.move_to_end(key)
+                return entry
+        try:
+            with open(self._path(key), "rb") as fh:
+                entry = pickle.load(fh)
+        except (OSError, pickle.PickleError, EOFError, AttributeError):
+            return None
+        self._remember(key, entry)
+        return entry
+
+    def store(self, key: str, entry: CachedResponse) -> None:
+        # disco primeiro: quem enxergar a entrada nova em memória já a encontra no disco
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = self._path(key).with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "wb") as fh:
+                pickle.dump(entry, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except OSError as e:
+            logger.warning(f"[http_cache] falha ao gravar em disco: {e}")
+        self._remember(key, entry)
+
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._mem[key] = entry
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_memory:
+                self._mem.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+        for p in self.directory.glob("*.pkl"):
+            p.unlink(missing_ok=True)
+
+    # --- fluxo de leitura -------------------------------------------------------------
+
+    def _fetch(self, key: str, url: str, entry: CachedResponse | None,
+               send: Callable[..., requests.Response], kwargs: dict) -> requests.Response:
+        """GET (condicional quando possível) e atualização do cache."""
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        resp = send(url, headers=headers, **kwargs)
+        if resp.status_code == 304 and entry is not None:
+            self._count("revalidated")
+            entry.stored_at = time.time()
+            self.store(key, entry)
+            return entry.to_response("REVALIDATED")
+
+        if resp.status_code == 200:
+            self.store(key, CachedResponse(
+                url=url,
+                status_code=200,
+                headers=dict(resp.headers),
+                content=resp.content,
+            ))
+        resp.headers["X-Cache"] = "MISS"
+        return resp
+
+    def _refresh_in_background(self, key: str, url: str, entry: CachedResponse,
+                               send: Callable[..., requests.Response], kwargs: dict) -> None:
+        with self._lock:
+            if key in self._inflight:
+                return
+            self._inflight.add(key)
+        self._count("refreshes")
+
+        def job():
+            try:
+                self._fetch(key, url, entry, send, dict(kwargs))
+            except Exception as e:
+                self._count("errors")
+                logger.warning(f"[http_cache] revalidação falhou para {urlsplit(url).netloc}: {e}")
+            finally:
+                with self._lock:
+                    self._inflight.discard(key)
+
+        self._bg.submit(job)
+
+    def peek(self, url: str, params: Any = None) -> requests.Response | None:
+        """Última resposta guardada para url+params, de qualquer idade (sem ir à rede)."""
+        entry = self.load(cache_key(url, params))
+        return None if entry is None else entry.to_response("STALE")
+
+    def get(self, url: str, send: Callable[..., requests.Response], ttl: float, stale_ttl: float,
+            **kwargs: Any) -> requests.Response:
+        key = cache_key(url, kwargs.get("params"))
+        entry = self.load(key)
+
+        if entry is not None and entry.age < ttl:
+            self._count("hits")
+            return entry.to_response("HIT")
+
+        if entry is not None and entry.age < ttl + stale_ttl:
+            self._count("stale_hits")
+            self._refresh_in_background(key, url, entry, send, kwargs)
+            return entry.to_response("STALE")
+
+        self._count("misses")
+        return self._fetch(key, url, entry, send, kwargs)
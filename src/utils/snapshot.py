@@ -0,0 +1,73 @@
+# scorebet/src/utils/snapshot.py
+"""
+Snapshot compartilhado pelo processo inteiro (todas as sessões do Streamlit).
+
+O loader roda no máximo uma vez por `ttl`, não importa quantos viewers
+estejam conectados: quando o dado vence, a primeira thread que chega
+atualiza e as demais continuam recebendo a versão anterior sem bloquear.
+Só a primeira carga (ainda sem valor) faz todo mundo esperar.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Generic, TypeVar
+
+from src.utils.logger import get_logger
+
+T = TypeVar("T")
+logger = get_logger("snapshot")
+
+_MISSING = object()
+
+
+class SharedSnapshot(Generic[T]):
+    def __init__(self, loader: Callable[[], T], ttl: float, name: str = "snapshot"):
+        self.loader = loader
+        self.ttl = ttl
+        self.name = name
+        self._value: T | object = _MISSING
+        self._loaded_at = 0.0          # monotonic, para o TTL
+        self.refreshed_at: datetime | None = None
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        t0 = time.perf_counter()
+        try:
+            value = self.loader()
+        except Exception as e:
+            logger.error(f"[{self.name}] falha ao atualizar: {e}")
+            self._loaded_at = time.monotonic()   # não martela a API; tenta de novo no próximo ciclo
+            if self._value is _MISSING:
+                raise
+            return
+        self._value = value
+        self._loaded_at = time.monotonic()
+        self.refreshed_at = datetime.now()
+        logger.info(f"[{self.name}] atualizado em {(time.perf_counter() - t0) * 1000:.0f}ms")
+
+    def _expired(self) -> bool:
+        return time.monotonic() - self._loaded_at >= self.ttl
+
+    def get(self) -> T:
+        if self._value is not _MISSING and not self._expired():
+            return self._value  # type: ignore[return-value]
+
+        if self._value is _MISSING:
+            with self._lock:
+                if self._value is _MISSING:
+                    self._refresh()
+            return self._value  # type: ignore[return-value]
+
+        # vencido: só quem pega o lock atualiza; os outros seguem com o valor atual
+        if self._lock.acquire(blocking=False):
+            try:
+                if self._expired():
+                    self._refresh()
+            finally:
+                self._lock.release()
+        return self._value  # type: ignore[return-value]
+
+    def invalidate(self) -> None:
+        self._loaded_at = 0.0
@@ -0,0 +1,201 @@
+# scorebet/src/utils/teams.py
+"""
+Registro canônico de times e casamento de eventos entre fontes.
+
+Cada time tem um id canônico (sigla) e um nome canônico; a tabela de
+aliases cobre como ESPN, balldontlie, The Odds API, 1xBet e a API de picks
+da NFL escrevem o mesmo time ("LA Clippers", "Los Angeles Clippers", "LAC",
+"Clippers"...). A busca é um dict por nome normalizado, O(1), sem
+varredura de substring.
+
+match_events() substitui o pd.merge exato por nome: casa por (id mandante,
+id visitante) e, quando os dois lados têm data, exige que o dia do jogo
+(ET) esteja a no máximo `days` de distância. Linhas sem par ficam no
+resultado e são contadas no log, nunca somem em silêncio.
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Tuple
+
+import pandas as pd
+
+from src.utils.logger import get_logger
+
+logger = get_logger("teams")
+
+# id: (nome canônico, aliases além do nome, do apelido e do id)
+NBA_TEAMS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "ATL": ("Atlanta Hawks", ()),
+    "BOS": ("Boston Celtics", ()),
+    "BKN": ("Brooklyn Nets", ("BRK", "BKN Nets")),
+    "CHA": ("Charlotte Hornets", ("CHO",)),
+    "CHI": ("Chicago Bulls", ()),
+    "CLE": ("Cleveland Cavaliers", ("Cavs",)),
+    "DAL": ("Dallas Mavericks", ("Mavs",)),
+    "DEN": ("Denver Nuggets", ()),
+    "DET": ("Detroit Pistons", ()),
+    "GSW": ("Golden State Warriors", ("GS", "GS Warriors")),
+    "HOU": ("Houston Rockets", ()),
+    "IND": ("Indiana Pacers", ()),
+    "LAC": ("Los Angeles Clippers", ("LA Clippers", "L.A. Clippers")),
+    "LAL": ("Los Angeles Lakers", ("LA Lakers", "L.A. Lakers")),
+    "MEM": ("Memphis Grizzlies", ()),
+    "MIA": ("Miami Heat", ()),
+    "MIL": ("Milwaukee Bucks", ()),
+    "MIN": ("Minnesota Timberwolves", ("Wolves",)),
+    "NOP": ("New Orleans Pelicans", ("NO", "NOR")),
+    "NYK": ("New York Knicks", ("NY", "NY Knicks")),
+    "OKC": ("Oklahoma City Thunder", ("OKC Thunder",)),
+    "ORL": ("Orlando Magic", ()),
+    "PHI": ("Philadelphia 76ers", ("Sixers", "Philadelphia Sixers")),
+    "PHX": ("Phoenix Suns", ("PHO",)),
+    "POR": ("Portland Trail Blazers", ("Blazers", "Trail Blazers", "Portland Trailblazers")),
+    "SAC": ("Sacramento Kings", ()),
+    "SAS": ("San Antonio Spurs", ("SA",)),
+    "TOR": ("Toronto Raptors", ()),
+    "UTA": ("Utah Jazz", ("UTAH",)),
+    "WAS": ("Washington Wizards", ("WSH",)),
+}
+
+NFL_TEAMS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "ARI": ("Arizona Cardinals", ()),
+    "ATL": ("Atlanta Falcons", ()),
+    "BAL": ("Baltimore Ravens", ()),
+    "BUF": ("Buffalo Bills", ()),
+    "CAR": ("Carolina Panthers", ()),
+    "CHI": ("Chicago Bears", ()),
+    "CIN": ("Cincinnati Bengals", ()),
+    "CLE": ("Cleveland Browns", ()),
+    "DAL": ("Dallas Cowboys", ()),
+    "DEN": ("Denver Broncos", ()),
+    "DET": ("Detroit Lions", ()),
+    "GB": ("Green Bay Packers", ("GNB",)),
+    "HOU": ("Houston Texans", ()),
+    "IND": ("Indianapolis Colts", ()),
+    "JAX": ("Jacksonville Jaguars", ("JAC", "Jags")),
+    "KC": ("Kansas City Chiefs", ("KAN",)),
+    "LV": ("Las Vegas Raiders", ("LVR", "Oakland Raiders")),
+    "LAC": ("Los Angeles Chargers", ("LA Chargers", "San Diego Chargers")),
+    "LAR": ("Los Angeles Rams", ("LA Rams",)),
+    "MIA": ("Miami Dolphins", ()),
+    "MIN": ("Minnesota Vikings", ()),
+    "NE": ("New England Patriots", ("NWE", "Pats")),
+    "NO": ("New Orleans Saints", ("NOR",)),
+    "NYG": ("New York Giants", ("NY Giants",)),
+    "NYJ": ("New York Jets", ("NY Jets",)),
+    "PHI": ("Philadelphia Eagles", ()),
+    "PIT": ("Pittsburgh Steelers", ()),
+    "SF": ("San Francisco 49ers", ("SFO", "Niners")),
+    "SEA": ("Seattle Seahawks", ()),
+    "TB": ("Tampa Bay Buccaneers", ("TAM", "Bucs")),
+    "TEN": ("Tennessee Titans", ()),
+    "WAS": ("Washington Commanders", ("WSH", "Washington", "Washington Football Team")),
+}
+
+LEAGUES = {"nba": NBA_TEAMS, "nfl": NFL_TEAMS}
+
+def normalize(name) -> str:
+    if name is None or (isinstance(name, float) and name != name):
+        return ""
+    s = str(name).lower().strip()
+    s = re.sub(r"[^a-z0-9 ]+", "", s)
+    return re.sub(r"\s+", " ", s)
+
+def _build_aliases(teams: Dict[str, Tuple[str, Tuple[str, ...]]]) -> Dict[str, str]:
+    out: Dict[str, str] = {}
+    for tid, (full, extra) in teams.items():
+        nickname = full.split(" ")[-1]              # "Lakers", "49ers", "Blazers"
+        for alias in (tid, full, nickname, *extra):
+            out.setdefault(normalize(alias), tid)
+    return out
+
+_ALIASES: Dict[str, Dict[str, str]] = {lg: _build_aliases(t) for lg, t in LEAGUES.items()}
+
+@lru_cache(maxsize=4096)
+def team_id(name, league: str = "nba") -> str | None:
+    """Id canônico do time (ex.: "LAC") ou None se o nome não estiver no registro."""
+    key = normalize(name)
+    tid = _ALIASES[league].get(key)
+    if tid is None and key:
+        logger.warning(f"[teams] nome sem alias em {league}: {name!r}")
+    return tid
+
+def canonical_name(name, league: str = "nba") -> str:
+    """Nome canônico; nomes fora do registro voltam como vieram."""
+    tid = team_id(name, league)
+    return LEAGUES[league][tid][0] if tid else name
+
+def team_ids(names: pd.Series, league: str = "nba") -> pd.Series:
+    """team_id vetorizado: resolve cada nome distinto uma vez. Sem alias, usa o nome normalizado."""
+    uniq = pd.unique(names.astype(object))
+    table = {n: team_id(n, league) or normalize(n) for n in uniq}
+    return names.map(table)
+
+def canonical_names(names: pd.Series, league: str = "nba") -> pd.Series:
+    """canonical_name vetorizado; liga fora do registro devolve os nomes intactos."""
+    if league not in LEAGUES:
+        return names
+    uniq = pd.unique(names.astype(object))
+    return names.map({n: canonical_name(n, league) for n in uniq})
+
+def event_day(s: pd.Series) -> pd.Series:
+    """Dia do jogo em ET; datas sem fuso (ex.: "2024-11-01") já são a data local."""
+    d = pd.to_datetime(s, errors="coerce", utc=False)
+    if d.dt.tz is not None:
+        d = d.dt.tz_convert("America/New_York").dt.tz_localize(None)
+    return d.dt.normalize()
+
+def match_events(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    league: str = "nba",
+    teams: Iterable[str] = ("home_team", "away_team"),
+    right_teams: Iterable[str] | None = None,
+    date_col: str | None = "date",
+    days: int = 1,
+    suffixes: Tuple[str, str] = ("_x", "_y"),
+    name: str = "match",
+) -> pd.DataFrame:
+    """
+    Left join de `right` em `left` pelo jogo (ids canônicos dos dois times e,
+    se ambos tiverem `date_col`, dia ET a até `days` de distância; vence o
+    mais próximo). As colunas de time de `left` são mantidas como vieram.
+    """
+    home, away = teams
+    r_home, r_away = right_teams or teams
+    if right is None or right.empty:
+        return left.copy()
+    if left.empty:
+        return left.copy()
+
+    l = left.reset_index(drop=True)
+    keys = pd.DataFrame({
+        "_row": range(len(l)), "_h": team_ids(l[home], league).values, "_a": team_ids(l[away], league).values,
+    })
+    r = right.reset_index(drop=True).drop(columns=[c for c in (r_home, r_away) if c in (home, away)])
+    r = r.assign(_h=team_ids(right[r_home], league).values, _a=team_ids(right[r_away], league).values)
+
+    pairs = keys.merge(r[["_h", "_a"]].reset_index().rename(columns={"index": "_rrow"}), on=["_h", "_a"])
+    use_dates = date_col and date_col in l.columns and date_col in right.columns
+    if use_dates and not pairs.empty:
+        gap = (event_day(l[date_col]).values[pairs["_row"]] - event_day(right[date_col]).values[pairs["_rrow"]])
+        gap = pd.Series(gap).abs().dt.days
+        pairs = pairs.assign(_gap=gap.values)
+        pairs = pairs[pairs["_gap"].isna() | (pairs["_gap"] <= days)]
+        pairs = pairs.sort_values(["_row", "_gap"], na_position="last")
+    pairs = pairs.drop_duplicates("_row")
+
+    idx = pd.Series(pairs["_rrow"].values, index=pairs["_row"].values).reindex(range(len(l)))
+    matched = r.drop(columns=["_h", "_a"]).reindex(idx.fillna(-1).astype(int).values).reset_index(drop=True)
+    clash = set(l.columns) & set(matched.columns)
+    out = pd.concat([
+        l.rename(columns={c: c + suffixes[0] for c in clash}),
+        matched.rename(columns={c: c + suffixes[1] for c in clash}),
+    ], axis=1)
+
+    missing = int(idx.isna().sum())
+    if missing:
+        logger.info(f"[teams] {name}: {missing}/{len(l)} jogos sem par na outra fonte")
+    return out
@@ -0,0 +1,118 @@
+# >>> INÍCIO: tests/bench_team_roll_stats.py
+"""
+Benchmark de _team_roll_stats: implementação antiga (groupby.apply + 2 merges)
+contra a vetorizada (features.team_roll_stats_multi), em 10 temporadas
+sintéticas (30 times, ~1230 jogos por temporada).
+
+    python tests/bench_team_roll_stats.py [--seasons 10] [--repeat 3]
+"""
+from __future__ import annotations
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.ml.features import _team_roll_stats, team_roll_stats_multi
+
+def legacy_team_roll_stats(games: pd.DataFrame, last_n: int = 5) -> pd.DataFrame:
+    """Cópia da implementação anterior, mantida só como referência."""
+    df = games.copy()
+    df["date"] = pd.to_datetime(df["date"])
+    df = df.sort_values("date")
+
+    home = df[["date","home_team","home_score","visitor_score"]].copy()
+    home.columns = ["date","team","pts","opp"]
+    home["is_home"] = 1
+    away = df[["date","visitor_team","visitor_score","home_score"]].copy()
+    away.columns = ["date","team","pts","opp"]
+    away["is_home"] = 0
+    long = pd.concat([home, away], ignore_index=True)
+    long["win"] = (long["pts"] > long["opp"]).astype(int)
+
+    long = long.sort_values(["team","date"])
+    for col in ["pts","opp","win"]:
+        long[f"r{last_n}_{col}"] = (
+            long.groupby("team")[col]
+                .apply(lambda s: s.shift().rolling(last_n, min_periods=1).mean())
+                .values
+        )
+
+    key = ["team","date"]
+    stats_cols = [f"r{last_n}_pts", f"r{last_n}_opp", f"r{last_n}_win"]
+    stats = long[key + stats_cols]
+
+    m_home = df.merge(stats, left_on=["home_team","date"], right_on=["team","date"], how="left")
+    m_home = m_home.rename(columns={
+        f"r{last_n}_pts": "home_rpts", f"r{last_n}_opp": "home_ropp", f"r{last_n}_win": "home_rwin",
+    }).drop(columns=["team"])
+    m_both = m_home.merge(stats, left_on=["visitor_team","date"], right_on=["team","date"], how="left")
+    m_both = m_both.rename(columns={
+        f"r{last_n}_pts": "away_rpts", f"r{last_n}_opp": "away_ropp", f"r{last_n}_win": "away_rwin",
+    }).drop(columns=["team"])
+    m_both["home_win"] = (m_both["home_score"] > m_both["visitor_score"]).astype(int)
+
+    feat = m_both[[
+        "game_id","date","season","home_team","visitor_team",
+        "home_rpts","home_ropp","home_rwin",
+        "away_rpts","away_ropp","away_rwin",
+        "home_win"
+    ]].copy()
+    feat["diff_rpts"] = feat["home_rpts"] - feat["away_rpts"]
+    feat["diff_ropp"] = feat["home_ropp"] - feat["away_ropp"]
+    feat["diff_rwin"] = feat["home_rwin"] - feat["away_rwin"]
+    return feat.dropna().reset_index(drop=True)
+
+def synthetic_seasons(seasons: int = 10, teams: int = 30, games_per_day: int = 8, seed: int = 0) -> pd.DataFrame:
+    """~1230 jogos por temporada (out->abr), nenhum time joga duas vezes no mesmo dia."""
+    rng = np.random.default_rng(seed)
+    names = np.array([f"Team {i:02d}" for i in range(teams)])
+    rows, gid = [], 1
+    for k in range(seasons):
+        season = 2015 + k
+        for day in pd.date_range(f"{season}-10-20", periods=160, freq="D"):
+            pairs = rng.permutation(teams)[: 2 * games_per_day].reshape(-1, 2)
+            for h, v in pairs:
+                rows.append((gid, day, season, names[h], names[v],
+                             int(rng.integers(85, 135)), int(rng.integers(85, 135))))
+                gid += 1
+    return pd.DataFrame(rows, columns=[
+        "game_id", "date", "season", "home_team", "visitor_team", "home_score", "visitor_score",
+    ])
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seasons", type=int, default=10)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    games = synthetic_seasons(args.seasons)
+    print(f"{len(games)} jogos sintéticos ({args.seasons} temporadas)")
+
+    t_old = {n: _best_of(lambda: legacy_team_roll_stats(games, n), args.repeat) for n in (3, 5, 10)}
+    t_new = {n: _best_of(lambda: _team_roll_stats(games, n), args.repeat) for n in (3, 5, 10)}
+    t_multi = _best_of(lambda: team_roll_stats_multi(games, (3, 5, 10)), args.repeat)
+
+    for n in (3, 5, 10):
+        print(f"last_n={n:>2}: antigo {t_old[n] * 1000:8.1f}ms | vetorizado {t_new[n] * 1000:7.1f}ms "
+              f"| {t_old[n] / t_new[n]:5.1f}x")
+    total_old = sum(t_old.values())
+    print(f"janelas 3+5+10: antigo (3 chamadas) {total_old * 1000:8.1f}ms | passe único {t_multi * 1000:7.1f}ms "
+          f"| {total_old / t_multi:5.1f}x")
+
+if __name__ == "__main__":
+    main()
+# >>> FIM
@@ -0,0 +1,110 @@
+# >>> INÍCIO: tests/bench_upsert.py
+"""
+Benchmark de upsert_nba_games: caminho antigo (_coerce_types com df.copy +
+to_dict(records) + bulk_upsert de dicts) contra o colunar (arrays tipados +
+executemany de tuplas), em jogos sintéticos num SQLite temporário.
+
+Cenários: carga inicial, reenvio sem mudança e reenvio com 10% dos placares
+alterados.
+
+    python tests/bench_upsert.py [--games 100000] [--repeat 3]
+"""
+from __future__ import annotations
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+
+from src.db import upsert_games
+from src.db.bulk_upsert import UpsertResult, bulk_upsert
+from src.db.models import Base, NBAGame
+from src.db.setup import make_engine
+
+def legacy_upsert_nba_games(df: pd.DataFrame, engine) -> UpsertResult:
+    """Cópia do caminho anterior (dict por linha), mantida só como referência."""
+    out = df.copy()
+    out["date"] = pd.to_datetime(out["date"], errors="coerce").dt.date
+    for c in ["game_id", "home_score", "visitor_score", "season"]:
+        out[c] = pd.to_numeric(out[c], errors="coerce").fillna(0).astype(int)
+    for c in ["home_team", "visitor_team"]:
+        out[c] = out[c].astype(str)
+    out = out[upsert_games._BASE_COLS].assign(row_hash=upsert_games.row_hashes(out))
+    rows = list({r["game_id"]: r for r in out.to_dict(orient="records")}.values())
+
+    t = NBAGame.__table__
+    with engine.begin() as conn:
+        stored = {}
+        for i in range(0, len(rows), 32_000):
+            ids = [r["game_id"] for r in rows[i:i + 32_000]]
+            stored.update(conn.execute(select(t.c.game_id, t.c.row_hash).where(t.c.game_id.in_(ids))).all())
+        todo = [r for r in rows if stored.get(r["game_id"]) != r["row_hash"]]
+        res = bulk_upsert(conn, t, todo, key_cols=["game_id"])
+    res.unchanged = len(rows) - len(todo)
+    return res
+
+def synthetic_games(n: int = 100_000, teams: int = 30, seed: int = 0) -> pd.DataFrame:
+    """n jogos com ids sequenciais, datas espalhadas em ~80 temporadas e o formato de get_games()."""
+    rng = np.random.default_rng(seed)
+    names = np.array([f"Team {i:02d}" for i in range(teams)], dtype=object)
+    h = rng.integers(0, teams, n)
+    v = (h + rng.integers(1, teams, n)) % teams
+    days = pd.Timestamp("1946-11-01") + pd.to_timedelta(np.arange(n) // 8, unit="D")
+    return pd.DataFrame({
+        "game_id": np.arange(1, n + 1),
+        "date": days.strftime("%Y-%m-%d"),
+        "home_team": names[h],
+        "visitor_team": names[v],
+        "home_score": rng.integers(85, 135, n),
+        "visitor_score": rng.integers(85, 135, n),
+        "season": days.year,
+    })
+
+def _time_scenarios(fn, games: pd.DataFrame, changed: pd.DataFrame) -> dict:
+    """Roda os três cenários em um banco novo; devolve segundos por cenário."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{tmp}/bench.db")
+        Base.metadata.create_all(engine)
+        out = {}
+        for name, df in (("inicial", games), ("sem mudança", games), ("10% alterado", changed)):
+            t0 = time.perf_counter()
+            fn(df, engine)
+            out[name] = time.perf_counter() - t0
+        engine.dispose()
+    return out
+
+def _columnar(df: pd.DataFrame, engine) -> UpsertResult:
+    upsert_games.engine = engine
+    return upsert_games.upsert_nba_games(df)
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--games", type=int, default=100_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    games = synthetic_games(args.games)
+    changed = games.copy()
+    idx = np.random.default_rng(1).choice(len(games), len(games) // 10, replace=False)
+    changed.loc[idx, "home_score"] += 1
+    print(f"{len(games)} jogos sintéticos")
+
+    def best(fn):
+        runs = [_time_scenarios(fn, games, changed) for _ in range(args.repeat)]
+        return {k: min(r[k] for r in runs) for k in runs[0]}
+
+    old, new = best(legacy_upsert_nba_games), best(_columnar)
+    for k in old:
+        print(f"{k:>13}: antigo {len(games) / old[k]:>10,.0f} linhas/s | colunar {len(games) / new[k]:>10,.0f} linhas/s "
+              f"| {old[k] / new[k]:5.1f}x")
+
+if __name__ == "__main__":
+    main()
+# >>> FIM
@@ -17,5 +17,5 @@ if __name__ == "__main__":
         print("Nenhum jogo coletado.")
         raise SystemExit(0)
     n = upsert_nba_games(df)
-    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Upsert concluído. Linhas processadas: {n}")
+    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Upsert concluído: {n}.")
 # >>> FIM PATCH
@@ -0,0 +1,52 @@
+# scorebet/tests/test_backfill.py
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from src.db import backfill, upsert_games
+from src.db.bulk_upsert import UpsertResult
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    monkeypatch.setattr(backfill, "create_all", lambda: None)
+    monkeypatch.setattr(backfill, "_done_ranges", lambda season: [])
+    marked = []
+    monkeypatch.setattr(backfill, "_mark_done", lambda season, chunk, games: marked.append(chunk))
+    return marked
+
+
+def test_pages_are_upserted_one_by_one_in_page_order(offline, monkeypatch):
+    def frames(dates):
+        if dates[0] == "2020-10-08":
+            raise RuntimeError("HTTP 500")
+        for page in range(3):
+            yield pd.DataFrame({"game_id": [int(dates[0].replace("-", "")) * 10 + page]})
+    monkeypatch.setattr(backfill, "iter_games_frames", frames)
+
+    seen = []
+    def upsert(df):
+        seen.append(int(df["game_id"].iloc[0]))
+        return UpsertResult(inserted=len(df), changed_ids=df["game_id"].tolist())
+    monkeypatch.setattr(upsert_games, "upsert_nba_games", upsert)
+    monkeypatch.setattr(backfill, "season_bounds", lambda s: (date(2020, 10, 1), date(2020, 10, 21)))
+
+    res = backfill.backfill_season(2020, chunk_days=7, workers=3)
+    # um upsert por página (não um por bloco), em ordem de bloco e de página
+    assert seen == [202010010, 202010011, 202010012, 202010150, 202010151, 202010152]
+    assert res["failed"] == 1 and res["games"] == 6
+    assert offline == [(date(2020, 10, 1), date(2020, 10, 7)), (date(2020, 10, 15), date(2020, 10, 21))]
+
+
+def test_done_needs_full_coverage_across_chunk_sizes():
+    # checkpoints de uma execução com --chunk-days 7
+    done = [(date(2020, 10, 1), date(2020, 10, 14))]
+    ten = backfill.split_chunks(date(2020, 10, 1), date(2020, 10, 21), chunk_days=10)
+    assert [backfill.is_done(c, done) for c in ten] == [True, False, False]
+    assert not backfill.is_closed((date.today() - timedelta(days=1),) * 2)
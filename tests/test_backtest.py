@@ -0,0 +1,73 @@
+# scorebet/tests/test_backtest.py
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+for p in (ROOT, ROOT / "tests"):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+import numpy as np
+import pandas as pd
+
+from bench_team_roll_stats import synthetic_seasons
+from src.ml import backtest
+from src.ml.backtest import BacktestConfig, bet_profit, closing_h2h, walk_forward
+from src.ml.features import _team_roll_stats
+
+
+def test_bet_profit_picks_positive_ev_side():
+    profit = bet_profit(
+        p_home=[0.6, 0.6, 0.3, 0.5],
+        home_odds=[2.0, 2.0, 1.5, np.nan],
+        away_odds=[2.0, 2.0, 1.2, 2.0],
+        home_win=[1, 0, 1, 1],
+    )
+    assert profit[:3].tolist() == [1.0, -1.0, 0.0] and np.isnan(profit[3])
+
+
+def test_walk_forward_never_trains_on_the_future():
+    games = synthetic_seasons(seasons=2, teams=10, games_per_day=3)
+    feat = _team_roll_stats(games, 5)
+    odds = feat[["date", "home_team", "visitor_team"]].rename(columns={"visitor_team": "away_team"})
+    odds["date"] = odds["date"] + pd.Timedelta(hours=23)     # 18h ET em UTC: mesmo dia local
+    odds = odds.assign(date=odds["date"].dt.tz_localize("UTC"), home_odds=1.9, away_odds=1.9)
+
+    cfg = BacktestConfig(last_n=5, mode="sliding", train_days=60, test_days=30, min_train=150)
+    res = walk_forward(cfg, feat=feat, odds=odds, max_workers=2)
+
+    assert len(res.windows) > 3 and (res.windows["n_test"] > 0).all()
+    trained = res.windows["n_train"] >= cfg.min_train
+    assert res.windows.loc[trained, "acc"].notna().all()
+    assert (res.windows["test_start"] - res.windows["train_start"]).dt.days.max() == 60
+    # janela a janela: todo jogo de treino é anterior a todo jogo de teste
+    assert (res.windows.loc[trained, "train_last"] < res.windows.loc[trained, "test_first"]).all()
+    assert res.predictions["game_id"].is_unique
+    assert res.predictions["home_odds"].notna().all()
+    first_test = res.windows["test_start"].min()
+    assert res.predictions["date"].min() >= first_test
+    assert {"acc", "auc", "log_loss", "ece", "roi"} <= set(res.summary)
+    assert res.calibration()["n"].sum() == len(res.predictions)
+
+
+def test_cli_backtests_against_closing_odds_from_history(monkeypatch, capsys):
+    games = synthetic_seasons(seasons=1, teams=10, games_per_day=3)
+    feat = _team_roll_stats(games, 5)
+    kick = (feat["date"] + pd.Timedelta(hours=23)).dt.tz_localize("UTC")
+    hist = pd.concat([
+        pd.DataFrame({"event_id": feat.index, "market": "h2h", "book": book, "commence_time": kick,
+                      "home_team": feat["home_team"], "away_team": feat["visitor_team"],
+                      "selection": sel, "price": price, "captured_at": kick - pd.Timedelta(hours=h)})
+        for book, sel, price, h in [("a", feat["home_team"], 2.5, 30), ("a", feat["home_team"], 2.1, 1),
+                                    ("b", feat["home_team"], 2.3, 1), ("a", feat["visitor_team"], 1.8, 1),
+                                    ("a", feat["home_team"], 9.0, -2)]          # depois do início: ignorada
+    ], ignore_index=True)
+
+    closing = closing_h2h(hist)
+    assert len(closing) == len(feat)
+    assert closing["home_odds"].eq(2.2).all() and closing["away_odds"].eq(1.8).all()
+
+    seen = {}
+    monkeypatch.setattr(backtest, "build_feature_table", lambda last_n: feat)
+    monkeypatch.setattr(backtest, "load_odds_history", lambda **kw: seen.update(kw) or hist)
+    assert backtest.main(["--min-train", "100", "--workers", "1"]) == 0
+    assert seen["market"] == "h2h" and seen["since"].tzinfo is not None
+    assert "'roi'" in capsys.readouterr().out
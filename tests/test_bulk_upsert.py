@@ -0,0 +1,84 @@
+# scorebet/tests/test_bulk_upsert.py
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, func, select
+
+from src.db import bulk_upsert as bu
+from src.db.models import Base, NBAGame
+
+
+def _rows(ids, score=100):
+    return [{"game_id": i, "date": date(2024, 11, 1), "home_team": "A", "visitor_team": "B",
+             "home_score": score, "visitor_score": 90, "season": 2024} for i in ids]
+
+
+@pytest.mark.parametrize("method", ["auto", "staging"])
+def test_counts_and_chunking(tmp_path, monkeypatch, method):
+    monkeypatch.setitem(bu.MAX_PARAMS, "sqlite", 7 * 3)         # 3 linhas por statement
+    engine = create_engine(f"sqlite:///{tmp_path / 'u.db'}")
+    Base.metadata.create_all(engine)
+    table = NBAGame.__table__
+
+    with engine.begin() as c:
+        res = bu.bulk_upsert(c, table, _rows(range(10)), ["game_id"], method=method)
+    assert (res.inserted, res.updated) == (10, 0)
+
+    with engine.begin() as c:                                    # 5 existentes + 5 novos, um repetido
+        res = bu.bulk_upsert(c, table, _rows(range(5, 15), score=120) + _rows([14], score=130),
+                             ["game_id"], method=method)
+    assert (res.inserted, res.updated) == (5, 5)
+
+    with engine.connect() as c:
+        assert c.scalar(select(func.count()).select_from(table)) == 15
+        assert c.scalar(select(table.c.home_score).where(table.c.game_id == 7)) == 120
+        assert c.scalar(select(table.c.home_score).where(table.c.game_id == 14)) == 130
+        assert c.scalar(select(table.c.home_score).where(table.c.game_id == 0)) == 100
+
+
+def test_upsert_games_skips_unchanged_rows(tmp_path, monkeypatch):
+    import pandas as pd
+    from src.db import upsert_games
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'g.db'}")
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(upsert_games, "engine", engine)
+    df = pd.DataFrame(_rows(range(4))).assign(date="2024-11-01")
+
+    first = upsert_games.upsert_nba_games(df)
+    assert (first.inserted, first.updated, first.unchanged) == (4, 0, 0)
+
+    df.loc[df["game_id"] == 2, "home_score"] = 101                 # placar corrigido
+    again = upsert_games.upsert_nba_games(pd.concat([df, pd.DataFrame(_rows([9]))]))
+    assert (again.inserted, again.updated, again.unchanged) == (1, 1, 3)
+    assert sorted(again.changed_ids) == [2, 9]
+
+
+def test_columns_path_matches_rows(tmp_path):
+    import numpy as np
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'c.db'}")
+    Base.metadata.create_all(engine)
+    table = NBAGame.__table__
+    with engine.begin() as c:
+        bu.bulk_upsert(c, table, _rows(range(3)), ["game_id"])
+        res = bu.bulk_upsert_columns(c, table, {                   # fora da ordem da tabela
+            "season": np.array([2024, 2024], dtype=np.int64),
+            "home_score": np.array([111, 99], dtype=np.int64),
+            "date": np.array(["2024-11-02", "2024-11-03"], dtype="datetime64[D]"),
+            "visitor_team": np.array(["B", "D"], dtype=object),
+            "game_id": np.array([2, 3], dtype=np.int64),
+            "visitor_score": np.array([90, 98], dtype=np.int64),
+            "home_team": np.array(["A", "C"], dtype=object),
+        }, ["game_id"])
+    assert (res.inserted, res.updated) == (1, 1)
+
+    with engine.connect() as c:
+        rows = c.execute(select(table.c.game_id, table.c.date, table.c.home_team, table.c.home_score,
+                                table.c.season).order_by(table.c.game_id)).all()
+    assert rows[2:] == [(2, date(2024, 11, 2), "A", 111, 2024), (3, date(2024, 11, 3), "C", 99, 2024)]
@@ -0,0 +1,35 @@
+# scorebet/tests/test_db_setup.py
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src.db.setup import make_engine
+
+
+def test_wal_reader_does_not_block_on_writer(tmp_path):
+    url = f"sqlite:///{tmp_path / 'wal.db'}"
+    writer, reader = make_engine(url), make_engine(url, readonly=True)
+    with writer.begin() as c:
+        assert c.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert c.exec_driver_sql("PRAGMA synchronous").scalar() == 1          # NORMAL
+        c.execute(text("CREATE TABLE t (x INTEGER)"))
+        c.execute(text("INSERT INTO t VALUES (1)"))
+
+    with writer.begin() as w:                                                  # escrita em aberto
+        w.execute(text("INSERT INTO t VALUES (2)"))
+        t0 = time.perf_counter()
+        with reader.connect() as r:
+            assert r.execute(text("SELECT count(*) FROM t")).scalar() == 1     # último commit
+        assert time.perf_counter() - t0 < 1.0
+
+    with reader.connect() as r:
+        assert r.execute(text("SELECT count(*) FROM t")).scalar() == 2
+        with pytest.raises(OperationalError):
+            r.execute(text("INSERT INTO t VALUES (3)"))                        # query_only
@@ -0,0 +1,123 @@
+# scorebet/tests/test_feature_store.py
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.db.models import Base, NBAGame
+from src.ml import feature_store
+from src.ml.features import _team_roll_stats
+
+TEAMS = [f"Team {i}" for i in range(8)]
+
+
+def _games(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    start = date.today() - timedelta(days=n + 1)
+    rows = []
+    for i in range(n):
+        h, v = rng.choice(len(TEAMS), size=2, replace=False)
+        rows.append({
+            "game_id": i + 1, "date": start + timedelta(days=i), "season": 2024,
+            "home_team": TEAMS[h], "visitor_team": TEAMS[v],
+            "home_score": int(rng.integers(90, 130)), "visitor_score": int(rng.integers(90, 130)),
+        })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fs.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, future=True)
+    monkeypatch.setattr(feature_store, "SessionLocal", factory)
+    monkeypatch.setattr(feature_store, "ReadSession", factory)
+    return factory
+
+
+def _insert(factory, df):
+    with factory() as s:
+        s.add_all(NBAGame(**r) for r in df.to_dict("records"))
+        s.commit()
+
+
+def test_incremental_matches_full_recompute(session_factory):
+    games = _games(60)
+    day40 = games["date"].iloc[40]
+    _insert(session_factory, games)
+    assert feature_store.update_feature_store(last_n=5, today=day40)["mode"] == "rebuild"
+
+    # dias novos, depois da marca d'água -> só processa o que chegou
+    res = feature_store.update_feature_store(last_n=5)
+    assert res["mode"] == "incremental" and res["games"] == 20
+
+    got = feature_store.load_feature_table(last_n=5)
+    exp = _team_roll_stats(games, last_n=5)
+    pd.testing.assert_frame_equal(
+        got[exp.columns].reset_index(drop=True), exp, check_dtype=False,
+    )
+
+
+def test_backfill_below_watermark_triggers_rebuild(session_factory):
+    games = _games(30)
+    _insert(session_factory, games.iloc[10:])
+    feature_store.update_feature_store(last_n=3)
+    _insert(session_factory, games.iloc[:10])
+
+    assert feature_store.update_feature_store(last_n=3)["mode"] == "rebuild"
+    got = feature_store.load_feature_table(last_n=3)
+    assert len(got) == len(_team_roll_stats(games, last_n=3))
+
+
+def test_noop_does_not_open_a_writer_session(session_factory, monkeypatch):
+    _insert(session_factory, _games(20))
+    feature_store.update_feature_store(last_n=3)
+
+    def no_writer():
+        raise AssertionError("sessão de escrita aberta sem trabalho")
+    monkeypatch.setattr(feature_store, "SessionLocal", no_writer)
+    assert feature_store.update_feature_store(last_n=3)["mode"] == "noop"
+
+
+def test_late_correction_rebuilds_forward_from_its_day(session_factory):
+    games = _games(40)
+    _insert(session_factory, games)
+    feature_store.update_feature_store(last_n=3)
+
+    # placar corrigido 3 dias atrás, avisado pelo upsert (lista grande: vai em blocos no IN)
+    gid = int(games["game_id"].iloc[-3])
+    with session_factory() as s:
+        s.get(NBAGame, gid).home_score += 20
+        s.commit()
+    games.loc[games["game_id"] == gid, "home_score"] += 20
+    res = feature_store.update_feature_store(last_n=3, changed_ids=[gid, *range(10_000, 11_500)])
+    assert res["mode"] == "rebuild" and res["since"] == games["date"].iloc[-3] and res["games"] == 3
+
+    # outro processo corrige um placar sem passar changed_ids: a assinatura do dia denuncia
+    gid = int(games["game_id"].iloc[-10])
+    with session_factory() as s:
+        s.get(NBAGame, gid).visitor_score += 7
+        s.commit()
+    games.loc[games["game_id"] == gid, "visitor_score"] += 7
+    res = feature_store.update_feature_store(last_n=3)
+    assert res["mode"] == "rebuild" and res["since"] == games["date"].iloc[-10] and res["games"] == 10
+    assert feature_store.update_feature_store(last_n=3)["mode"] == "noop"
+
+    got = feature_store.load_feature_table(last_n=3)
+    exp = _team_roll_stats(games, last_n=3)
+    pd.testing.assert_frame_equal(got[exp.columns].reset_index(drop=True), exp, check_dtype=False)
+    long = pd.concat([
+        games.rename(columns={"home_team": "team", "home_score": "pts", "visitor_score": "opp"}),
+        games.rename(columns={"visitor_team": "team", "visitor_score": "pts", "home_score": "opp"}),
+    ]).sort_values(["date", "game_id"]).groupby("team").tail(3)
+    windows = feature_store.load_team_windows(last_n=3).sort_values(["team", "date"]).reset_index(drop=True)
+    exp_w = long.sort_values(["team", "date"]).reset_index(drop=True)
+    assert windows[["team", "pts", "opp"]].values.tolist() == exp_w[["team", "pts", "opp"]].values.tolist()
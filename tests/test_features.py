@@ -0,0 +1,56 @@
+# scorebet/tests/test_features.py
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+for p in (ROOT, ROOT / "tests"):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+import pandas as pd
+import pytest
+
+from bench_team_roll_stats import legacy_team_roll_stats, synthetic_seasons
+from src.ml.features import _team_roll_stats, team_roll_stats_multi
+
+
+def _by_game(df):
+    return df.sort_values("game_id").reset_index(drop=True)
+
+
+def test_vectorized_matches_legacy():
+    games = synthetic_seasons(seasons=2, teams=10, games_per_day=3)
+    for n in (3, 5, 10):
+        pd.testing.assert_frame_equal(
+            _by_game(_team_roll_stats(games, n)), _by_game(legacy_team_roll_stats(games, n)),
+        )
+
+
+def test_multi_window_columns():
+    games = synthetic_seasons(seasons=1, teams=6, games_per_day=2)
+    multi = team_roll_stats_multi(games, windows=(3, 10))
+    assert {"home_rpts_3", "away_rwin_10", "diff_ropp_10"} <= set(multi.columns)
+    assert len(multi) == len(games)
+    single = _team_roll_stats(games, 10).set_index("game_id")
+    got = multi.set_index("game_id").loc[single.index, "diff_rpts_10"]
+    pd.testing.assert_series_equal(got, single["diff_rpts"], check_names=False)
+
+
+def test_upcoming_feature_matrix_joins_by_team():
+    from src.ml.upcoming import _weighted_team_stats, upcoming_feature_matrix
+
+    rec = pd.DataFrame({
+        "team": ["A", "A", "B", "C"],
+        "date": pd.to_datetime(["2024-01-01", "2024-01-03", "2024-01-02", "2024-01-02"]),
+        "pts": [100, 110, 95, 120], "opp": [90, 115, 99, 100], "win": [1, 0, 0, 1],
+    })
+    stats = _weighted_team_stats(rec).set_index("team")
+    assert stats.loc["B", "rpts"] == pytest.approx(95) and stats.loc["A", "rpts"] == pytest.approx(105)
+
+    up = pd.DataFrame({
+        "date": ["2024-02-01", "2024-02-01", "2024-02-02"], "season": [2023] * 3,
+        "home_team": ["A", "X", "C"], "visitor_team": ["B", "A", "A"],
+    })
+    feat = upcoming_feature_matrix(up, stats.reset_index())
+    assert feat["home_team"].tolist() == ["A", "C"]          # X sem histórico sai
+    row = feat.iloc[1]
+    assert row["diff_rpts"] == row["home_rpts"] - stats.loc["A", "rpts"]
+    assert row["power_index"] == 0.6 * row["diff_rpts"] - 0.4 * row["diff_ropp"] + 0.8 * row["diff_rwin"]
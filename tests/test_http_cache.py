@@ -0,0 +1,65 @@
+# scorebet/tests/test_http_cache.py
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import time
+import requests
+from src.utils.http_cache import ResponseCache
+
+
+class FakeServer:
+    def __init__(self):
+        self.calls = []
+        self.version = 1
+
+    def __call__(self, url, headers=None, **kw):
+        self.calls.append(dict(headers or {}))
+        r = requests.Response()
+        etag = f'"v{self.version}"'
+        if (headers or {}).get("If-None-Match") == etag:
+            r.status_code = 304
+            r._content = b""
+        else:
+            r.status_code = 200
+            r._content = f'{{"v": {self.version}}}'.encode()
+        r.headers["ETag"] = etag
+        r.url = url
+        return r
+
+
+def test_hit_then_304_revalidation(tmp_path):
+    cache, srv = ResponseCache(tmp_path), FakeServer()
+    get = lambda: cache.get("https://x.test/a", srv, ttl=60, stale_ttl=0, params={"k": 1})
+
+    assert get().json() == {"v": 1}
+    r = get()
+    assert r.headers["X-Cache"] == "HIT" and len(srv.calls) == 1
+
+    cache.load(next(iter(cache._mem))).stored_at -= 120   # expira
+    r = get()
+    assert r.headers["X-Cache"] == "REVALIDATED" and r.json() == {"v": 1}
+    assert srv.calls[-1]["If-None-Match"] == '"v1"'
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.revalidated) == (1, 2, 1)
+
+
+def test_stale_while_revalidate_and_disk_reload(tmp_path):
+    cache, srv = ResponseCache(tmp_path), FakeServer()
+    get = lambda c: c.get("https://x.test/b", srv, ttl=1, stale_ttl=600)
+
+    get(cache)
+    cache.load(next(iter(cache._mem))).stored_at -= 10
+    srv.version = 2
+    r = get(cache)
+    assert r.headers["X-Cache"] == "STALE" and r.json() == {"v": 1}
+
+    for _ in range(50):   # espera a revalidação em segundo plano
+        if get(cache).json() == {"v": 2}:
+            break
+        time.sleep(0.02)
+    assert cache.stats.refreshes >= 1
+
+    fresh = ResponseCache(tmp_path)   # novo processo: lê do disco
+    assert get(fresh).json() == {"v": 2}
+    assert fresh.stats.hits == 1
@@ -0,0 +1,98 @@
+# scorebet/tests/test_http_client.py
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import requests
+from src.utils.http import HttpClient
+
+
+def _resp(status: int, headers: dict | None = None) -> requests.Response:
+    r = requests.Response()
+    r.status_code = status
+    r.headers.update(headers or {})
+    r._content = b"{}"
+    return r
+
+
+def _client_with(responses, monkeypatch):
+    client = HttpClient(max_retries=2, backoff=0)
+    calls = []
+
+    def fake_request(method, url, **kw):
+        calls.append(url)
+        item = responses.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    monkeypatch.setattr(client.session, "request", fake_request)
+    monkeypatch.setattr("src.utils.http.time.sleep", lambda s: None)
+    return client, calls
+
+
+def test_retries_on_429_and_5xx_then_succeeds(monkeypatch):
+    client, calls = _client_with([_resp(429, {"Retry-After": "0"}), _resp(503), _resp(200)], monkeypatch)
+    r = client.get("https://api.example.com/x")
+    assert r.status_code == 200
+    assert len(calls) == 3
+    st = client.stats()["api.example.com"]
+    assert st["calls"] == 3 and st["retries"] == 2 and st["last_status"] == 200
+
+
+def test_returns_last_response_when_retries_exhausted(monkeypatch):
+    client, calls = _client_with([_resp(500), _resp(500), _resp(502)], monkeypatch)
+    r = client.get("https://api.example.com/x")
+    assert r.status_code == 502
+    assert len(calls) == 3
+
+
+def test_does_not_retry_client_errors(monkeypatch):
+    client, calls = _client_with([_resp(401)], monkeypatch)
+    assert client.get("https://api.example.com/x").status_code == 401
+    assert len(calls) == 1
+
+
+def test_reraises_connection_error_after_retries(monkeypatch):
+    err = requests.ConnectionError("boom")
+    client, calls = _client_with([err, err, err], monkeypatch)
+    try:
+        client.get("https://api.example.com/x")
+    except requests.ConnectionError:
+        pass
+    else:
+        raise AssertionError("esperava ConnectionError")
+    assert client.stats()["api.example.com"]["errors"] == 3
+
+
+def test_gather_keeps_task_order_and_enforces_deadline():
+    import time
+    from src.utils.http import gather
+
+    def slow(i, delay):
+        time.sleep(delay)
+        return i
+
+    res = gather([("a", lambda: slow(1, 0.05)), ("b", lambda: slow(2, 2)), ("c", lambda: 1 / 0)],
+                 max_workers=3, deadline=0.5)
+    assert list(res) == ["a", "b", "c"]
+    assert res["a"] == 1
+    assert isinstance(res["b"], TimeoutError)
+    assert isinstance(res["c"], ZeroDivisionError)
+
+
+def test_rate_limiter_bursts_then_refills(monkeypatch):
+    from src.utils import http
+
+    now, slept = [100.0], []
+    monkeypatch.setattr(http.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(http.time, "sleep", lambda s: slept.append(round(s, 3)))
+
+    limiter = http.RateLimiter(per_minute=60, burst=3)
+    for _ in range(5):
+        limiter.acquire()
+    assert slept == [1.0, 2.0]                                   # 3 na hora; depois 1 por segundo
+    now[0] += 10
+    limiter.acquire()
+    assert slept == [1.0, 2.0]                                   # saldo reposto (até o burst)
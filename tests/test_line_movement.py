@@ -0,0 +1,90 @@
+# scorebet/tests/test_line_movement.py
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+import pytest
+
+from src.ml.line_movement import closing_line_value, detect_steam, event_view, line_summary, selection_view
+
+
+def _hist():
+    """Lakers x Celtics às 00:30 UTC; três books encurtam o Lakers juntos às 20h."""
+    t = lambda s: pd.Timestamp(f"2024-11-{s}", tz="UTC")
+    rows = []
+    for book in ("a", "b", "c"):
+        rows += [
+            (book, "Lakers", 2.00, t("01 12:00")), (book, "Lakers", 1.80, t("01 20:02")),
+            (book, "Celtics", 1.90, t("01 12:00")), (book, "Celtics", 2.10, t("01 20:02")),
+        ]
+    rows.append(("a", "Lakers", 1.60, t("02 01:00")))   # ao vivo: não entra no fechamento
+    df = pd.DataFrame(rows, columns=["book", "selection", "price", "captured_at"])
+    return df.assign(
+        event_id=1, league="nba", commence_time=t("02 00:30"), home_team="Lakers",
+        away_team="Celtics", market="h2h", point=float("nan"),
+    )
+
+
+def test_summary_steam_and_clv():
+    hist = _hist()
+    summary = line_summary(hist, velocity_hours=6)
+    a = summary[(summary["book"] == "a") & (summary["selection"] == "Lakers")].iloc[0]
+    assert (a["open_price"], a["close_price"], a["changes"]) == (2.00, 1.80, 1)
+    # 18:30 -> ainda 2.00; 20:02 -> 1.80
+    assert a["velocity"] == pytest.approx((1 / 1.8 - 0.5) / 6)
+
+    steam = detect_steam(hist, min_books=3, min_move=0.02)
+    assert len(steam) == 2                                   # Lakers sobe, Celtics cai
+    assert set(zip(steam["selection"], steam["direction"])) == {("Lakers", 1), ("Celtics", -1)}
+
+    view = event_view(selection_view(summary, steam))
+    row = view.iloc[0]
+    assert row["home_move_pp"] == pytest.approx((1 / 1.8 - 0.5) * 100)
+    assert row["home_steam"] == 1 and row["away_steam_dir"] == -1
+
+    picks = pd.DataFrame({"home_team": ["Lakers"], "away_team": ["Celtics"], "selection": ["Lakers"],
+                          "price": [2.00], "date": ["2024-11-01"]})
+    clv = closing_line_value(picks, selection_view(summary, steam))
+    assert clv["clv"].iloc[0] == pytest.approx(2.00 / 1.80 - 1)
+
+
+def test_steam_window_slides_across_clock_buckets():
+    # 10:09, 10:11 e 10:12: cruzam a borda das 10:10, mas estão dentro de 10 minutos
+    t = lambda hm: pd.Timestamp(f"2024-11-01 {hm}", tz="UTC")
+    rows = []
+    for book, at in (("a", "10:09"), ("b", "10:11"), ("c", "10:12")):
+        rows += [(book, 2.00, t("08:00")), (book, 1.80, t(at))]
+    hist = pd.DataFrame(rows, columns=["book", "price", "captured_at"]).assign(
+        event_id=1, market="h2h", selection="Lakers", commence_time=t("23:00"),
+        league="nba", home_team="Lakers", away_team="Celtics", point=float("nan"),
+    )
+    steam = detect_steam(hist, window="10min", min_books=3, min_move=0.02)
+    assert len(steam) == 1
+    assert steam["at"].iloc[0] == t("10:12") and steam["books"].iloc[0] == 3
+
+
+def test_materialize_keeps_full_history_of_upcoming_games(tmp_path, monkeypatch):
+    from datetime import datetime, timedelta, timezone
+    from sqlalchemy import create_engine
+    from src.db import odds_history
+    from src.ml import line_movement
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'odds.db'}")
+    monkeypatch.setattr(odds_history, "engine", engine)
+    monkeypatch.setattr(odds_history, "read_engine", engine)
+    odds_history.reset_cache()
+    now = datetime.now(timezone.utc)
+    kickoff = (now + timedelta(days=2)).isoformat()
+    df = lambda home: pd.DataFrame({"date": [kickoff], "home_team": ["Chiefs"], "away_team": ["Bills"],
+                                    "home_odds": [home], "away_odds": [2.0]})
+    # abriu há 6 dias e mexeu uma vez há 5: nenhuma captura nos últimos 3 dias
+    odds_history.record_odds(odds_history.h2h_to_long(df(1.90), "nfl", book="a"), now - timedelta(days=6))
+    odds_history.record_odds(odds_history.h2h_to_long(df(1.70), "nfl", book="a"), now - timedelta(days=5))
+
+    view = line_movement.materialize("nfl", days_back=3)
+    odds_history.reset_cache()
+    assert len(view) == 1
+    assert view["home_open_prob"].iloc[0] == pytest.approx(1 / 1.90)
+    assert view["home_close_price"].iloc[0] == pytest.approx(1.70)
@@ -0,0 +1,35 @@
+# scorebet/tests/test_model_cache.py
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import os
+import joblib
+import pytest
+
+from src.ml.model_cache import ModelCache
+
+
+def _write(path, value, mtime):
+    joblib.dump({"model": value, "features": ["x"]}, path)
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_loads_once_and_hot_reloads(tmp_path):
+    path, cache = tmp_path / "m.pkl", ModelCache()
+    _write(path, "v1", 1_000_000_000)
+
+    first = cache.get(path)
+    assert cache.get(path) is first and first.model == "v1"
+
+    _write(path, "v1", 2_000_000_000)          # mesmo conteúdo, mtime novo: sem recarga
+    assert cache.get(path) is first
+
+    _write(path, "v2", 3_000_000_000)
+    second = cache.get(path)
+    assert second.model == "v2" and second.version != first.version
+    assert cache.get(path, version=first.version).model == "v1"
+    assert cache.versions(path) == [first.version, second.version]
+    with pytest.raises(KeyError):
+        cache.get(path, version="nope")
@@ -0,0 +1,89 @@
+# scorebet/tests/test_odds_aggregator.py
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+import pytest
+
+from src.api.odds_aggregator import aggregate, event_table, fetch_all
+from src.db.odds_history import h2h_to_long
+
+
+def _source(book, home_odds, away_odds, home="Los Angeles Lakers", date="2024-11-02T00:30:00Z"):
+    df = pd.DataFrame({"date": [date], "home_team": [home], "away_team": ["Boston Celtics"],
+                       "home_odds": [home_odds], "away_odds": [away_odds]})
+    return lambda: h2h_to_long(df, "nba", book=book)
+
+
+def test_best_price_consensus_and_overround():
+    sources = {
+        "a": ("nba", _source("pinnacle", 1.90, 2.00)),
+        "b": ("nba", _source("1xbet", 2.10, 1.80, home="LA Lakers", date="2024-11-02 00:30")),  # outro formato
+        "c": ("nba", lambda: (_ for _ in ()).throw(RuntimeError("fora do ar"))),
+        "d": ("nfl", _source("x", 1.5, 2.5)),
+    }
+    long = fetch_all("nba", sources=sources)
+    assert set(long["book"]) == {"pinnacle", "1xbet"}
+
+    games = event_table(aggregate(long))
+    assert len(games) == 1                                   # as duas fontes viram o mesmo evento
+    g = games.iloc[0]
+    assert (g["home_odds"], g["home_book"]) == (2.10, "1xbet")
+    assert (g["away_odds"], g["away_book"]) == (2.00, "pinnacle")
+    assert g["home_consensus_prob"] + g["away_consensus_prob"] == pytest.approx(1.0)
+
+    novig = lambda h, a: (1 / h) / (1 / h + 1 / a)
+    assert g["home_consensus_prob"] == pytest.approx((novig(1.90, 2.00) + novig(2.10, 1.80)) / 2)
+    assert g["overround"] == pytest.approx(((1 / 1.9 + 1 / 2.0) + (1 / 2.1 + 1 / 1.8)) / 2)
+    assert g["best_overround"] == pytest.approx(1 / 2.1 + 1 / 2.0)   # < 1: arbitragem
+
+
+def test_apisports_home_away_become_team_names():
+    from src.db.odds_history import nfl_picks_to_long
+
+    raw = pd.DataFrame({
+        "game": ["Kansas City Chiefs x Buffalo Bills"] * 4,
+        "pick": ["Home", "Away", "Home", "Away"], "odd": [1.80, 2.05, 1.85, 2.00],
+        "book": ["Bet365", "Bet365", "Pinnacle", "Pinnacle"], "date": ["2025-09-07T20:25:00+00:00"] * 4,
+    })
+    games = event_table(aggregate(nfl_picks_to_long(raw)))
+    assert len(games) == 1
+    g = games.iloc[0]
+    assert (g["home_team"], g["away_team"]) == ("Kansas City Chiefs", "Buffalo Bills")
+    assert (g["home_odds"], g["away_odds"]) == (1.85, 2.05)
+    assert g["home_consensus_prob"] + g["away_consensus_prob"] == pytest.approx(1.0)
+
+
+def test_oddsapi_error_body_yields_no_events(monkeypatch):
+    from src.api import nba_schedule_api
+
+    class Resp:
+        ok = False
+        def json(self):
+            return {"message": "Usage quota has been reached"}
+    monkeypatch.setattr(nba_schedule_api, "odds_get", lambda *a, **k: Resp())
+    assert nba_schedule_api.fetch_oddsapi_events() == []
+    assert nba_schedule_api.fetch_from_oddsapi().empty
+
+
+def test_theodds_is_one_request_split_by_book(monkeypatch):
+    from src.api import nba_schedule_api, odds_aggregator
+
+    calls = []
+    def book(key, home, away):
+        return {"key": key, "markets": [{"key": "h2h", "outcomes": [
+            {"name": "Los Angeles Lakers", "price": home}, {"name": "Boston Celtics", "price": away}]}]}
+    class Resp:
+        ok = True
+        def json(self):
+            return [{"commence_time": "2024-11-02T00:30:00Z", "home_team": "Los Angeles Lakers",
+                     "away_team": "Boston Celtics", "bookmakers": [book("pinnacle", 1.9, 2.0), book("draftkings", 1.85, 2.05)]}]
+    monkeypatch.setattr(nba_schedule_api, "odds_get", lambda url, key, params, **kw: calls.append(params) or Resp())
+    monkeypatch.setattr(nba_schedule_api, "record_safe", lambda *a: 0)
+    monkeypatch.setattr(odds_aggregator, "get_h2h_odds_1xbet", lambda: pd.DataFrame())
+
+    long = fetch_all("nba")
+    assert len(calls) == 1 and calls[0]["regions"] == "us,eu"
+    assert set(long["book"]) == {"pinnacle", "draftkings"}
@@ -0,0 +1,98 @@
+# scorebet/tests/test_odds_history.py
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, func, select
+
+from src.db import odds_history
+from src.db.models import OddsHistory
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'odds.db'}")
+    monkeypatch.setattr(odds_history, "engine", engine)
+    monkeypatch.setattr(odds_history, "read_engine", engine)
+    odds_history.reset_cache()
+    yield engine
+    odds_history.reset_cache()
+
+
+def _h2h(home_odds, away_odds):
+    return pd.DataFrame({
+        "date": ["2024-11-02T00:30:00Z"], "home_team": ["Lakers"], "away_team": ["Celtics"],
+        "home_odds": [home_odds], "away_odds": [away_odds],
+    })
+
+
+def test_only_price_changes_are_stored(store):
+    t0 = datetime(2024, 11, 1, 12, tzinfo=timezone.utc)
+    rec = lambda df, t: odds_history.record_odds(odds_history.h2h_to_long(df, "nba", book="bet365"), t)
+
+    assert rec(_h2h(1.91, 1.95), t0) == 2
+    assert rec(_h2h(1.91, 1.95), t0 + timedelta(minutes=5)) == 0       # linha parada
+    assert rec(_h2h(1.87, 1.95), t0 + timedelta(minutes=10)) == 1      # só o mandante mexeu
+
+    odds_history.reset_cache()                                          # novo processo: estado vem do banco
+    assert rec(_h2h(1.87, 1.95), t0 + timedelta(minutes=15)) == 0
+
+    hist = odds_history.load_odds_history(league="nba", market="h2h")
+    lakers = hist[hist["selection"] == "Los Angeles Lakers"]          # nome canônico do registro de times
+    assert lakers["price"].tolist() == [1.91, 1.87]
+    assert lakers["captured_at"].iloc[-1] == pd.Timestamp(t0 + timedelta(minutes=10))
+    # 00:30 UTC = noite anterior em ET
+    assert hist["commence_time"].iloc[0] == pd.Timestamp("2024-11-02T00:30:00Z")
+    with store.connect() as c:
+        assert c.scalar(select(func.count()).select_from(OddsHistory)) == 3
+
+
+def test_price_back_to_previous_value_is_stored(store):
+    # outro processo gravou 1.80 entre as duas capturas de 1.91 deste
+    t0 = datetime(2024, 11, 1, 12, tzinfo=timezone.utc)
+    rec = lambda h, t: odds_history.record_odds(odds_history.h2h_to_long(_h2h(h, 1.95), "nba", book="bet365"), t)
+    rec(1.91, t0)
+    rec(1.80, t0 + timedelta(minutes=5))
+    assert rec(1.91, t0 + timedelta(minutes=10)) == 1
+
+    hist = odds_history.load_odds_history(league="nba", market="h2h")
+    assert hist[hist["selection"] == "Los Angeles Lakers"]["price"].tolist() == [1.91, 1.80, 1.91]
+
+
+def test_props_keep_point_and_side(store):
+    df = pd.DataFrame({
+        "home_team": ["Lakers"] * 2, "away_team": ["Celtics"] * 2, "book": ["FanDuel"] * 2,
+        "market": ["player_points"] * 2, "player": ["LeBron James"] * 2,
+        "line": [25.5, 25.5], "odd": [1.87, 1.95], "side": ["Over", "Under"],
+    })
+    long = odds_history.props_to_long(df, "nba", price_col="odd", point_col="line",
+                                      player_col="player", side_col="side")
+    assert odds_history.record_odds(long) == 2
+    hist = odds_history.load_odds_history(market="player_points")
+    assert sorted(hist["selection"]) == ["LeBron James|Over", "LeBron James|Under"]
+    assert (hist["point"] == 25.5).all()
+
+
+def test_rolled_back_ids_never_reach_the_cache(store, monkeypatch):
+    t0 = datetime(2024, 11, 1, 12, tzinfo=timezone.utc)
+    long = odds_history.h2h_to_long(_h2h(1.91, 1.95), "nba", book="bet365")
+
+    def boom(conn, ids):
+        raise RuntimeError("disco cheio")
+    real = odds_history._load_last_state
+    monkeypatch.setattr(odds_history, "_load_last_state", boom)
+    assert odds_history.record_safe(long, "teste") == 0                 # rollback: ids criados somem
+    assert not odds_history._events and not odds_history._labels
+
+    monkeypatch.setattr(odds_history, "_load_last_state", real)
+    other = odds_history.h2h_to_long(_h2h(2.10, 1.75), "nba", book="pinnacle")
+    assert odds_history.record_odds(other, t0) == 2                      # reusa os ids desfeitos
+    assert odds_history.record_odds(long, t0) == 2
+    hist = odds_history.load_odds_history(league="nba", market="h2h")
+    assert sorted(hist["book"].unique()) == ["bet365", "pinnacle"]
+    assert hist.groupby("book")["price"].max().to_dict() == {"bet365": 1.95, "pinnacle": 2.10}
@@ -0,0 +1,56 @@
+# scorebet/tests/test_odds_quota.py
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import time
+
+import requests
+
+from src.api import odds_quota
+from src.utils import http
+
+
+def _resp(remaining: int) -> requests.Response:
+    r = requests.Response()
+    r.status_code = 200
+    r._content = b"[]"
+    r.headers.update({"x-requests-remaining": str(remaining), "x-requests-last": "1"})
+    return r
+
+
+def test_two_processes_share_the_file(tmp_path):
+    path = tmp_path / "quota.json"
+    scheduler, page = odds_quota.QuotaManager(path), odds_quota.QuotaManager(path)
+    scheduler.record("k1", _resp(400))
+    page.record("k2", _resp(300))                                # não apaga a chave do outro
+    assert page.remaining("k1") == 400
+    scheduler.record("k2", _resp(290))
+    assert page.remaining("k2") == 290                           # vê a gravação mais nova
+    assert odds_quota.QuotaManager(path).remaining("k1") == 400
+
+    scheduler.record("k1", _resp(350))
+    view = page.budget_view().set_index("key")["remaining"]      # diagnóstico também relê o arquivo
+    assert view[odds_quota._fingerprint("k1")] == 350
+
+
+def test_background_refresh_goes_through_quota(tmp_path, monkeypatch):
+    quota = odds_quota.QuotaManager(tmp_path / "quota.json")
+    client = http.HttpClient(max_retries=0)
+    client._cache = http.ResponseCache(tmp_path / "cache")
+    monkeypatch.setattr(odds_quota, "get_quota", lambda: quota)
+    monkeypatch.setattr(http, "get_client", lambda: client)
+    left = iter([500, 499])
+    monkeypatch.setattr(client, "request", lambda method, url, **kw: _resp(next(left)))
+
+    get = lambda: odds_quota.odds_get("https://api.the-odds-api.com/x", "k", params={"markets": "h2h"},
+                                      cache=True, cache_ttl=1, stale_ttl=600)
+    get()
+    client.cache.load(next(iter(client.cache._mem))).stored_at -= 10
+    assert get().headers["X-Cache"] == "STALE"
+    for _ in range(50):                                          # revalidação em segundo plano
+        if quota.remaining("k") == 499:
+            break
+        time.sleep(0.02)
+    assert quota.remaining("k") == 499
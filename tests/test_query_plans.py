@@ -0,0 +1,80 @@
+# scorebet/tests/test_query_plans.py
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, inspect
+
+from src.db.migrations import MIGRATIONS, applied_versions, migrate
+from src.db.read import games_query
+
+
+@pytest.fixture
+def old_db(tmp_path):
+    """scorebet.db como era antes das migrações: sem row_hash, só índices de uma coluna."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as c:
+        c.exec_driver_sql(
+            "CREATE TABLE nba_games (game_id INTEGER PRIMARY KEY, date DATE, home_team VARCHAR(80), "
+            "visitor_team VARCHAR(80), home_score INTEGER, visitor_score INTEGER, season INTEGER)"
+        )
+        for col in ("date", "home_team", "visitor_team", "season"):
+            c.exec_driver_sql(f"CREATE INDEX ix_nba_games_{col} ON nba_games ({col})")
+        c.exec_driver_sql("INSERT INTO nba_games VALUES (1, '2024-11-01', 'A', 'B', 110, 100, 2025)")
+    return engine
+
+
+def _plan(conn, stmt) -> str:
+    sql = stmt if isinstance(stmt, str) else str(stmt.compile(conn, compile_kwargs={"literal_binds": True}))
+    return "\n".join(r[-1] for r in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql))
+
+
+def test_migrate_evolves_existing_db(old_db):
+    assert migrate(old_db) == [m.version for m in MIGRATIONS]
+    assert migrate(old_db) == []                                    # idempotente
+    assert applied_versions(old_db) == {m.version for m in MIGRATIONS}
+
+    insp = inspect(old_db)
+    assert "row_hash" in {c["name"] for c in insp.get_columns("nba_games")}
+    assert {i["name"] for i in insp.get_indexes("nba_games")} == {
+        "ix_nba_games_date", "ix_nba_games_home_team_date", "ix_nba_games_visitor_team_date", "ix_nba_games_season_date",
+    }
+    with old_db.connect() as c:
+        rows = c.exec_driver_sql("SELECT team, opponent, is_home, pts, win FROM team_games ORDER BY is_home").all()
+    assert rows == [("B", "A", 0, 100, 0), ("A", "B", 1, 110, 1)]
+
+
+def test_query_plans_use_composite_indexes(old_db):
+    migrate(old_db)
+    with old_db.connect() as c:
+        team = _plan(c, games_query(team="A", before=date(2024, 11, 1)))
+        assert "ix_nba_games_home_team_date (home_team=? AND date<?)" in team
+        assert "ix_nba_games_visitor_team_date (visitor_team=? AND date<?)" in team
+
+        season = _plan(c, games_query(season=2025, start=date(2024, 11, 1), end=date(2024, 12, 1)))
+        assert "ix_nba_games_season_date (season=? AND date>? AND date<?)" in season
+
+        view = _plan(c, "SELECT * FROM team_games WHERE team = 'A' AND date < '2024-11-01'")
+        assert "ix_nba_games_home_team_date (home_team=? AND date<?)" in view
+        assert "ix_nba_games_visitor_team_date (visitor_team=? AND date<?)" in view
+        assert "SCAN nba_games" not in team + season + view
+
+
+def test_migrate_skips_versions_applied_by_another_process(old_db, monkeypatch):
+    from src.db import migrations
+
+    # outro processo registra a versão 1 entre a leitura inicial e a transação deste
+    real = migrations.applied_versions
+    def stale(bind=None):
+        done = real(bind)
+        migrations.Base.metadata.create_all(bind=old_db)
+        with old_db.begin() as c:
+            c.execute(migrations.insert(migrations.SchemaVersion).values(
+                version=1, description="outro processo", applied_at=migrations.datetime.now()))
+        return done
+    monkeypatch.setattr(migrations, "applied_versions", stale)
+    assert migrate(old_db) == [2, 3]
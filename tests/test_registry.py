@@ -0,0 +1,51 @@
+# scorebet/tests/test_registry.py
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from src.ml.registry import ModelRegistry
+
+
+def test_register_promote_and_lookup(tmp_path):
+    reg = ModelRegistry("m", root=tmp_path)
+    assert reg.current_version() is None
+
+    v1 = reg.register({"model": "a", "features": ["x"], "last_n": 5}, {"acc": 0.6, "samples": 10})
+    assert reg.current_version() is None          # registrar não promove
+    reg.promote(v1)
+    v2 = reg.register({"model": "b", "features": ["x", "y"], "last_n": 10}, {"acc": 0.7, "samples": 12})
+
+    assert reg.current_version() == v1 and reg.load().model == "a"
+    reg.promote(v2)
+    assert reg.current_version() == v2 and reg.load().model == "b"
+    assert reg.load(v1).model == "a"
+
+    mf = reg.manifest()
+    assert (mf["version"], mf["last_n"], mf["features"], mf["acc"]) == (v2, 10, ["x", "y"], 0.7)
+    versions = reg.list_versions()
+    assert set(versions["version"]) == {v1, v2}
+    assert versions.loc[versions["active"], "version"].tolist() == [v2]
+    assert not list(reg.versions_dir.glob(".tmp-*"))
+
+    with pytest.raises(FileNotFoundError):
+        reg.promote("nope")
+
+
+def test_same_model_twice_in_one_second_gets_distinct_versions(tmp_path, monkeypatch):
+    from datetime import datetime
+    from src.ml import registry
+
+    class Frozen(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls(2024, 11, 2, 12, 0, 0)
+    monkeypatch.setattr(registry, "datetime", Frozen)
+
+    reg = ModelRegistry("m", root=tmp_path)
+    bundle = {"model": "a", "features": ["x"], "last_n": 5}
+    v1, v2 = reg.register(bundle, {}), reg.register(bundle, {})
+    assert v2 == f"{v1}-2"
+    assert reg.manifest(v2)["version"] == v2 and reg.load(v2).model == "a"
@@ -0,0 +1,30 @@
+# scorebet/tests/test_sweep.py
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+for p in (ROOT, ROOT / "tests"):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+import pandas as pd
+
+from bench_team_roll_stats import synthetic_seasons
+from src.ml.features import _team_roll_stats
+from src.ml.sweep import expand_grid, feature_tables, run_sweep
+
+
+def test_sweep_ranks_configs_on_walk_forward_score():
+    games = synthetic_seasons(seasons=2, teams=10, games_per_day=3)
+    tables = feature_tables([3, 5], games=games)
+    pd.testing.assert_frame_equal(
+        tables[5][_team_roll_stats(games, 5).columns].sort_values("game_id").reset_index(drop=True),
+        _team_roll_stats(games, 5).sort_values("game_id").reset_index(drop=True),
+    )
+
+    configs = expand_grid([3, 5], ["diff", "all"], ["logreg", "gb"],
+                          {"logreg": [{"C": 0.1}, {"C": 1.0}], "gb": [{"max_depth": 2, "max_iter": 20}]})
+    res = run_sweep(configs, tables=tables, sort_by="log_loss", max_workers=2, min_train=150)
+
+    assert len(res) == len(configs) == 12
+    assert "error" not in res.columns
+    assert res["log_loss"].is_monotonic_increasing
+    assert {"auc", "acc", "brier", "seconds", "windows"} <= set(res.columns)
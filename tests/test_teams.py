@@ -0,0 +1,48 @@
+# scorebet/tests/test_teams.py
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+
+from src.utils.teams import canonical_name, match_events, team_id
+
+
+def test_aliases_resolve_to_one_id():
+    for name in ("LA Clippers", "Los Angeles Clippers", "L.A. Clippers", "LAC", "clippers"):
+        assert team_id(name, "nba") == "LAC"
+    assert team_id("Chargers", "nfl") == "LAC"
+    assert canonical_name("Sixers") == "Philadelphia 76ers"
+    assert team_id("Springfield Atoms") is None
+
+
+def test_match_events_by_team_and_day():
+    # balldontlie: data local; The Odds API: UTC (jogo das 21h30 ET cai no dia seguinte)
+    pred = pd.DataFrame({
+        "date": ["2024-11-01", "2024-11-03", "2024-11-04"],
+        "home_team": ["LA Clippers", "Boston Celtics", "Miami Heat"],
+        "away_team": ["Lakers", "NY Knicks", "Orlando Magic"],
+    })
+    odds = pd.DataFrame({
+        "date": pd.to_datetime(["2024-11-02T01:30Z", "2024-11-10T00:00Z", "2024-11-04T00:00Z"]),
+        "home_team": ["Los Angeles Clippers", "Boston Celtics", "New York Knicks"],
+        "away_team": ["Los Angeles Lakers", "New York Knicks", "Boston Celtics"],
+        "home_odds": [1.80, 1.50, 2.40],
+    })
+    out = match_events(pred, odds, "nba", suffixes=("", "_odds"))
+    assert len(out) == 3                                         # nada some
+    assert out["home_team"].tolist() == pred["home_team"].tolist()
+    assert out["home_odds"].iloc[0] == 1.80
+    assert pd.isna(out["home_odds"].iloc[1])                     # mesmo confronto, outra semana
+    assert pd.isna(out["home_odds"].iloc[2])                     # mando invertido não casa
+
+
+def test_theodds_unmapped_name_falls_back_to_normalized_match():
+    from src.api.odds_api import _same_team
+
+    assert _same_team("LA Clippers", "Los Angeles Clippers")
+    assert not _same_team("LA Clippers", "Los Angeles Lakers")
+    # fora do registro (ex.: time novo): casa pelo nome normalizado, como antes
+    assert _same_team("Seattle SuperSonics", "seattle supersonics")
+    assert not _same_team("Seattle SuperSonics", "Los Angeles Lakers")